@@ -1,9 +1,23 @@
 import secrets
 import hashlib
-from fastapi import Request
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from .config import AUTH_COOKIE_NAME, AUTH_HEADER_NAME
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Receive, Scope, Send
+from .config import (
+    AUTH_COOKIE_NAME, AUTH_HEADER_NAME, AUTH_TOKEN_EXPIRY_DAYS,
+    AUTH_TOKEN_CACHE_SIZE, AUTH_TOKEN_CACHE_TTL_SECONDS
+)
+from .database import db
+from .exceptions import AuthorizationError
+
+# Roles a session token can carry
+ROLE_ADMIN = "admin"
+ROLE_TECHNICIAN = "technician"
+ROLE_CUSTOMER = "customer"
 
 def generate_auth_token():
     """Generate a secure auth token"""
@@ -13,36 +27,150 @@ def hash_password(password: str) -> str:
     """Hash password for comparison"""
     return hashlib.sha256(password.encode()).hexdigest()
 
-# Store valid tokens (in production, use Redis or database)
-valid_tokens = set()  # Admin tokens
-valid_technician_tokens = set()  # Technician tokens
-valid_customer_tokens = set()
+def _token_key(token: str) -> str:
+    """Tokens are stored hashed so a database dump does not leak live sessions"""
+    return hashlib.sha256(token.encode()).hexdigest()
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Skip auth for login endpoints, CORS preflight, and translations
-        if request.url.path in ["/api/auth/login", "/api/auth/customer-login", "/api/auth/technician-login", "/api/auth/check", "/api/auth/logout"]:
-            return await call_next(request)
-        
-        # Skip auth for translations endpoints (public)
-        if request.url.path.startswith("/api/translations"):
-            return await call_next(request)
-        
-        if request.method == "OPTIONS":
-            return await call_next(request)
+
+class TokenCache:
+    """Bounded LRU of token key -> (role, cached_until) with a short TTL"""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        role, cached_until = entry
+        if cached_until <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return role
+
+    def put(self, key: str, role: str, expires_at: datetime) -> None:
+        # Never cache a token past its own expiry
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        ttl = min(self.ttl_seconds, remaining)
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        self._entries[key] = (role, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_cache = TokenCache(AUTH_TOKEN_CACHE_SIZE, AUTH_TOKEN_CACHE_TTL_SECONDS)
+
+
+async def issue_token(role: str) -> str:
+    """Create a session token for `role` and persist it until it expires"""
+    token = generate_auth_token()
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(days=AUTH_TOKEN_EXPIRY_DAYS)
+    key = _token_key(token)
+    await db.auth_tokens.insert_one({
+        "_id": key,
+        "role": role,
+        "created_at": now,
+        "expires_at": expires_at,
+    })
+    token_cache.put(key, role, expires_at)
+    return token
+
+async def get_token_role(token: Optional[str]) -> Optional[str]:
+    """Return the role of a valid, unexpired token, or None"""
+    if not token:
+        return None
+    key = _token_key(token)
+    role = token_cache.get(key)
+    if role:
+        return role
+
+    # The TTL monitor only runs once a minute, so check expiry explicitly
+    doc = await db.auth_tokens.find_one(
+        {"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+        {"role": 1, "expires_at": 1}
+    )
+    if not doc:
+        return None
+    expires_at = doc["expires_at"]
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    token_cache.put(key, doc["role"], expires_at)
+    return doc["role"]
+
+async def revoke_token(token: Optional[str]) -> None:
+    """Delete a token; other workers drop it when their cache entry lapses"""
+    if not token:
+        return
+    key = _token_key(token)
+    token_cache.discard(key)
+    await db.auth_tokens.delete_one({"_id": key})
+
+def get_request_token(request: HTTPConnection) -> Optional[str]:
+    """Read the auth token from the cookie, falling back to the header"""
+    return request.cookies.get(AUTH_COOKIE_NAME) or request.headers.get(AUTH_HEADER_NAME)
+
+# Login endpoints and auth check/logout are reachable without a token
+PUBLIC_PATHS = frozenset({
+    "/api/auth/login", "/api/auth/customer-login", "/api/auth/technician-login",
+    "/api/auth/check", "/api/auth/logout",
+})
+# Translations are public as well
+PUBLIC_PREFIXES = ("/api/translations",)
+
+def require_admin(request: HTTPConnection) -> None:
+    """Raise unless the request was authenticated with an admin token"""
+    if getattr(request.state, "auth_role", None) != ROLE_ADMIN:
+        raise AuthorizationError("Admin access required")
+
+class AuthMiddleware:
+    """
+    Pure ASGI middleware rejecting /api requests without a valid token.
+    
+    Written against the raw ASGI interface rather than BaseHTTPMiddleware so
+    the response (including streamed exports) passes straight through
+    without an extra task and memory stream per request.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requires_auth(scope):
+            await self.app(scope, receive, send)
+            return
         
-        # Check if it's an API route that needs protection
-        if request.url.path.startswith("/api"):
-            # Check both cookie and header for token
-            auth_token = request.cookies.get(AUTH_COOKIE_NAME)
-            if not auth_token:
-                auth_token = request.headers.get(AUTH_HEADER_NAME)
-            
-            # Accept admin, technician, and customer tokens
-            if not auth_token or (auth_token not in valid_tokens and auth_token not in valid_technician_tokens and auth_token not in valid_customer_tokens):
-                return JSONResponse(
-                    status_code=401,
-                    content={"detail": "Unauthorized. Please login."}
-                )
+        # Accept admin, technician, and customer tokens
+        role = await get_token_role(get_request_token(HTTPConnection(scope)))
+        if not role:
+            response = JSONResponse(
+                status_code=401,
+                content={"detail": "Unauthorized. Please login."}
+            )
+            await response(scope, receive, send)
+            return
         
-        return await call_next(request)
+        scope.setdefault("state", {})["auth_role"] = role
+        await self.app(scope, receive, send)
+    
+    @staticmethod
+    def _requires_auth(scope: Scope) -> bool:
+        path = scope["path"]
+        # Skip auth for login endpoints, translations and CORS preflight
+        if path in PUBLIC_PATHS or path.startswith(PUBLIC_PREFIXES):
+            return False
+        if scope["method"] == "OPTIONS":
+            return False
+        # Only API routes need protection
+        return path.startswith("/api")
@@ -0,0 +1,227 @@
+"""
+Blob storage for binary payloads (issue photos).
+
+Two backends share the BlobStore interface:
+- GridFSBlobStore: stores blobs in a MongoDB GridFS bucket (default)
+- LocalBlobStore: stores blobs as files under BLOB_STORE_DIR
+
+Blobs are immutable and content-addressed: new blobs are keyed by the SHA-256
+of their content, so storing identical bytes twice keeps a single copy. The
+hash doubles as ETag. Blobs written before content addressing keep their
+original (ObjectId / uuid) IDs and remain readable.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional
+
+from bson import ObjectId
+from gridfs.errors import NoFile
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+from pymongo.errors import DuplicateKeyError
+
+from .config import BLOB_STORE_BACKEND, BLOB_STORE_DIR
+from .database import db
+
+CHUNK_SIZE = 256 * 1024
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def content_id(data: bytes) -> str:
+    """The ID put() stores `data` under"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def is_content_id(blob_id: str) -> bool:
+    """True if `blob_id` is a SHA-256 content address"""
+    return bool(_SHA256_RE.match(blob_id or ""))
+
+
+class BlobInfo:
+    """Metadata describing a stored blob"""
+
+    def __init__(self, blob_id: str, length: int, content_type: str, sha256: str,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.id = blob_id
+        self.length = length
+        self.content_type = content_type
+        self.sha256 = sha256
+        self.metadata = metadata or {}
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.sha256}"'
+
+
+class BlobStore(ABC):
+    """Interface for storing and streaming immutable blobs"""
+
+    @abstractmethod
+    async def put(self, data: bytes, content_type: str,
+                  metadata: Optional[Dict[str, Any]] = None) -> BlobInfo:
+        """Store `data` under its SHA-256 (no-op if already stored) and return its info"""
+
+    @abstractmethod
+    async def info(self, blob_id: str) -> Optional[BlobInfo]:
+        """Return blob info, or None if the blob does not exist"""
+
+    @abstractmethod
+    def stream(self, blob_id: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Yield the blob content in chunks"""
+
+    @abstractmethod
+    async def delete(self, blob_id: str) -> None:
+        """Delete a blob; missing blobs are ignored"""
+
+    async def read(self, blob_id: str) -> bytes:
+        """Read a whole blob into memory"""
+        return b"".join([chunk async for chunk in self.stream(blob_id)])
+
+
+class GridFSBlobStore(BlobStore):
+    """Blob store backed by a GridFS bucket"""
+
+    def __init__(self, database, bucket_name: str = "blobs"):
+        self.bucket = AsyncIOMotorGridFSBucket(database, bucket_name=bucket_name)
+        self.files = database[f"{bucket_name}.files"]
+
+    @staticmethod
+    def _object_id(blob_id: str) -> Optional[Any]:
+        if is_content_id(blob_id):
+            return blob_id
+        return ObjectId(blob_id) if ObjectId.is_valid(blob_id) else None
+
+    async def put(self, data: bytes, content_type: str,
+                  metadata: Optional[Dict[str, Any]] = None) -> BlobInfo:
+        sha256 = content_id(data)
+        if not await self.files.find_one({"_id": sha256}, {"_id": 1}):
+            file_metadata = {"content_type": content_type, "sha256": sha256, **(metadata or {})}
+            try:
+                await self.bucket.upload_from_stream_with_id(sha256, sha256, data, metadata=file_metadata)
+            except DuplicateKeyError:
+                # Identical content stored concurrently by another request
+                pass
+        return BlobInfo(sha256, len(data), content_type, sha256, metadata)
+
+    async def info(self, blob_id: str) -> Optional[BlobInfo]:
+        oid = self._object_id(blob_id)
+        if oid is None:
+            return None
+        doc = await self.files.find_one({"_id": oid})
+        if not doc:
+            return None
+        meta = dict(doc.get("metadata") or {})
+        content_type = meta.pop("content_type", "application/octet-stream")
+        sha256 = meta.pop("sha256", "")
+        return BlobInfo(blob_id, doc["length"], content_type, sha256, meta)
+
+    async def stream(self, blob_id: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        oid = self._object_id(blob_id)
+        if oid is None:
+            return
+        try:
+            grid_out = await self.bucket.open_download_stream(oid)
+        except NoFile:
+            return
+        while True:
+            chunk = await grid_out.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    async def delete(self, blob_id: str) -> None:
+        oid = self._object_id(blob_id)
+        if oid is None:
+            return
+        try:
+            await self.bucket.delete(oid)
+        except NoFile:
+            pass
+
+
+class LocalBlobStore(BlobStore):
+    """Blob store backed by the local filesystem (one file plus a JSON sidecar per blob)"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, blob_id: str) -> Optional[Path]:
+        # Blob IDs are hex strings; reject anything that could escape root
+        if not blob_id or not all(c in "0123456789abcdef" for c in blob_id):
+            return None
+        return self.root / blob_id[:2] / blob_id
+
+    def _write(self, path: Path, data: bytes, meta: Dict[str, Any]) -> None:
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp names keep concurrent writers of the same content apart;
+        # the sidecar is written first so a visible blob always has metadata
+        suffix = uuid.uuid4().hex
+        meta_tmp = path.with_name(f"{path.name}.json.{suffix}")
+        meta_tmp.write_text(json.dumps(meta))
+        os.replace(meta_tmp, path.with_suffix(".json"))
+        data_tmp = path.with_name(f"{path.name}.{suffix}")
+        data_tmp.write_bytes(data)
+        os.replace(data_tmp, path)
+
+    async def put(self, data: bytes, content_type: str,
+                  metadata: Optional[Dict[str, Any]] = None) -> BlobInfo:
+        sha256 = content_id(data)
+        meta = {"content_type": content_type, "sha256": sha256, "length": len(data),
+                "metadata": metadata or {}}
+        await asyncio.to_thread(self._write, self._path(sha256), data, meta)
+        return BlobInfo(sha256, len(data), content_type, sha256, metadata)
+
+    async def info(self, blob_id: str) -> Optional[BlobInfo]:
+        path = self._path(blob_id)
+        if path is None:
+            return None
+        meta_path = path.with_suffix(".json")
+        try:
+            meta = json.loads(await asyncio.to_thread(meta_path.read_text))
+        except FileNotFoundError:
+            return None
+        return BlobInfo(blob_id, meta["length"], meta["content_type"], meta["sha256"],
+                        meta.get("metadata"))
+
+    async def stream(self, blob_id: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        path = self._path(blob_id)
+        if path is None:
+            return
+        try:
+            handle = await asyncio.to_thread(open, path, "rb")
+        except FileNotFoundError:
+            return
+        try:
+            while True:
+                chunk = await asyncio.to_thread(handle.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            handle.close()
+
+    async def delete(self, blob_id: str) -> None:
+        path = self._path(blob_id)
+        if path is None:
+            return
+        await asyncio.to_thread(path.unlink, True)
+        await asyncio.to_thread(path.with_suffix(".json").unlink, True)
+
+
+def create_blob_store(bucket_name: str) -> BlobStore:
+    """Build the configured blob store backend"""
+    if BLOB_STORE_BACKEND == "local":
+        return LocalBlobStore(BLOB_STORE_DIR / bucket_name)
+    return GridFSBlobStore(db, bucket_name=bucket_name)
+
+
+# Shared store for issue photos
+photo_store = create_blob_store("issue_photos")
@@ -14,6 +14,10 @@ TECHNICIAN_PASSWORD = os.environ.get("TECHNICIAN_PASSWORD", "service2025")
 AUTH_COOKIE_NAME = "dimeda_auth"
 AUTH_HEADER_NAME = "X-Auth-Token"
 AUTH_TOKEN_EXPIRY_DAYS = 7
+# Per-process cache in front of the auth_tokens collection. A logout on one
+# worker is seen by the others within AUTH_TOKEN_CACHE_TTL_SECONDS.
+AUTH_TOKEN_CACHE_SIZE = int(os.environ.get("AUTH_TOKEN_CACHE_SIZE", "10000"))
+AUTH_TOKEN_CACHE_TTL_SECONDS = float(os.environ.get("AUTH_TOKEN_CACHE_TTL_SECONDS", "30"))
 
 # Valid cities for product location
 VALID_CITIES = ["Vilnius", "Kaunas", "Klaipėda", "Šiauliai", "Panevėžys"]
@@ -21,5 +25,61 @@ VALID_CITIES = ["Vilnius", "Kaunas", "Klaipėda", "Šiauliai", "Panevėžys"]
 # Valid model options
 VALID_MODELS = ["Powered Stretchers", "Roll-in stretchers"]
 
+# Blob storage for issue photos: "gridfs" (default) or "local"
+BLOB_STORE_BACKEND = os.environ.get("BLOB_STORE_BACKEND", "gridfs")
+BLOB_STORE_DIR = Path(os.environ.get("BLOB_STORE_DIR", str(ROOT_DIR / "data" / "blobs")))
+PHOTO_MAX_BYTES = int(os.environ.get("PHOTO_MAX_BYTES", str(15 * 1024 * 1024)))
+
+# Photo upload processing (downscaling runs in a process pool)
+PHOTO_MAX_DIMENSION = int(os.environ.get("PHOTO_MAX_DIMENSION", "1920"))
+PHOTO_JPEG_QUALITY = int(os.environ.get("PHOTO_JPEG_QUALITY", "82"))
+IMAGE_WORKERS = int(os.environ.get("IMAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Thumbnail variants generated for every photo: name -> max dimension in pixels
+THUMBNAIL_SIZES = {"sm": 160, "md": 480}
+THUMBNAIL_JPEG_QUALITY = int(os.environ.get("THUMBNAIL_JPEG_QUALITY", "75"))
+
+# Batch PDF service reports (rendering runs in a process pool)
+REPORT_WORKERS = int(os.environ.get("REPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+REPORT_BATCH_MAX_PRODUCTS = int(os.environ.get("REPORT_BATCH_MAX_PRODUCTS", "1000"))
+
+# Request log sampling: errors and slow requests are always logged, other
+# requests per route at LOG_SAMPLE_RATE (or the route's LOG_SAMPLE_ROUTE_RATES
+# entry) once LOG_SAMPLE_MIN_PER_INTERVAL of them have been logged in the
+# current summary interval
+LOG_SAMPLE_RATE = float(os.environ.get("LOG_SAMPLE_RATE", "0.05"))
+# Per-route overrides of LOG_SAMPLE_RATE, keyed by route template, e.g.
+# LOG_SAMPLE_ROUTE_RATES="/api/issues=0.01,/api/auth/check=0"
+LOG_SAMPLE_ROUTE_RATES = {
+    route.strip(): float(rate)
+    for route, _, rate in (
+        item.rpartition("=") for item in os.environ.get("LOG_SAMPLE_ROUTE_RATES", "").split(",") if item.strip()
+    )
+}
+LOG_SAMPLE_MIN_PER_INTERVAL = int(os.environ.get("LOG_SAMPLE_MIN_PER_INTERVAL", "5"))
+LOG_SLOW_REQUEST_MS = float(os.environ.get("LOG_SLOW_REQUEST_MS", "1000"))
+LOG_SUMMARY_INTERVAL_SECONDS = float(os.environ.get("LOG_SUMMARY_INTERVAL_SECONDS", "60"))
+
+# On-demand profiling (admin requests sent with X-Profile: 1)
+PROFILE_BUFFER_SIZE = int(os.environ.get("PROFILE_BUFFER_SIZE", "50"))
+PROFILE_TOP_N = int(os.environ.get("PROFILE_TOP_N", "60"))
+
+# Event-loop stall detection
+LOOP_MONITOR_INTERVAL_SECONDS = float(os.environ.get("LOOP_MONITOR_INTERVAL_SECONDS", "0.5"))
+LOOP_STALL_THRESHOLD_MS = float(os.environ.get("LOOP_STALL_THRESHOLD_MS", "250"))
+
+# Background export jobs: artifacts are written here and removed after the TTL
+EXPORT_ARTIFACT_DIR = Path(os.environ.get("EXPORT_ARTIFACT_DIR", str(ROOT_DIR / "data" / "exports")))
+EXPORT_JOB_WORKERS = int(os.environ.get("EXPORT_JOB_WORKERS", "2"))
+EXPORT_JOB_QUEUE_SIZE = int(os.environ.get("EXPORT_JOB_QUEUE_SIZE", "20"))
+EXPORT_ARTIFACT_TTL_HOURS = float(os.environ.get("EXPORT_ARTIFACT_TTL_HOURS", "24"))
+
+# Incremental exports: deletes are kept as tombstones this long, so a sync
+# must run at least this often to see every delete
+TOMBSTONE_RETENTION_DAYS = int(os.environ.get("TOMBSTONE_RETENTION_DAYS", "90"))
+# updated_at is stamped in the app before the write reaches MongoDB, so the
+# export window ends this far in the past; a write that takes longer than
+# this to land after being stamped can be missed by an incremental sync
+EXPORT_WATERMARK_LAG_SECONDS = float(os.environ.get("EXPORT_WATERMARK_LAG_SECONDS", "5"))
+
 # Frontend URL for CORS
 FRONTEND_URL = os.environ.get('FRONTEND_URL', 'https://stretcher-pro-1.preview.emergentagent.com')
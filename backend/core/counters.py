@@ -0,0 +1,134 @@
+"""
+Atomic counters backed by the `counters` collection.
+
+Each counter is a single document keyed by `_id` and incremented with
+find_one_and_update, so concurrent callers always receive distinct values
+and no collection scan is needed.
+"""
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from .database import db
+
+
+async def next_sequence(name: str) -> int:
+    """Atomically increment counter `name` and return its new value (starting at 1)"""
+    counter = await db.counters.find_one_and_update(
+        {"_id": name},
+        {"$inc": {"seq": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return counter["seq"]
+
+
+async def next_seeded_sequence(name: str, seed: Callable[[], Awaitable[int]]) -> int:
+    """
+    Like next_sequence, but a missing counter starts from `await seed()`.
+
+    Used when values were already handed out before the counter existed
+    (e.g. issue codes generated by counting documents), so the counter
+    continues after them instead of repeating them. The seed is only computed
+    when the counter document does not exist yet.
+    """
+    counter = await db.counters.find_one_and_update(
+        {"_id": name},
+        {"$inc": {"seq": 1}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if counter:
+        return counter["seq"]
+
+    initial = await seed()
+    try:
+        # $max keeps concurrent seeders (and any increments in between) safe
+        await db.counters.update_one({"_id": name}, {"$max": {"seq": initial}}, upsert=True)
+    except DuplicateKeyError:
+        # Another caller created the document first; its seed is equivalent
+        pass
+    return await next_sequence(name)
+
+
+async def next_daily_sequence(
+    prefix: str,
+    now: Optional[datetime] = None,
+    seed: Optional[Callable[[], Awaitable[int]]] = None,
+) -> int:
+    """Atomically increment a counter scoped to the current UTC day"""
+    now = now or datetime.now(timezone.utc)
+    name = f"{prefix}:{now.strftime('%Y-%m-%d')}"
+    if seed is None:
+        return await next_sequence(name)
+    return await next_seeded_sequence(name, seed)
+
+
+# ---------------------------------------------------------------------------
+# Dashboard stats counters
+#
+# A single document holds the headline counts shown by /stats. Write paths in
+# routes/products.py, routes/services.py and routes/issues.py keep it current
+# with $inc; rebuild_stats() recomputes it from the collections on demand.
+# ---------------------------------------------------------------------------
+
+STATS_COUNTER_ID = "stats"
+STATS_FIELDS = ("total_products", "total_services", "open_issues", "resolved_issues")
+
+# Issue statuses that have their own counter
+ISSUE_STATUS_COUNTERS = {"open": "open_issues", "resolved": "resolved_issues"}
+
+
+def issue_status_deltas(old_status: Optional[str], new_status: Optional[str]) -> Dict[str, int]:
+    """Counter deltas for an issue moving from old_status to new_status (None = absent)"""
+    deltas: Dict[str, int] = {}
+    if old_status == new_status:
+        return deltas
+    if old_status in ISSUE_STATUS_COUNTERS:
+        deltas[ISSUE_STATUS_COUNTERS[old_status]] = -1
+    if new_status in ISSUE_STATUS_COUNTERS:
+        deltas[ISSUE_STATUS_COUNTERS[new_status]] = deltas.get(ISSUE_STATUS_COUNTERS[new_status], 0) + 1
+    return deltas
+
+
+async def increment_stats(**deltas: int) -> None:
+    """Apply deltas to the stats counters (only once the document has been built)"""
+    deltas = {field: value for field, value in deltas.items() if value}
+    if not deltas:
+        return
+    # No upsert: a partially-created document would hold wrong totals;
+    # read_stats() builds the full document on first use instead
+    await db.counters.update_one({"_id": STATS_COUNTER_ID}, {"$inc": deltas})
+
+
+async def rebuild_stats() -> Dict[str, int]:
+    """Recompute all stats counters with one $facet aggregation and store them"""
+    def count_where(source: str, **match: Any) -> list:
+        return [{"$match": {"_source": source, **match}}, {"$count": "n"}]
+
+    pipeline = [
+        {"$project": {"_id": 0, "status": 1, "_source": {"$literal": "issues"}}},
+        {"$unionWith": {"coll": "products", "pipeline": [{"$project": {"_id": 0, "_source": {"$literal": "products"}}}]}},
+        {"$unionWith": {"coll": "services", "pipeline": [{"$project": {"_id": 0, "_source": {"$literal": "services"}}}]}},
+        {"$facet": {
+            "total_products": count_where("products"),
+            "total_services": count_where("services"),
+            "open_issues": count_where("issues", status="open"),
+            "resolved_issues": count_where("issues", status="resolved"),
+        }}
+    ]
+    result = await db.issues.aggregate(pipeline).to_list(1)
+    facets = result[0] if result else {}
+    stats = {field: (facets.get(field) or [{"n": 0}])[0]["n"] for field in STATS_FIELDS}
+
+    await db.counters.update_one({"_id": STATS_COUNTER_ID}, {"$set": stats}, upsert=True)
+    return stats
+
+
+async def read_stats() -> Dict[str, int]:
+    """Read the stats counters, building them on first use"""
+    doc = await db.counters.find_one({"_id": STATS_COUNTER_ID})
+    if not doc:
+        return await rebuild_stats()
+    return {field: doc.get(field, 0) for field in STATS_FIELDS}
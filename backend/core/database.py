@@ -1,8 +1,10 @@
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from .db_monitoring import db_command_listener
+
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[db_command_listener])
 db = client[os.environ['DB_NAME']]
 
 async def shutdown_db():
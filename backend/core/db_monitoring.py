@@ -0,0 +1,112 @@
+"""
+MongoDB command monitoring.
+
+A pymongo CommandListener registered on the Motor client times every
+command and records it per collection in core/metrics.py. Commands issued
+while a request is being served are also added to that request's totals
+(calls, time, documents returned), looked up by the request_id in
+core/logging_config.request_context; Motor copies the caller's context
+into its worker threads, so the id is visible from the listener.
+Listener callbacks run on the driver's worker threads and must stay cheap.
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+from pymongo import monitoring
+
+from .logging_config import request_context
+from .metrics import db_operation_duration, db_operation_failures
+
+# Commands whose first value is not a collection name
+_CURSOR_COMMANDS = {"getMore": "collection"}
+
+
+def command_collection(command_name: str, command) -> str:
+    """Collection a command targets, or "-" for database/admin commands"""
+    field = _CURSOR_COMMANDS.get(command_name)
+    value = command.get(field) if field else command.get(command_name)
+    return value if isinstance(value, str) else "-"
+
+
+def reply_document_count(reply) -> int:
+    """Number of documents a command reply carries back to the client"""
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+        return len(batch) if batch is not None else 0
+    if reply.get("value") is not None:
+        # findAndModify
+        return 1
+    return 0
+
+
+class RequestDBStats:
+    """DB round trips made on behalf of one request"""
+
+    __slots__ = ("calls", "duration_ms", "documents")
+
+    def __init__(self):
+        self.calls = 0
+        self.duration_ms = 0.0
+        self.documents = 0
+
+    def as_log_fields(self) -> Dict[str, float]:
+        return {
+            "db_calls": self.calls,
+            "db_time_ms": round(self.duration_ms, 2),
+            "db_documents": self.documents,
+        }
+
+
+class DBCommandListener(monitoring.CommandListener):
+    """Times MongoDB commands per collection and per request"""
+
+    def __init__(self):
+        # (connection_id, request_id) -> (collection, request stats), until the command finishes
+        self._pending: Dict[Tuple, Tuple[str, Optional[RequestDBStats]]] = {}
+        # HTTP request_id -> stats, for requests currently being served
+        self._requests: Dict[str, RequestDBStats] = {}
+        self._lock = threading.Lock()
+
+    def begin_request(self, request_id: str) -> RequestDBStats:
+        """Start attributing commands issued under `request_id`"""
+        stats = RequestDBStats()
+        with self._lock:
+            self._requests[request_id] = stats
+        return stats
+
+    def end_request(self, request_id: str) -> None:
+        with self._lock:
+            self._requests.pop(request_id, None)
+
+    @staticmethod
+    def _key(event) -> Tuple:
+        return (event.connection_id, event.request_id)
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        collection = command_collection(event.command_name, event.command)
+        request_id = request_context.get().get("request_id")
+        with self._lock:
+            stats = self._requests.get(request_id) if request_id else None
+            self._pending[self._key(event)] = (collection, stats)
+
+    def _finish(self, event, documents: int) -> str:
+        duration_ms = event.duration_micros / 1000
+        with self._lock:
+            collection, stats = self._pending.pop(self._key(event), ("-", None))
+            if stats is not None:
+                stats.calls += 1
+                stats.duration_ms += duration_ms
+                stats.documents += documents
+        db_operation_duration.observe(collection, event.command_name, value=duration_ms / 1000)
+        return collection
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, reply_document_count(event.reply))
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        collection = self._finish(event, 0)
+        db_operation_failures.inc(collection, event.command_name)
+
+
+db_command_listener = DBCommandListener()
@@ -11,6 +11,7 @@ import traceback
 
 from .exceptions import AppException
 from .logging_config import get_logger
+from .metrics import app_errors
 
 logger = get_logger(__name__)
 
@@ -22,6 +23,7 @@ def register_exception_handlers(app: FastAPI) -> None:
     async def app_exception_handler(request: Request, exc: AppException) -> JSONResponse:
         """Handle custom application exceptions"""
         request_id = getattr(request.state, "request_id", "unknown")
+        app_errors.inc(exc.code)
         
         logger.warning(
             "Application error",
@@ -45,6 +47,7 @@ def register_exception_handlers(app: FastAPI) -> None:
     async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> JSONResponse:
         """Handle standard HTTP exceptions"""
         request_id = getattr(request.state, "request_id", "unknown")
+        app_errors.inc(_get_error_code(exc.status_code))
         
         logger.warning(
             "HTTP error",
@@ -72,6 +75,7 @@ def register_exception_handlers(app: FastAPI) -> None:
     async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
         """Handle Pydantic validation errors"""
         request_id = getattr(request.state, "request_id", "unknown")
+        app_errors.inc("VALIDATION_ERROR")
         
         # Extract validation errors
         errors = []
@@ -108,6 +112,7 @@ def register_exception_handlers(app: FastAPI) -> None:
     async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
         """Handle all unhandled exceptions"""
         request_id = getattr(request.state, "request_id", "unknown")
+        app_errors.inc("INTERNAL_ERROR")
         
         # Log full traceback for debugging
         logger.error(
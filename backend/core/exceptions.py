@@ -168,6 +168,19 @@ class InvalidStateTransitionError(BusinessLogicError):
         )
 
 
+# Capacity Errors (429)
+class RateLimitError(AppException):
+    """Raised when a bounded queue or rate limit is exhausted"""
+    
+    def __init__(self, message: str = "Too many requests, try again later", details: Optional[Dict] = None):
+        super().__init__(
+            message=message,
+            code="RATE_LIMITED",
+            status_code=429,
+            details=details
+        )
+
+
 # Database Errors (500)
 class DatabaseError(AppException):
     """Raised when database operations fail"""
@@ -0,0 +1,302 @@
+"""
+Background export jobs.
+
+POST /api/export/jobs queues an export into a bounded asyncio queue served
+by EXPORT_JOB_WORKERS worker tasks. A worker streams the exporter's rows
+into a gzip file under EXPORT_ARTIFACT_DIR and keeps the job document in
+`export_jobs` updated with row counts and progress. The job document
+expires through a TTL index and the sweeper deletes artifacts older than
+EXPORT_ARTIFACT_TTL_HOURS.
+
+Artifacts live on the local disk of the worker process that built them,
+so downloads must reach the same node. Jobs still queued or running when
+the server shuts down are marked failed. Each job records the host and PID
+of the process that accepted it; jobs left queued or running by a process
+on this host that is no longer alive (a crash rather than a clean shutdown)
+are marked failed when the runner starts.
+"""
+import asyncio
+import os
+import socket
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from .config import (
+    EXPORT_ARTIFACT_DIR, EXPORT_ARTIFACT_TTL_HOURS,
+    EXPORT_JOB_QUEUE_SIZE, EXPORT_JOB_WORKERS
+)
+from .changes import ChangeWindow
+from .database import db
+from .exceptions import BusinessLogicError, NotFoundError, RateLimitError, ValidationError
+from .exporters import EXPORTERS, Exporter, encode_rows, get_exporter
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# Progress is written to the job document at most this often
+PROGRESS_INTERVAL_SECONDS = 1.0
+SWEEP_INTERVAL_SECONDS = 15 * 60
+
+# Internal fields kept out of API responses
+_PRIVATE_FIELDS = {"_id": 0, "purge_at": 0, "artifact": 0, "download_name": 0, "owner": 0}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def artifact_path(job: Dict[str, Any]) -> Path:
+    return EXPORT_ARTIFACT_DIR / job["artifact"]
+
+
+def _compress_write(handle, compressor, chunk: bytes) -> None:
+    handle.write(compressor.compress(chunk))
+
+
+def _finish_write(handle, compressor) -> None:
+    handle.write(compressor.flush())
+    handle.flush()
+    os.fsync(handle.fileno())
+
+
+class ExportJobRunner:
+    """Bounded queue of export jobs and the workers draining it"""
+
+    def __init__(self, workers: int = EXPORT_JOB_WORKERS, queue_size: int = EXPORT_JOB_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Jobs accepted by this process and not finished yet
+        self._pending: Set[str] = set()
+        # Queue slots held by submits still inserting their job document
+        self._reserved = 0
+        self.owner = {"host": socket.gethostname(), "pid": os.getpid()}
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        EXPORT_ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+        # Taken at start rather than import, in case workers were forked
+        self.owner = {"host": socket.gethostname(), "pid": os.getpid()}
+        await self._fail_orphaned_jobs()
+        self._queue = asyncio.Queue(self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweeper()))
+
+    async def _fail_orphaned_jobs(self) -> None:
+        """Mark jobs failed whose process on this host died without stop() running"""
+        active = await db.export_jobs.find(
+            {"owner.host": self.owner["host"], "status": {"$in": [JOB_QUEUED, JOB_RUNNING]}},
+            {"_id": 0, "id": 1, "owner": 1}
+        ).to_list(None)
+        # Nothing has been submitted to this runner yet, so jobs carrying our
+        # own PID belong to a previous process that reused it (e.g. PID 1)
+        orphaned = [
+            job["id"] for job in active
+            if job["owner"]["pid"] == self.owner["pid"] or not _process_alive(job["owner"]["pid"])
+        ]
+        if not orphaned:
+            return
+        await db.export_jobs.update_many(
+            {"id": {"$in": orphaned}, "status": {"$in": [JOB_QUEUED, JOB_RUNNING]}},
+            {"$set": {"status": JOB_FAILED, "error": "Server stopped before the export finished",
+                      "finished_at": _now().isoformat()}}
+        )
+        logger.warning("Marked orphaned export jobs failed", extra={"details": {"job_ids": orphaned}})
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._pending:
+            await db.export_jobs.update_many(
+                {"id": {"$in": list(self._pending)}, "status": {"$in": [JOB_QUEUED, JOB_RUNNING]}},
+                {"$set": {"status": JOB_FAILED, "error": "Server shut down before the export finished",
+                          "finished_at": _now().isoformat()}}
+            )
+            self._pending.clear()
+
+    async def submit(self, data_type: str, fmt: str = "csv", date_from: Optional[str] = None,
+                     date_to: Optional[str] = None, filters: Optional[Dict[str, str]] = None,
+                     since: Optional[str] = None, until: Optional[str] = None) -> Dict[str, Any]:
+        """Validate and queue an export; returns the new job"""
+        exporter = get_exporter(data_type)
+        if not exporter:
+            raise ValidationError(f"Unknown export type. Use: {', '.join(EXPORTERS)}", field="data_type")
+        # Validate the filters now; the worker rebuilds the query from the stored params
+        window = ChangeWindow.parse(since, until)
+        exporter.build_match(date_from, date_to, filters, window)
+        if self._queue is None:
+            raise BusinessLogicError("Export jobs are not running")
+        # Count slots reserved by submits still awaiting their insert, so the
+        # put_nowait below can never overflow the queue
+        if self._queue.maxsize > 0 and self._queue.qsize() + self._reserved >= self._queue.maxsize:
+            raise RateLimitError("Too many export jobs queued, try again later")
+
+        now = _now()
+        expires = now + timedelta(hours=EXPORT_ARTIFACT_TTL_HOURS)
+        job_id = str(uuid.uuid4())
+        job = {
+            "id": job_id,
+            "data_type": data_type,
+            "format": fmt,
+            "date_from": date_from,
+            "date_to": date_to,
+            "filters": filters or {},
+            # Resolved now so the window does not move while the job waits in the queue
+            "since": window.since.isoformat() if window and window.since else None,
+            "until": window.until.isoformat() if window else None,
+            "status": JOB_QUEUED,
+            "rows_written": 0,
+            "total_rows": None,
+            "progress": 0.0,
+            "file_size": None,
+            "error": None,
+            "created_at": now.isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "expires_at": expires.isoformat(),
+            "purge_at": expires,
+            "artifact": f"{job_id}.{fmt}.gz",
+            "download_name": exporter.file_name(fmt, compress=True, now=now),
+            "owner": self.owner,
+        }
+        self._reserved += 1
+        try:
+            await db.export_jobs.insert_one(dict(job))
+        finally:
+            self._reserved -= 1
+        self._pending.add(job_id)
+        self._queue.put_nowait(job_id)
+        logger.info("Export job queued", extra={"details": {"job_id": job_id, "data_type": data_type}})
+        return public_job(job)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = await db.export_jobs.find_one({"id": job_id}, {"_id": 0})
+                if job:
+                    await self._run(job, get_exporter(job["data_type"]))
+            except asyncio.CancelledError:
+                # Left in _pending so stop() marks the job failed
+                raise
+            except Exception as exc:
+                logger.error(
+                    "Export job failed",
+                    extra={"details": {"job_id": job_id}, "exception_type": type(exc).__name__,
+                           "exception_message": str(exc)}
+                )
+                await db.export_jobs.update_one({"id": job_id}, {"$set": {
+                    "status": JOB_FAILED, "error": str(exc), "finished_at": _now().isoformat()
+                }})
+            self._pending.discard(job_id)
+            self._queue.task_done()
+
+    async def _run(self, job: Dict[str, Any], exporter: Exporter) -> None:
+        job_id = job["id"]
+        window = ChangeWindow.parse(job.get("since"), job.get("until"))
+        match = exporter.build_match(job.get("date_from"), job.get("date_to"), job.get("filters"), window)
+        total = await exporter.count(match, window)
+        await db.export_jobs.update_one({"id": job_id}, {"$set": {
+            "status": JOB_RUNNING, "started_at": _now().isoformat(), "total_rows": total
+        }})
+
+        written = 0
+        last_report = time.monotonic()
+
+        async def counted(rows) -> AsyncIterator[Dict[str, Any]]:
+            nonlocal written, last_report
+            async for row in rows:
+                written += 1
+                yield row
+                if time.monotonic() - last_report >= PROGRESS_INTERVAL_SECONDS:
+                    last_report = time.monotonic()
+                    await db.export_jobs.update_one({"id": job_id}, {"$set": {
+                        "rows_written": written,
+                        "progress": round(min(written / total, 0.99), 4) if total else 0.0,
+                    }})
+
+        path = artifact_path(job)
+        part = path.with_name(path.name + ".part")
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        try:
+            with open(part, "wb") as handle:
+                async for chunk in encode_rows(
+                    exporter, counted(exporter.rows(match, window)), job["format"],
+                    columns=exporter.output_columns(window)
+                ):
+                    # Compression and disk writes run off the event loop
+                    await asyncio.to_thread(_compress_write, handle, compressor, chunk)
+                await asyncio.to_thread(_finish_write, handle, compressor)
+            os.replace(part, path)
+        except BaseException:
+            part.unlink(missing_ok=True)
+            raise
+
+        await db.export_jobs.update_one({"id": job_id}, {"$set": {
+            "status": JOB_COMPLETED,
+            "rows_written": written,
+            "progress": 1.0,
+            "file_size": path.stat().st_size,
+            "finished_at": _now().isoformat(),
+        }})
+        logger.info("Export job completed", extra={"details": {"job_id": job_id, "rows": written}})
+
+    async def _sweeper(self) -> None:
+        while True:
+            await asyncio.to_thread(sweep_artifacts)
+            await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+
+
+def sweep_artifacts() -> int:
+    """Delete artifacts (and abandoned partial files) older than the TTL"""
+    cutoff = time.time() - EXPORT_ARTIFACT_TTL_HOURS * 3600
+    removed = 0
+    for path in EXPORT_ARTIFACT_DIR.glob("*.gz*"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def public_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Job as returned by the API, with a download link once finished"""
+    result = {key: value for key, value in job.items() if key not in _PRIVATE_FIELDS}
+    result["download_url"] = f"/api/export/jobs/{job['id']}/download" if job["status"] == JOB_COMPLETED else None
+    return result
+
+
+async def get_job(job_id: str, include_private: bool = False) -> Dict[str, Any]:
+    job = await db.export_jobs.find_one({"id": job_id}, None if include_private else _PRIVATE_FIELDS)
+    if not job:
+        raise NotFoundError("Export job", job_id)
+    job.pop("_id", None)
+    return job
+
+
+export_jobs = ExportJobRunner()
@@ -0,0 +1,338 @@
+"""
+Bulk export registry.
+
+Each exportable collection is declared once as an Exporter: the output
+columns, the source fields to read, related documents to join, computed
+columns (aggregation expressions) and an optional per-row transform.
+Every exporter runs as a single aggregation streamed from the Motor
+cursor, and the shared writers below serve it as CSV or NDJSON,
+optionally gzip-compressed.
+
+Given a ChangeWindow (since/until watermarks, see core/changes.py) an
+export is incremental: it holds only the rows whose `updated_at` falls in
+the window, led by an `id` column and followed by `updated_at` and
+`deleted`, plus one `deleted=true` row per tombstone recorded in the
+window. Tombstones carry no other fields, so they ignore date ranges and
+filters; consumers drop ids they do not hold.
+"""
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+
+from .changes import ChangeWindow
+from .csv_stream import CSV_BATCH_SIZE, CSV_MEDIA_TYPE, Row, csv_chunks
+from .database import db
+from .exceptions import ValidationError
+from .ndjson import NDJSON_MEDIA_TYPE, ndjson_chunks
+
+EXPORT_FORMATS = {"csv": CSV_MEDIA_TYPE, "ndjson": NDJSON_MEDIA_TYPE}
+GZIP_MEDIA_TYPE = "application/gzip"
+WATERMARK_HEADER = "X-Export-Watermark"
+
+
+class Join:
+    """
+    Copy fields from one related document into each row via $lookup.
+
+    `fields` maps output column -> field of the related document; `default`
+    fills the columns when no related document exists.
+    """
+
+    def __init__(self, collection: str, local_field: str, fields: Dict[str, str],
+                 foreign_field: str = "id", default: Any = None):
+        self.collection = collection
+        self.local_field = local_field
+        self.fields = fields
+        self.foreign_field = foreign_field
+        self.default = default
+
+    def stages(self) -> List[Dict[str, Any]]:
+        alias = f"_join_{self.collection}"
+        return [
+            {"$lookup": {
+                "from": self.collection,
+                "let": {"key": f"${self.local_field}"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": [f"${self.foreign_field}", "$$key"]}}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 0, **{source: 1 for source in self.fields.values()}}},
+                ],
+                "as": alias,
+            }},
+            {"$addFields": {
+                column: {"$ifNull": [{"$arrayElemAt": [f"${alias}.{source}", 0]}, self.default]}
+                for column, source in self.fields.items()
+            }},
+            {"$project": {alias: 0}},
+        ]
+
+
+class Exporter:
+    """One exportable collection"""
+
+    def __init__(self, name: str, collection: str, columns: Sequence[str], *,
+                 filename: str, empty_message: str,
+                 fields: Optional[Sequence[str]] = None, joins: Sequence[Join] = (),
+                 computed: Optional[Dict[str, Any]] = None,
+                 sort: Optional[Dict[str, int]] = None,
+                 date_field: Optional[str] = None,
+                 bson_dates: bool = False,
+                 transform: Optional[Callable[[Row], Row]] = None):
+        self.name = name
+        self.collection = collection
+        self.columns = list(columns)
+        # strftime-style base name, e.g. "products_%Y%m%d" (extension added per format)
+        self.filename = filename
+        self.empty_message = empty_message
+        self.computed = dict(computed or {})
+        derived = {column for join in joins for column in join.fields} | set(self.computed)
+        self.fields = list(fields) if fields is not None else [c for c in self.columns if c not in derived]
+        self.joins = list(joins)
+        self.sort = sort
+        # ISO date string field that date ranges filter on
+        self.date_field = date_field
+        # True when `updated_at` is stored as a BSON date rather than an ISO string
+        self.bson_dates = bson_dates
+        self.transform = transform
+
+    @property
+    def filter_fields(self) -> List[str]:
+        """Stored fields that exports may be filtered on by equality"""
+        return sorted((set(self.fields) | {join.local_field for join in self.joins}) - {"_id"})
+
+    def output_columns(self, window: Optional[ChangeWindow] = None) -> List[str]:
+        """Exported columns; incremental exports add id, updated_at and deleted"""
+        if not window:
+            return self.columns
+        own = [column for column in self.columns if column not in ("id", "updated_at")]
+        return ["id", *own, "updated_at", "deleted"]
+
+    def build_match(self, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                    filters: Optional[Dict[str, str]] = None,
+                    window: Optional[ChangeWindow] = None) -> Dict[str, Any]:
+        """Query for an optional inclusive date range, equality filters and change window"""
+        match: Dict[str, Any] = {}
+        for field, value in (filters or {}).items():
+            if field not in self.filter_fields:
+                raise ValidationError(
+                    f"Cannot filter {self.name} on '{field}'", field="filters",
+                    details={"allowed": self.filter_fields}
+                )
+            match[field] = value
+        if date_from or date_to:
+            if not self.date_field:
+                raise ValidationError(f"{self.name} exports do not support a date range", field="date_from")
+            date_range: Dict[str, str] = {}
+            if date_from:
+                date_range["$gte"] = date_from
+            if date_to:
+                # Dates are ISO strings; include every timestamp on the final day
+                date_range["$lte"] = date_to if "T" in date_to else f"{date_to}T\uffff"
+            match[self.date_field] = date_range
+        if window:
+            match["updated_at"] = window.range(self.bson_dates)
+        return match
+
+    def tombstone_match(self, window: ChangeWindow) -> Dict[str, Any]:
+        return {"collection": self.collection, "deleted_at": window.range()}
+
+    def pipeline(self, match: Optional[Dict[str, Any]] = None,
+                 window: Optional[ChangeWindow] = None) -> List[Dict[str, Any]]:
+        stages: List[Dict[str, Any]] = []
+        if match:
+            stages.append({"$match": match})
+        if self.sort:
+            stages.append({"$sort": self.sort})
+        read = set(self.fields) | {join.local_field for join in self.joins}
+        if window:
+            read |= {"id", "updated_at"}
+        stages.append({"$project": {"_id": 0, **{field: 1 for field in sorted(read)}}})
+        for join in self.joins:
+            stages.extend(join.stages())
+        computed = dict(self.computed)
+        if window:
+            computed["deleted"] = {"$literal": False}
+            if self.bson_dates:
+                # Emit the watermark column in the same ISO form as tombstones
+                computed["updated_at"] = {"$dateToString": {"date": "$updated_at", "format": "%Y-%m-%dT%H:%M:%S.%L+00:00"}}
+        if computed:
+            stages.append({"$addFields": computed})
+        # Ship only the exported columns
+        stages.append({"$project": {"_id": 0, **{column: 1 for column in self.output_columns(window)}}})
+        if window:
+            stages.append({"$unionWith": {"coll": "tombstones", "pipeline": [
+                {"$match": self.tombstone_match(window)},
+                {"$project": {"_id": 0, "id": 1, "updated_at": "$deleted_at", "deleted": {"$literal": True}}},
+            ]}})
+        return stages
+
+    def rows(self, match: Optional[Dict[str, Any]] = None,
+             window: Optional[ChangeWindow] = None) -> AsyncIterator[Row]:
+        """Motor cursor over the exported rows, fetched in batches"""
+        return db[self.collection].aggregate(self.pipeline(match, window), batchSize=CSV_BATCH_SIZE)
+
+    async def count(self, match: Optional[Dict[str, Any]] = None, window: Optional[ChangeWindow] = None) -> int:
+        total = await db[self.collection].count_documents(match or {})
+        if window:
+            total += await db.tombstones.count_documents(self.tombstone_match(window))
+        return total
+
+    def project(self, row: Row, columns: Optional[Sequence[str]] = None) -> Row:
+        """Apply the transform and keep only the given (default: declared) columns, in order"""
+        if self.transform:
+            row = self.transform(row)
+        return {column: row.get(column) for column in (columns or self.columns)}
+
+    def file_name(self, fmt: str, compress: bool, now: Optional[datetime] = None) -> str:
+        name = f"{(now or datetime.now()).strftime(self.filename)}.{fmt}"
+        return f"{name}.gz" if compress else name
+
+
+EXPORTERS: Dict[str, Exporter] = {}
+
+
+def register_exporter(exporter: Exporter) -> Exporter:
+    EXPORTERS[exporter.name] = exporter
+    return exporter
+
+
+def get_exporter(name: str) -> Optional[Exporter]:
+    return EXPORTERS.get(name)
+
+
+async def gzip_chunks(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Gzip-compress a stream of chunks incrementally"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def encode_rows(exporter: Exporter, rows: AsyncIterable[Row], fmt: str, compress: bool = False,
+                columns: Optional[Sequence[str]] = None) -> AsyncIterator[bytes]:
+    """Serialise exporter rows as CSV or NDJSON chunks, optionally gzipped"""
+    columns = list(columns or exporter.columns)
+    if fmt == "csv":
+        # The pipeline already projects the columns; DictWriter orders them
+        chunks = csv_chunks(rows, columns, exporter.transform)
+    else:
+        chunks = ndjson_chunks(rows, lambda row: exporter.project(row, columns))
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def export_response(exporter: Exporter, rows: AsyncIterable[Row], fmt: str = "csv",
+                    compress: bool = False, window: Optional[ChangeWindow] = None) -> StreamingResponse:
+    """Stream exporter rows as a downloadable file"""
+    headers = {"Content-Disposition": f'attachment; filename="{exporter.file_name(fmt, compress)}"'}
+    if window:
+        # The consumer passes this back as `since` on its next sync
+        headers[WATERMARK_HEADER] = window.until.isoformat()
+    return StreamingResponse(
+        encode_rows(exporter, rows, fmt, compress, exporter.output_columns(window)),
+        media_type=GZIP_MEDIA_TYPE if compress else EXPORT_FORMATS[fmt],
+        headers=headers
+    )
+
+
+# ---------------------------------------------------------------------------
+# Exporter declarations
+# ---------------------------------------------------------------------------
+
+def day_of(field: str) -> Dict[str, Any]:
+    """
+    Expression formatting an ISO date string (or BSON date) field as
+    YYYY-MM-DD in UTC; unparseable strings are passed through unchanged.
+    """
+    value = f"${field}"
+    as_date = {"$switch": {
+        "branches": [
+            {"case": {"$eq": [{"$type": value}, "date"]}, "then": value},
+            {"case": {"$eq": [{"$type": value}, "string"]},
+             "then": {"$dateFromString": {"dateString": value, "onError": None}}},
+        ],
+        "default": None,
+    }}
+    return {"$ifNull": [{"$dateToString": {"format": "%Y-%m-%d", "date": as_date}}, value]}
+
+
+def label_of(field: str, labels: Dict[str, str], default: str) -> Dict[str, Any]:
+    """Expression mapping a field's stored value to its display label"""
+    return {"$switch": {
+        "branches": [{"case": {"$eq": [f"${field}", value]}, "then": label} for value, label in labels.items()],
+        "default": default,
+    }}
+
+
+WARRANTY_LABELS = {"warranty": "Warranty", "non_warranty": "Non Warranty"}
+
+PRODUCT_LOCATION = Join("products", "product_id", {"serial_number": "serial_number", "city": "city"}, default="Unknown")
+
+register_exporter(Exporter(
+    "services", "services",
+    ["id", "product_id", "technician_name", "service_type", "description", "issues_found",
+     "warranty_status", "service_date", "created_at"],
+    date_field="service_date",
+    filename="service_records_%Y%m%d",
+    empty_message="No service records found",
+))
+
+register_exporter(Exporter(
+    "products", "products",
+    ["id", "serial_number", "model_name", "model_type", "city", "location_detail", "notes",
+     "registration_date", "status"],
+    date_field="registration_date",
+    filename="products_%Y%m%d",
+    empty_message="No products found",
+))
+
+register_exporter(Exporter(
+    "issues", "issues",
+    ["issue_type", "date", "resolved_date", "serial_number", "city", "technician_name", "warranty_status"],
+    fields=["issue_type", "created_at", "resolved_at", "technician_name", "warranty_status"],
+    joins=[PRODUCT_LOCATION],
+    computed={
+        "issue_type": {"$ifNull": ["$issue_type", ""]},
+        "date": {"$ifNull": [day_of("created_at"), ""]},
+        "resolved_date": {"$cond": [{"$eq": [{"$ifNull": ["$resolved_at", ""]}, ""]}, "N/A", day_of("resolved_at")]},
+        "technician_name": {"$ifNull": ["$technician_name", "N/A"]},
+        "warranty_status": label_of("warranty_status", WARRANTY_LABELS, "N/A"),
+    },
+    date_field="created_at",
+    filename="Issue Report (%Y-%m-%d)",
+    empty_message="No issues found",
+))
+
+register_exporter(Exporter(
+    "maintenance", "scheduled_maintenance",
+    ["id", "product_id", "serial_number", "city", "maintenance_type", "scheduled_date", "status",
+     "priority", "technician_name", "source", "issue_id", "notes", "created_at", "completed_at"],
+    joins=[PRODUCT_LOCATION],
+    sort={"scheduled_date": 1, "id": 1},
+    date_field="scheduled_date",
+    filename="maintenance_%Y%m%d",
+    empty_message="No scheduled maintenance found",
+))
+
+register_exporter(Exporter(
+    "customers", "customers",
+    ["id", "name", "city", "address", "contact_person", "phone", "email", "created_at", "updated_at"],
+    # Customers are keyed by ObjectId and keep BSON dates
+    fields=["_id", "name", "city", "address", "contact_person", "phone", "email", "created_at", "updated_at"],
+    computed={"id": {"$toString": "$_id"}},
+    bson_dates=True,
+    filename="customers_%Y%m%d",
+    empty_message="No customers found",
+))
+
+register_exporter(Exporter(
+    "technician_availability", "technician_unavailable",
+    ["id", "technician_name", "date", "reason"],
+    sort={"technician_name": 1, "date": 1},
+    date_field="date",
+    filename="technician_availability_%Y%m%d",
+    empty_message="No technician unavailability found",
+))
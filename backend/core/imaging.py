@@ -0,0 +1,96 @@
+"""
+Image processing for uploaded photos.
+
+Decoding and re-encoding images is CPU bound, so it runs in a shared
+ProcessPoolExecutor and never on the event loop. Uploads are handed to
+workers as the bytes of the part Starlette spooled (bounded by
+PHOTO_MAX_BYTES); thumbnails are rendered from the already-downscaled
+bytes, which are small.
+"""
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .config import (
+    IMAGE_WORKERS, PHOTO_JPEG_QUALITY, PHOTO_MAX_DIMENSION,
+    THUMBNAIL_JPEG_QUALITY, THUMBNAIL_SIZES
+)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_image_executor() -> ProcessPoolExecutor:
+    """Return the shared image worker pool, creating it on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+    return _executor
+
+
+def shutdown_image_executor() -> None:
+    """Stop the image worker pool (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def downscale_image(data: bytes, max_dimension: int, quality: int) -> bytes:
+    """
+    Downscale an encoded image to fit within max_dimension and re-encode as JPEG.
+
+    Runs inside a worker process. Raises ValueError for unreadable images.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, format="JPEG", quality=quality, optimize=True, progressive=True)
+            return output.getvalue()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        raise ValueError(f"Unsupported or corrupt image: {exc}") from exc
+
+
+def make_thumbnails(data: bytes, sizes: Dict[str, int], quality: int) -> Dict[str, bytes]:
+    """
+    Render one JPEG thumbnail per entry in `sizes` from already-downscaled image bytes.
+
+    Runs inside a worker process. Raises ValueError for unreadable images.
+    """
+    thumbnails = {}
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            source = ImageOps.exif_transpose(source)
+            if source.mode not in ("RGB", "L"):
+                source = source.convert("RGB")
+            for name, max_dimension in sorted(sizes.items(), key=lambda item: -item[1]):
+                image = source.copy()
+                image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+                output = io.BytesIO()
+                image.save(output, format="JPEG", quality=quality, optimize=True)
+                thumbnails[name] = output.getvalue()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        raise ValueError(f"Unsupported or corrupt image: {exc}") from exc
+    return thumbnails
+
+
+async def process_photo(data: bytes) -> bytes:
+    """Downscale and recompress a photo in the worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_image_executor(), downscale_image, data, PHOTO_MAX_DIMENSION, PHOTO_JPEG_QUALITY
+    )
+
+
+async def render_thumbnails(data: bytes) -> Dict[str, bytes]:
+    """Render all configured thumbnail sizes in the worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_image_executor(), make_thumbnails, data, THUMBNAIL_SIZES, THUMBNAIL_JPEG_QUALITY
+    )
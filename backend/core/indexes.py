@@ -0,0 +1,233 @@
+"""
+MongoDB Index Registry
+
+Declares every index the application relies on in one place and applies
+them idempotently at startup. List indexes end with `id` so keyset
+pagination (core/pagination.py) can seek straight to the next page.
+Existing indexes whose key or options differ from the declaration are
+reported as drift instead of being dropped. A changed TTL
+(expireAfterSeconds) is the one option MongoDB can alter in place, so it
+is applied with collMod rather than reported.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from .database import db
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class IndexSpec:
+    """A single declared index: collection, ordered keys and options"""
+
+    def __init__(self, collection: str, keys: List[Tuple[str, int]], name: str, **options: Any):
+        self.collection = collection
+        self.keys = keys
+        self.name = name
+        self.options = options
+
+    @property
+    def unique(self) -> bool:
+        return bool(self.options.get("unique", False))
+
+    @property
+    def expire_after_seconds(self) -> Optional[int]:
+        return self.options.get("expireAfterSeconds")
+
+
+INDEXES: List[IndexSpec] = [
+    # products
+    IndexSpec("products", [("id", ASCENDING)], "products_id_unique", unique=True),
+    IndexSpec("products", [("serial_number", ASCENDING)], "products_serial_number_unique", unique=True),
+    IndexSpec("products", [("updated_at", ASCENDING), ("id", ASCENDING)], "products_updated"),
+    # issues
+    IndexSpec("issues", [("id", ASCENDING)], "issues_id_unique", unique=True),
+    IndexSpec("issues", [("created_at", DESCENDING), ("id", DESCENDING)], "issues_created"),
+    IndexSpec(
+        "issues",
+        [("product_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+        "issues_product_created",
+    ),
+    IndexSpec(
+        "issues",
+        [("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+        "issues_status_created",
+    ),
+    IndexSpec("issues", [("photos", ASCENDING)], "issues_photos"),
+    IndexSpec("issues", [("updated_at", ASCENDING), ("id", ASCENDING)], "issues_updated"),
+    # scheduled_maintenance
+    IndexSpec("scheduled_maintenance", [("id", ASCENDING)], "scheduled_maintenance_id_unique", unique=True),
+    IndexSpec(
+        "scheduled_maintenance",
+        [("status", ASCENDING), ("scheduled_date", ASCENDING), ("id", ASCENDING)],
+        "scheduled_maintenance_status_date",
+    ),
+    IndexSpec(
+        "scheduled_maintenance",
+        [("scheduled_date", ASCENDING), ("id", ASCENDING)],
+        "scheduled_maintenance_date",
+    ),
+    IndexSpec(
+        "scheduled_maintenance",
+        [("product_id", ASCENDING), ("scheduled_date", ASCENDING), ("id", ASCENDING)],
+        "scheduled_maintenance_product_date",
+    ),
+    IndexSpec("scheduled_maintenance", [("issue_id", ASCENDING)], "scheduled_maintenance_issue"),
+    IndexSpec(
+        "scheduled_maintenance",
+        [("updated_at", ASCENDING), ("id", ASCENDING)],
+        "scheduled_maintenance_updated",
+    ),
+    # services
+    IndexSpec("services", [("id", ASCENDING)], "services_id_unique", unique=True),
+    IndexSpec("services", [("service_date", DESCENDING), ("id", DESCENDING)], "services_date"),
+    IndexSpec(
+        "services",
+        [("product_id", ASCENDING), ("service_date", DESCENDING), ("id", DESCENDING)],
+        "services_product_date",
+    ),
+    IndexSpec("services", [("updated_at", ASCENDING), ("id", ASCENDING)], "services_updated"),
+    # customers
+    IndexSpec("customers", [("updated_at", ASCENDING)], "customers_updated"),
+    # technician_unavailable
+    IndexSpec(
+        "technician_unavailable",
+        [("technician_name", ASCENDING), ("date", ASCENDING)],
+        "technician_unavailable_name_date_unique",
+        unique=True,
+    ),
+    IndexSpec(
+        "technician_unavailable",
+        [("updated_at", ASCENDING), ("id", ASCENDING)],
+        "technician_unavailable_updated",
+    ),
+    # tombstones: deletes seen by incremental exports, purged after the retention period
+    IndexSpec("tombstones", [("collection", ASCENDING), ("deleted_at", ASCENDING)], "tombstones_collection_deleted"),
+    IndexSpec("tombstones", [("purge_at", ASCENDING)], "tombstones_purge_ttl", expireAfterSeconds=0),
+    # export_jobs: job documents are purged with their artifacts
+    IndexSpec("export_jobs", [("id", ASCENDING)], "export_jobs_id_unique", unique=True),
+    IndexSpec("export_jobs", [("purge_at", ASCENDING)], "export_jobs_purge_ttl", expireAfterSeconds=0),
+    # auth_tokens: MongoDB removes sessions once expires_at has passed
+    IndexSpec("auth_tokens", [("expires_at", ASCENDING)], "auth_tokens_expiry_ttl", expireAfterSeconds=0),
+]
+
+
+def _key_of(keys) -> Tuple[Tuple[str, Any], ...]:
+    """Normalise an index key list from either a spec or index_information()"""
+    return tuple(
+        (field, int(direction) if isinstance(direction, (int, float)) else direction)
+        for field, direction in keys
+    )
+
+
+async def _sync_ttl(
+    collection_name: str,
+    name: str,
+    spec: IndexSpec,
+    actual_ttl: Optional[int],
+    report: Dict[str, List[str]],
+) -> None:
+    """Bring an existing index's expireAfterSeconds in line with its declaration"""
+    details = {
+        "collection": collection_name,
+        "index": name,
+        "expected_expire_after_seconds": spec.expire_after_seconds,
+        "actual_expire_after_seconds": actual_ttl,
+    }
+    if actual_ttl is None or spec.expire_after_seconds is None:
+        # collMod can change a TTL but not add or remove one
+        report["drift"].append(f"{collection_name}.{name}")
+        logger.warning("Index drift detected", extra={"details": details})
+        return
+
+    try:
+        await db.command(
+            "collMod",
+            collection_name,
+            index={"name": name, "expireAfterSeconds": spec.expire_after_seconds},
+        )
+        report["modified"].append(f"{collection_name}.{name}")
+        logger.info("Index TTL updated", extra={"details": details})
+    except OperationFailure as exc:
+        report["drift"].append(f"{collection_name}.{name}")
+        logger.error("Failed to update index TTL", extra={"details": {**details, "error": str(exc)}})
+
+
+async def ensure_indexes(specs: List[IndexSpec] = INDEXES) -> Dict[str, List[str]]:
+    """
+    Create all declared indexes and report drift.
+
+    Safe to call on every startup: create_index is a no-op when an identical
+    index already exists. Returns a report with created, TTL-modified,
+    conflicting and undeclared index names so callers can log or assert on it.
+    """
+    report: Dict[str, List[str]] = {"created": [], "modified": [], "drift": [], "failed": [], "undeclared": []}
+
+    by_collection: Dict[str, List[IndexSpec]] = {}
+    for spec in specs:
+        by_collection.setdefault(spec.collection, []).append(spec)
+
+    for collection_name, collection_specs in by_collection.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        existing_by_key = {_key_of(info["key"]): (name, info) for name, info in existing.items()}
+
+        for spec in collection_specs:
+            key = _key_of(spec.keys)
+            match = existing_by_key.get(key)
+
+            if match:
+                name, info = match
+                if bool(info.get("unique", False)) != spec.unique:
+                    report["drift"].append(f"{collection_name}.{name}")
+                    logger.warning(
+                        "Index drift detected",
+                        extra={"details": {
+                            "collection": collection_name,
+                            "index": name,
+                            "expected_unique": spec.unique,
+                            "actual_unique": bool(info.get("unique", False)),
+                        }}
+                    )
+                    continue
+                actual_ttl = info.get("expireAfterSeconds")
+                if actual_ttl is not None:
+                    actual_ttl = int(actual_ttl)
+                if actual_ttl != spec.expire_after_seconds:
+                    await _sync_ttl(collection_name, name, spec, actual_ttl, report)
+                continue
+
+            try:
+                await collection.create_index(spec.keys, name=spec.name, **spec.options)
+                report["created"].append(f"{collection_name}.{spec.name}")
+            except (DuplicateKeyError, OperationFailure) as exc:
+                # Typically duplicate data blocking a unique index, or a name clash
+                report["failed"].append(f"{collection_name}.{spec.name}")
+                logger.error(
+                    "Failed to create index",
+                    extra={"details": {
+                        "collection": collection_name,
+                        "index": spec.name,
+                        "error": str(exc),
+                    }}
+                )
+
+        declared_keys = {_key_of(spec.keys) for spec in collection_specs}
+        for key, (name, _info) in existing_by_key.items():
+            if name != "_id_" and key not in declared_keys:
+                report["undeclared"].append(f"{collection_name}.{name}")
+
+    if report["drift"] or report["failed"] or report["undeclared"]:
+        logger.warning("Index registry differs from database", extra={"details": report})
+    logger.info(
+        "Indexes ensured",
+        extra={"details": {
+            "created": len(report["created"]),
+            "modified": len(report["modified"]),
+            "declared": len(specs),
+        }}
+    )
+    return report
@@ -0,0 +1,135 @@
+"""
+Adaptive sampling for per-request log lines.
+
+Every request is counted in a per-route summary, but only some get their
+own "Request completed" line:
+
+- errors (status >= 400 or an exception) and requests slower than
+  LOG_SLOW_REQUEST_MS, always
+- the first LOG_SAMPLE_MIN_PER_INTERVAL requests of each route per
+  interval, so rarely used routes stay fully visible
+- after that, a fraction of the remaining requests: the route's entry in
+  LOG_SAMPLE_ROUTE_RATES, or LOG_SAMPLE_RATE for routes without one
+
+At the end of each interval one "Request summary" line per route reports
+count, errors, how many were logged, and average/max latency. A background
+task started with the app emits the summaries on schedule, so a route that
+goes quiet still gets its last interval reported.
+"""
+import asyncio
+import random
+import time
+from typing import Dict, Mapping, Optional
+
+from .config import (
+    LOG_SAMPLE_MIN_PER_INTERVAL, LOG_SAMPLE_RATE, LOG_SAMPLE_ROUTE_RATES,
+    LOG_SLOW_REQUEST_MS, LOG_SUMMARY_INTERVAL_SECONDS
+)
+from .logging_config import get_logger
+
+logger = get_logger("http")
+
+
+class _RouteStats:
+    __slots__ = ("count", "errors", "logged", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.logged = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+
+class RequestSampler:
+    """Decides which requests get a log line and aggregates the rest"""
+
+    def __init__(self, rate: float = LOG_SAMPLE_RATE, min_per_interval: int = LOG_SAMPLE_MIN_PER_INTERVAL,
+                 slow_ms: float = LOG_SLOW_REQUEST_MS, interval_seconds: float = LOG_SUMMARY_INTERVAL_SECONDS,
+                 route_rates: Mapping[str, float] = LOG_SAMPLE_ROUTE_RATES):
+        self.rate = rate
+        self.route_rates = dict(route_rates)
+        self.min_per_interval = min_per_interval
+        self.slow_ms = slow_ms
+        self.interval_seconds = interval_seconds
+        self._stats: Dict[str, _RouteStats] = {}
+        self._interval_start = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Emit summaries every interval from a background task (call from within the loop)"""
+        if self._task is None:
+            self._interval_start = time.monotonic()
+            self._task = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the background task and emit the final partial interval"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(max(0.0, self._interval_start + self.interval_seconds - time.monotonic()))
+            if time.monotonic() - self._interval_start >= self.interval_seconds:
+                self.flush()
+
+    def rate_for(self, route: str) -> float:
+        """Fraction of successful requests on `route` logged past the per-interval minimum"""
+        return self.route_rates.get(route, self.rate)
+
+    def record(self, route: str, status_code: Optional[int], duration_ms: float) -> bool:
+        """Count a finished request; return True if it should be logged individually"""
+        now = time.monotonic()
+        if now - self._interval_start >= self.interval_seconds:
+            self.flush(now)
+
+        stats = self._stats.get(route)
+        if stats is None:
+            stats = self._stats[route] = _RouteStats()
+        stats.count += 1
+        stats.total_ms += duration_ms
+        if duration_ms > stats.max_ms:
+            stats.max_ms = duration_ms
+
+        is_error = status_code is None or status_code >= 400
+        if is_error:
+            stats.errors += 1
+        should_log = (
+            is_error
+            or duration_ms >= self.slow_ms
+            or stats.logged < self.min_per_interval
+            or random.random() < self.rate_for(route)
+        )
+        if should_log:
+            stats.logged += 1
+        return should_log
+
+    def flush(self, now: Optional[float] = None) -> None:
+        """Log one summary line per route for the interval and start a new one"""
+        now = time.monotonic() if now is None else now
+        interval_s = round(now - self._interval_start, 1)
+        stats_by_route, self._stats = self._stats, {}
+        self._interval_start = now
+
+        for route, stats in sorted(stats_by_route.items()):
+            logger.info(
+                "Request summary",
+                extra={"details": {
+                    "route": route,
+                    "interval_s": interval_s,
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "logged": stats.logged,
+                    "avg_ms": round(stats.total_ms / stats.count, 2),
+                    "max_ms": round(stats.max_ms, 2),
+                }}
+            )
+
+
+request_sampler = RequestSampler()
@@ -6,11 +6,16 @@ Features:
 - Human-readable format for development
 - Request/response correlation via request_id
 - Contextual information (user, endpoint, duration)
+- Formatting and I/O on a background QueueListener thread
 """
+import atexit
+import copy
 import logging
+import queue
 import sys
 import json
 import os
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 from contextvars import ContextVar
@@ -36,54 +41,52 @@ def clear_request_context() -> None:
     request_context.set({})
 
 
+def _record_context(record: logging.LogRecord) -> Dict[str, Any]:
+    """Request context captured when the record was queued, or the live one"""
+    ctx = record.__dict__.get("request_ctx")
+    return request_context.get() if ctx is None else ctx
+
+
 class JSONFormatter(logging.Formatter):
     """
     JSON formatter for structured logging in production.
     Outputs one JSON object per line for easy parsing.
     """
     
+    # Extra attributes copied from the record when present, in output order
+    EXTRA_FIELDS = (
+        "request_id", "path", "method", "query", "client_ip", "user_agent", "status_code", "duration_ms",
+        "db_calls", "db_time_ms", "db_documents",
+        "error_code", "error_message", "details", "validation_errors",
+        "exception_type", "exception_message", "traceback",
+    )
+    CONTEXT_FIELDS = ("user_id", "user_type")
+    
+    _encode = json.JSONEncoder(default=str, separators=(", ", ": ")).encode
+    
     def format(self, record: logging.LogRecord) -> str:
         log_data = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
         
         # Add request context if available
-        ctx = request_context.get()
+        ctx = _record_context(record)
         if ctx:
             log_data["request_id"] = ctx.get("request_id")
-            if "user_id" in ctx:
-                log_data["user_id"] = ctx["user_id"]
-            if "user_type" in ctx:
-                log_data["user_type"] = ctx["user_type"]
+            for field in self.CONTEXT_FIELDS:
+                if field in ctx:
+                    log_data[field] = ctx[field]
         
         # Add extra fields from the log record
-        if hasattr(record, "request_id"):
-            log_data["request_id"] = record.request_id
-        if hasattr(record, "path"):
-            log_data["path"] = record.path
-        if hasattr(record, "method"):
-            log_data["method"] = record.method
-        if hasattr(record, "status_code"):
-            log_data["status_code"] = record.status_code
-        if hasattr(record, "duration_ms"):
-            log_data["duration_ms"] = record.duration_ms
-        if hasattr(record, "error_code"):
-            log_data["error_code"] = record.error_code
-        if hasattr(record, "error_message"):
-            log_data["error_message"] = record.error_message
-        if hasattr(record, "details"):
-            log_data["details"] = record.details
-        if hasattr(record, "validation_errors"):
-            log_data["validation_errors"] = record.validation_errors
-        if hasattr(record, "exception_type"):
-            log_data["exception_type"] = record.exception_type
-        if hasattr(record, "exception_message"):
-            log_data["exception_message"] = record.exception_message
-        if hasattr(record, "traceback"):
-            log_data["traceback"] = record.traceback
+        attrs = record.__dict__
+        for field in self.EXTRA_FIELDS:
+            if field in attrs:
+                log_data[field] = attrs[field]
+        if record.exc_text:
+            log_data["exc_text"] = record.exc_text
         
         # Add file location for errors
         if record.levelno >= logging.ERROR:
@@ -91,7 +94,7 @@ class JSONFormatter(logging.Formatter):
             log_data["line"] = record.lineno
             log_data["function"] = record.funcName
         
-        return json.dumps(log_data, default=str)
+        return self._encode(log_data)
 
 
 class DevelopmentFormatter(logging.Formatter):
@@ -114,10 +117,10 @@ class DevelopmentFormatter(logging.Formatter):
         color = self.COLORS.get(record.levelname, "")
         
         # Format timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S")
         
         # Get request ID if available
-        ctx = request_context.get()
+        ctx = _record_context(record)
         request_id = ctx.get("request_id", "")[:8] if ctx else ""
         req_str = f"[{request_id}]" if request_id else ""
         
@@ -125,20 +128,56 @@ class DevelopmentFormatter(logging.Formatter):
         base = f"{timestamp} {color}{record.levelname:8}{self.RESET} {req_str} {record.name}: {record.getMessage()}"
         
         # Add extra context for HTTP requests
+        attrs = record.__dict__
         extras = []
-        if hasattr(record, "method") and hasattr(record, "path"):
+        if "method" in attrs and "path" in attrs:
             extras.append(f"{record.method} {record.path}")
-        if hasattr(record, "status_code"):
+        if "status_code" in attrs:
             extras.append(f"status={record.status_code}")
-        if hasattr(record, "duration_ms"):
+        if "duration_ms" in attrs:
             extras.append(f"duration={record.duration_ms}ms")
+        if "db_calls" in attrs:
+            extras.append(f"db={record.db_calls}/{record.db_time_ms}ms")
         
         if extras:
             base += f" | {' '.join(extras)}"
+        if record.exc_text:
+            base += f"\n{record.exc_text}"
+        elif "traceback" in attrs:
+            base += f"\n{record.traceback}"
         
         return base
 
 
+class ContextQueueHandler(QueueHandler):
+    """
+    QueueHandler that snapshots the request context onto the record.
+    
+    Formatting happens on the listener thread, where the request's
+    ContextVar is not visible, so the context is captured here instead.
+    Only the message and traceback text are rendered on the calling thread.
+    """
+    
+    _exception_formatter = logging.Formatter()
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        if record.stack_info:
+            record.exc_text = f"{record.exc_text or ''}\n{record.stack_info}".strip()
+            record.stack_info = None
+        record.request_ctx = request_context.get()
+        return record
+
+
+# Background thread writing queued records to the real handlers
+_listener: Optional[QueueListener] = None
+
+
 def setup_logging(
     level: str = "INFO",
     json_format: bool = True,
@@ -147,11 +186,17 @@ def setup_logging(
     """
     Configure the logging system.
     
+    Loggers only enqueue records; a QueueListener thread formats them and
+    writes to stdout / the log file, so slow I/O never blocks the event loop.
+    
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         json_format: Use JSON format (True for production, False for dev)
         log_file: Optional file path to write logs
     """
+    global _listener
+    shutdown_logging()
+    
     # Get root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, level.upper()))
@@ -168,13 +213,18 @@ def setup_logging(
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # File handler (optional)
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(JSONFormatter())  # Always JSON for file
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root_logger.addHandler(ContextQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
     
     # Reduce noise from third-party libraries
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -183,6 +233,19 @@ def setup_logging(
     logging.getLogger("pymongo").setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance with the given name.
@@ -0,0 +1,178 @@
+"""
+Event-loop stall detector.
+
+A heartbeat coroutine wakes every LOOP_MONITOR_INTERVAL_SECONDS and
+records how late it woke up (loop lag) in core/metrics.py. A watchdog
+thread checks the heartbeat; when the loop has not run for longer than
+LOOP_STALL_THRESHOLD_MS it captures the loop thread's current stack,
+i.e. the code blocking the loop, and logs it with the request_id of the
+request whose task is running.
+
+Requests are attributed per task: RequestLoggingMiddleware registers the
+task serving each request, and the monitor's task factory registers tasks
+created while a request context is active (e.g. the task Starlette runs a
+StreamingResponse body in) under the same request_id. During a stall the
+loop thread is stuck inside one task step, so its current task is stable
+and can be read from the watchdog thread.
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from .config import LOOP_MONITOR_INTERVAL_SECONDS, LOOP_STALL_THRESHOLD_MS
+from .logging_config import get_logger, request_context
+from .metrics import registry
+
+logger = get_logger(__name__)
+
+LAG_QUANTILES = (0.5, 0.9, 0.99)
+# Recent lag samples used for the quantile gauges
+LAG_WINDOW = 1000
+
+loop_lag = registry.histogram(
+    "event_loop_lag_seconds",
+    "How late the event-loop heartbeat woke up",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+loop_lag_quantiles = registry.gauge(
+    "event_loop_lag_quantile_seconds",
+    f"Event-loop lag quantiles over the last {LAG_WINDOW} heartbeats",
+    labels=("quantile",),
+)
+loop_stalls = registry.counter(
+    "event_loop_stalls_total",
+    "Times the event loop was blocked for longer than the stall threshold",
+)
+
+# Task -> request_id of the request it is serving
+_task_requests: Dict[asyncio.Task, str] = {}
+
+
+def track_request(request_id: str) -> None:
+    """Attribute the current task to `request_id` (until untrack_request)"""
+    task = asyncio.current_task()
+    if task is not None:
+        _task_requests[task] = request_id
+
+
+def untrack_request() -> None:
+    task = asyncio.current_task()
+    if task is not None:
+        _task_requests.pop(task, None)
+
+
+def _forget_task(task: asyncio.Task) -> None:
+    _task_requests.pop(task, None)
+
+
+def request_id_for_task(task: Optional[asyncio.Task]) -> Optional[str]:
+    return _task_requests.get(task) if task is not None else None
+
+
+class LoopMonitor:
+    """Heartbeat task plus watchdog thread for one event loop"""
+
+    def __init__(self, interval: float = LOOP_MONITOR_INTERVAL_SECONDS,
+                 threshold_ms: float = LOOP_STALL_THRESHOLD_MS):
+        self.interval = interval
+        self.threshold = threshold_ms / 1000
+        self._samples: Deque[float] = deque(maxlen=LAG_WINDOW)
+        self._last_beat = time.monotonic()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._previous_task_factory = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start monitoring the running loop (call from within it)"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._previous_task_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._create_task)
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+        if self._loop is not None:
+            self._loop.set_task_factory(self._previous_task_factory)
+            self._loop = None
+
+    def _create_task(self, loop, coro, **kwargs) -> asyncio.Task:
+        """Task factory: tasks spawned on behalf of a request inherit its request_id"""
+        if self._previous_task_factory is not None:
+            task = self._previous_task_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        # The new task runs in `context` if given, else in a copy of the caller's
+        context = kwargs.get("context")
+        current = context.get(request_context, {}) if context is not None else request_context.get()
+        request_id = current.get("request_id")
+        if request_id:
+            _task_requests[task] = request_id
+            task.add_done_callback(_forget_task)
+        return task
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            self._record(max(0.0, now - expected))
+
+    def _record(self, lag: float) -> None:
+        loop_lag.observe(value=lag)
+        self._samples.append(lag)
+        ordered = sorted(self._samples)
+        for quantile in LAG_QUANTILES:
+            index = min(len(ordered) - 1, int(quantile * len(ordered)))
+            loop_lag_quantiles.set(str(quantile), value=ordered[index])
+
+    def _watch(self) -> None:
+        reported_beat = None
+        check_every = max(self.threshold / 2, 0.01)
+        while not self._stop.wait(check_every):
+            last_beat = self._last_beat
+            blocked_for = time.monotonic() - last_beat - self.interval
+            if blocked_for < self.threshold or reported_beat == last_beat:
+                continue
+            # Report each stall once, while it is still blocking
+            reported_beat = last_beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            task = asyncio.current_task(self._loop) if self._loop is not None else None
+            loop_stalls.inc()
+            logger.warning(
+                "Event loop stalled",
+                extra={
+                    "request_id": request_id_for_task(task),
+                    "duration_ms": round(blocked_for * 1000, 2),
+                    "traceback": "".join(traceback.format_stack(frame)),
+                }
+            )
+
+
+loop_monitor = LoopMonitor()
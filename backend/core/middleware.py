@@ -6,127 +6,180 @@ Logs all HTTP requests with:
 - Request details (method, path, headers)
 - Response status and duration
 - User context when authenticated
+
+Successful requests are sampled (core/log_sampling.py): "Request started"
+is a DEBUG line, and "Request completed" is written for errors, slow
+requests and a per-route sample, with per-route summaries in between.
+
+Implemented as a plain ASGI callable: BaseHTTPMiddleware runs the
+downstream app in a separate task and pipes the body through a memory
+stream, which costs more than most of our handlers and buffers
+StreamingResponse exports.
 """
 import time
 import uuid
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .db_monitoring import db_command_listener
+from .log_sampling import request_sampler
+from .loop_monitor import track_request, untrack_request
+from .metrics import http_request_db_calls, http_request_duration, status_class
 from .logging_config import get_logger, set_request_context, clear_request_context
 
 logger = get_logger("http")
 
+REQUEST_ID_HEADER = "X-Request-ID"
+# DB round trips made before the response headers were sent
+DB_CALLS_HEADER = "X-DB-Calls"
+DB_TIME_HEADER = "X-DB-Time"
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template (e.g. /api/issues/{issue_id}), set once routing ran"""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    return "<unmatched>"
+
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
     Middleware that logs all HTTP requests and responses.
     
     Features:
     - Assigns unique request_id for tracing
-    - Logs request start and completion
-    - Measures request duration
+    - Logs request start (DEBUG) and sampled completion
+    - Measures request duration (until the last body chunk is sent)
     - Captures response status
+    - Reports the request's MongoDB calls and time (headers and log line)
     """
     
     # Paths to skip logging (health checks, static files)
     SKIP_PATHS = {"/health", "/healthz", "/ready", "/metrics"}
     
-    async def dispatch(self, request: Request, call_next) -> Response:
-        # Skip logging for certain paths
-        if request.url.path in self.SKIP_PATHS:
-            return await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip logging for non-HTTP traffic and certain paths
+        if scope["type"] != "http" or scope["path"] in self.SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
         
         # Generate unique request ID
         request_id = str(uuid.uuid4())
+        method = scope["method"]
+        path = scope["path"]
         
-        # Store in request state for access in handlers
-        request.state.request_id = request_id
+        # Store in request state for access in handlers (request.state.request_id)
+        scope.setdefault("state", {})["request_id"] = request_id
         
         # Set request context for logging
-        set_request_context(
-            request_id=request_id,
-            path=str(request.url.path),
-            method=request.method
-        )
+        set_request_context(request_id=request_id, path=path, method=method)
+        track_request(request_id)
+        db_stats = db_command_listener.begin_request(request_id)
         
         # Record start time
         start_time = time.perf_counter()
         
-        # Log request start
-        logger.info(
-            "Request started",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": str(request.url.path),
-                "query": str(request.query_params) if request.query_params else None,
-                "client_ip": self._get_client_ip(request),
-                "user_agent": request.headers.get("user-agent", "")[:100]
-            }
-        )
+        # Request details, attached to whichever line ends up being logged
+        headers = Headers(scope=scope)
+        query = scope.get("query_string", b"").decode("latin-1")
+        request_fields = {
+            "request_id": request_id,
+            "method": method,
+            "path": path,
+            "query": query or None,
+            "client_ip": self._get_client_ip(scope, headers),
+            "user_agent": headers.get("user-agent", "")[:100]
+        }
+        logger.debug("Request started", extra=request_fields)
+        
+        status_code: Optional[int] = None
+        request_id_header = (REQUEST_ID_HEADER.lower().encode("latin-1"), request_id.encode("latin-1"))
+        
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers for client-side correlation
+                message = {**message, "headers": [
+                    *message.get("headers", []),
+                    request_id_header,
+                    (DB_CALLS_HEADER.lower().encode("latin-1"), str(db_stats.calls).encode("latin-1")),
+                    (DB_TIME_HEADER.lower().encode("latin-1"), f"{db_stats.duration_ms:.2f}".encode("latin-1")),
+                ]}
+            await send(message)
         
         # Process request
         try:
-            response = await call_next(request)
-            
-            # Calculate duration
-            duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
-            
-            # Log request completion
-            log_level = "info" if response.status_code < 400 else "warning"
-            getattr(logger, log_level)(
-                "Request completed",
-                extra={
-                    "request_id": request_id,
-                    "method": request.method,
-                    "path": str(request.url.path),
-                    "status_code": response.status_code,
-                    "duration_ms": duration_ms
-                }
-            )
-            
-            # Add request ID to response headers for client-side correlation
-            response.headers["X-Request-ID"] = request_id
-            
-            return response
-            
+            await self.app(scope, receive, send_with_request_id)
         except Exception as exc:
             # Calculate duration even for errors
             duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
             
+            route = route_template(scope)
+            http_request_duration.observe(method, route, status_class(None), value=duration_ms / 1000)
+            http_request_db_calls.observe(route, value=db_stats.calls)
+            request_sampler.record(route, None, duration_ms)
             logger.error(
                 "Request failed with exception",
                 extra={
-                    "request_id": request_id,
-                    "method": request.method,
-                    "path": str(request.url.path),
+                    **request_fields,
+                    **db_stats.as_log_fields(),
                     "duration_ms": duration_ms,
                     "exception_type": type(exc).__name__,
                     "exception_message": str(exc)
                 }
             )
             raise
+        else:
+            # Calculate duration
+            duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+            
+            route = route_template(scope)
+            http_request_duration.observe(method, route, status_class(status_code), value=duration_ms / 1000)
+            http_request_db_calls.observe(route, value=db_stats.calls)
             
+            # Log request completion (errors and slow requests always)
+            if request_sampler.record(route, status_code, duration_ms):
+                log_level = "info" if status_code is not None and status_code < 400 else "warning"
+                getattr(logger, log_level)(
+                    "Request completed",
+                    extra={
+                        **request_fields,
+                        **db_stats.as_log_fields(),
+                        "status_code": status_code,
+                        "duration_ms": duration_ms
+                    }
+                )
         finally:
             # Clear request context
+            db_command_listener.end_request(request_id)
+            untrack_request()
             clear_request_context()
     
-    def _get_client_ip(self, request: Request) -> str:
+    @staticmethod
+    def _get_client_ip(scope: Scope, headers: Headers) -> str:
         """Extract client IP from request, handling proxies"""
         # Check X-Forwarded-For header (set by reverse proxy)
-        forwarded_for = request.headers.get("x-forwarded-for")
+        forwarded_for = headers.get("x-forwarded-for")
         if forwarded_for:
             # Take the first IP in the chain
             return forwarded_for.split(",")[0].strip()
         
         # Check X-Real-IP header
-        real_ip = request.headers.get("x-real-ip")
+        real_ip = headers.get("x-real-ip")
         if real_ip:
             return real_ip
         
         # Fall back to direct client
-        if request.client:
-            return request.client.host
+        client = scope.get("client")
+        if client:
+            return client[0]
         
         return "unknown"
@@ -0,0 +1,55 @@
+"""
+Newline-delimited JSON streaming.
+
+Clients that send `Accept: application/x-ndjson` to a list endpoint receive
+one document per line, streamed straight from the Motor cursor, so memory
+and time-to-first-byte stay flat regardless of collection size.
+"""
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Documents fetched per round trip and bytes buffered per chunk sent
+NDJSON_BATCH_SIZE = 500
+NDJSON_CHUNK_BYTES = 64 * 1024
+
+
+def wants_ndjson(request: Request) -> bool:
+    """True if the client asked for NDJSON via the Accept header"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def ndjson_chunks(rows: AsyncIterable[Dict[str, Any]],
+                        transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+                        ) -> AsyncIterator[bytes]:
+    """Encode each document as one JSON line, in buffered chunks"""
+    buffer = []
+    size = 0
+    async for doc in rows:
+        doc.pop("_id", None)
+        if transform:
+            doc = transform(doc)
+        line = json.dumps(doc, default=str, ensure_ascii=False).encode() + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= NDJSON_CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def ndjson_lines(cursor, transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+                 ) -> AsyncIterator[bytes]:
+    """Encode each document of a Motor cursor as one JSON line, fetching in batches"""
+    return ndjson_chunks(cursor.batch_size(NDJSON_BATCH_SIZE), transform)
+
+
+def ndjson_response(cursor, transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                    headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """Stream a Motor cursor as an NDJSON response"""
+    return StreamingResponse(ndjson_lines(cursor, transform), media_type=NDJSON_MEDIA_TYPE, headers=headers)
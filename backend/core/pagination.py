@@ -0,0 +1,152 @@
+"""
+Keyset (cursor-based) pagination shared by list endpoints.
+
+Pages are ordered by a sort field plus `id` as tie-breaker. The cursor is an
+opaque base64 token holding the last row's sort value and id, so fetching a
+deep page costs the same index seek as the first one.
+
+List routes keep returning a plain JSON array by default (capped, with an
+`X-Next-Cursor` header when more rows exist). Passing `limit` or `cursor`
+switches the response to `{"items": [...], "next_cursor": ...}`, and
+`Accept: application/x-ndjson` streams the whole (optionally limited) list.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import Request, Response
+from pymongo import ASCENDING
+
+from .exceptions import ValidationError
+from .ndjson import ndjson_response, wants_ndjson
+
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    """Build an opaque cursor from the last row's sort value and id"""
+    raw = json.dumps([sort_value, row_id], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValidationError("Invalid pagination cursor", field="cursor")
+    # Both values are spliced into the query, so anything but a scalar sort
+    # value (e.g. {"$ne": null}) would act as an operator
+    if isinstance(sort_value, (dict, list)) or not isinstance(row_id, str):
+        raise ValidationError("Invalid pagination cursor", field="cursor")
+    return sort_value, row_id
+
+
+def _after(sort_field: str, direction: int, sort_value: Any, row_id: Any) -> Dict[str, Any]:
+    """Filter matching rows strictly after (sort_value, row_id) in sort order"""
+    if sort_field == "_id":
+        if not ObjectId.is_valid(row_id):
+            raise ValidationError("Invalid pagination cursor", field="cursor")
+        op = "$gt" if direction == ASCENDING else "$lt"
+        return {"_id": {op: ObjectId(row_id)}}
+
+    # Nulls (and missing fields) sort before every other value in MongoDB
+    if direction == ASCENDING:
+        if sort_value is None:
+            return {"$or": [
+                {sort_field: None, "id": {"$gt": row_id}},
+                {sort_field: {"$ne": None}},
+            ]}
+        return {"$or": [
+            {sort_field: {"$gt": sort_value}},
+            {sort_field: sort_value, "id": {"$gt": row_id}},
+        ]}
+    if sort_value is None:
+        return {sort_field: None, "id": {"$lt": row_id}}
+    return {"$or": [
+        {sort_field: {"$lt": sort_value}},
+        {sort_field: sort_value, "id": {"$lt": row_id}},
+        {sort_field: None},
+    ]}
+
+
+def keyset_find(collection, query: Dict[str, Any], *, sort_field: str, direction: int = ASCENDING,
+                cursor: Optional[str] = None, projection: Optional[Dict[str, Any]] = None):
+    """
+    Return a Motor cursor over `query` in keyset order, starting after `cursor`.
+
+    Sorting on `_id` follows insertion order and needs no tie-breaker.
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        after = _after(sort_field, direction, sort_value, row_id)
+        query = {"$and": [query, after]} if query else after
+
+    projection = dict(projection or {"_id": 0})
+    if sort_field == "_id":
+        projection.pop("_id", None)
+        sort = [("_id", direction)]
+    else:
+        sort = [(sort_field, direction), ("id", direction)]
+    return collection.find(query, projection or None).sort(sort)
+
+
+async def paginate(collection, query: Dict[str, Any], *, sort_field: str, direction: int = ASCENDING,
+                   limit: int, cursor: Optional[str] = None,
+                   projection: Optional[Dict[str, Any]] = None) -> Tuple[List[dict], Optional[str]]:
+    """Fetch one page of at most `limit` rows and the cursor for the next page"""
+    rows = await keyset_find(
+        collection, query, sort_field=sort_field, direction=direction,
+        cursor=cursor, projection=projection
+    ).limit(limit + 1).to_list(limit + 1)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if sort_field == "_id":
+            next_cursor = encode_cursor(None, str(last["_id"]))
+        else:
+            next_cursor = encode_cursor(last.get(sort_field), last.get("id"))
+
+    if sort_field == "_id":
+        for row in rows:
+            row.pop("_id", None)
+    return rows, next_cursor
+
+
+def page_response(items: List[dict], next_cursor: Optional[str], paginated: bool, response: Response):
+    """Shape a page as an envelope, or as a legacy array with the cursor in a header"""
+    if paginated:
+        return {"items": items, "next_cursor": next_cursor}
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+
+async def list_response(request: Request, response: Response, collection, query: Dict[str, Any], *,
+                        sort_field: str, direction: int = ASCENDING, limit: Optional[int] = None,
+                        cursor: Optional[str] = None, default_limit: int = MAX_PAGE_SIZE,
+                        projection: Optional[Dict[str, Any]] = None,
+                        transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+    """Serve a list endpoint as an NDJSON stream, a paginated envelope or a legacy array"""
+    if wants_ndjson(request):
+        find = keyset_find(
+            collection, query, sort_field=sort_field, direction=direction,
+            cursor=cursor, projection=projection
+        )
+        if limit:
+            find = find.limit(limit)
+        return ndjson_response(find, transform)
+
+    items, next_cursor = await paginate(
+        collection, query, sort_field=sort_field, direction=direction,
+        limit=limit or default_limit, cursor=cursor, projection=projection
+    )
+    if transform:
+        items = [transform(item) for item in items]
+    return page_response(items, next_cursor, limit is not None or cursor is not None, response)
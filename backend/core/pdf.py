@@ -0,0 +1,225 @@
+"""
+Minimal PDF writer for server-rendered reports.
+
+Produces single-purpose documents with text, lines and filled rectangles
+using the PDF base-14 Helvetica fonts, which every viewer ships, so no
+font files are embedded and no third-party PDF library is needed. Layout
+coordinates are millimetres from the top-left corner, like jsPDF in the
+frontend. Text is encoded as WinAnsi (cp1252); characters outside it are
+reduced to their base letter (ą -> a), as jsPDF's built-in fonts do.
+"""
+import unicodedata
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+A4_WIDTH_MM = 210.0
+A4_HEIGHT_MM = 297.0
+_PT_PER_MM = 72 / 25.4
+
+Color = Tuple[int, int, int]
+
+FONTS = {"normal": "Helvetica", "bold": "Helvetica-Bold", "italic": "Helvetica-Oblique"}
+_FONT_KEYS = {style: f"F{index}" for index, style in enumerate(FONTS, start=1)}
+
+# Glyph widths (1/1000 em) of ASCII 32..126 from the Adobe font metrics;
+# the oblique face shares the regular widths
+_HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+_HELVETICA_BOLD_WIDTHS = [
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+]
+_WIDTHS = {"normal": _HELVETICA_WIDTHS, "bold": _HELVETICA_BOLD_WIDTHS, "italic": _HELVETICA_WIDTHS}
+_DEFAULT_WIDTH = 556
+
+
+def to_winansi(text: str) -> str:
+    """Replace characters WinAnsi cannot encode with their unaccented form (or '?')"""
+    out = []
+    for char in text:
+        try:
+            char.encode("cp1252")
+            out.append(char)
+        except UnicodeEncodeError:
+            base = unicodedata.normalize("NFKD", char).encode("cp1252", "ignore").decode("cp1252")
+            out.append(base or "?")
+    return "".join(out)
+
+
+def text_width(text: str, size: float, style: str = "normal") -> float:
+    """Width of `text` in millimetres at font `size` (points)"""
+    widths = _WIDTHS[style]
+    units = sum(
+        widths[ord(char) - 32] if 32 <= ord(char) <= 126 else _DEFAULT_WIDTH
+        for char in to_winansi(text)
+    )
+    return units * size / 1000 / _PT_PER_MM
+
+
+def fit_text(text: str, width: float, size: float, style: str = "normal") -> str:
+    """Truncate `text` with an ellipsis so it fits in `width` millimetres"""
+    if text_width(text, size, style) <= width:
+        return text
+    while text and text_width(text + "...", size, style) > width:
+        text = text[:-1]
+    return text.rstrip() + "..."
+
+
+def _escape(text: str) -> bytes:
+    raw = to_winansi(text).encode("cp1252")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _num(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _color(color: Color) -> str:
+    return " ".join(_num(channel / 255) for channel in color)
+
+
+class PDFDocument:
+    """A4 portrait document built page by page"""
+
+    def __init__(self, title: Optional[str] = None):
+        self.title = title
+        self.width = A4_WIDTH_MM
+        self.height = A4_HEIGHT_MM
+        self._pages: List[List[str]] = []
+        self.add_page()
+
+    def add_page(self) -> None:
+        self._pages.append([])
+
+    @property
+    def _ops(self) -> List[str]:
+        return self._pages[-1]
+
+    def _x(self, x: float) -> str:
+        return _num(x * _PT_PER_MM)
+
+    def _y(self, y: float) -> str:
+        return _num((self.height - y) * _PT_PER_MM)
+
+    def text(self, x: float, y: float, text: str, size: float = 10, style: str = "normal",
+             color: Color = (0, 0, 0), align: str = "left") -> None:
+        """Draw one line of text with its baseline at y; align is left, right or center"""
+        if align == "right":
+            x -= text_width(text, size, style)
+        elif align == "center":
+            x -= text_width(text, size, style) / 2
+        self._ops.append(
+            f"BT /{_FONT_KEYS[style]} {_num(size)} Tf {_color(color)} rg "
+            f"{self._x(x)} {self._y(y)} Td ("
+        )
+        self._ops.append(_escape(text).decode("latin-1"))
+        self._ops.append(") Tj ET\n")
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, color: Color = (0, 0, 0),
+             width: float = 0.2) -> None:
+        self._ops.append(
+            f"{_num(width * _PT_PER_MM)} w {_color(color)} RG "
+            f"{self._x(x1)} {self._y(y1)} m {self._x(x2)} {self._y(y2)} l S\n"
+        )
+
+    def rect(self, x: float, y: float, width: float, height: float, fill: Color) -> None:
+        """Filled rectangle with its top-left corner at (x, y)"""
+        self._ops.append(
+            f"{_color(fill)} rg {self._x(x)} {self._y(y + height)} "
+            f"{_num(width * _PT_PER_MM)} {_num(height * _PT_PER_MM)} re f\n"
+        )
+
+    def output(self) -> bytes:
+        """Serialise the document"""
+        objects: Dict[int, bytes] = {}
+        font_ids = {style: 3 + index for index, style in enumerate(FONTS)}
+        for style, obj_id in font_ids.items():
+            objects[obj_id] = (
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{FONTS[style]} "
+                f"/Encoding /WinAnsiEncoding >>"
+            ).encode()
+        fonts = " ".join(f"/{_FONT_KEYS[style]} {obj_id} 0 R" for style, obj_id in font_ids.items())
+
+        next_id = 3 + len(FONTS)
+        page_ids = []
+        media_box = f"[0 0 {_num(self.width * _PT_PER_MM)} {_num(self.height * _PT_PER_MM)}]"
+        for ops in self._pages:
+            content = zlib.compress("".join(ops).encode("latin-1"))
+            content_id, page_id = next_id, next_id + 1
+            next_id += 2
+            objects[content_id] = (
+                f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode()
+                + content + b"\nendstream"
+            )
+            objects[page_id] = (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox {media_box} "
+                f"/Resources << /Font << {fonts} >> >> /Contents {content_id} 0 R >>"
+            ).encode()
+            page_ids.append(page_id)
+
+        objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+        kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+        objects[2] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+        info_id = None
+        if self.title:
+            info_id = next_id
+            objects[info_id] = b"<< /Title (" + _escape(self.title) + b") /Producer (Dimeda Service Pro) >>"
+
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = {}
+        for obj_id in sorted(objects):
+            offsets[obj_id] = len(out)
+            out += f"{obj_id} 0 obj\n".encode() + objects[obj_id] + b"\nendobj\n"
+
+        xref = len(out)
+        size = max(objects) + 1
+        out += f"xref\n0 {size}\n0000000000 65535 f \n".encode()
+        for obj_id in range(1, size):
+            out += f"{offsets[obj_id]:010d} 00000 n \n".encode()
+        trailer = f"<< /Size {size} /Root 1 0 R"
+        if info_id:
+            trailer += f" /Info {info_id} 0 R"
+        out += f"trailer\n{trailer} >>\nstartxref\n{xref}\n%%EOF\n".encode()
+        return bytes(out)
+
+
+def table(doc: PDFDocument, x: float, y: float, widths: Sequence[float], head: Sequence[str],
+          rows: Sequence[Sequence[str]], size: float = 7, padding: float = 1.5,
+          cell_colors: Optional[Dict[Tuple[int, int], Tuple[Color, str]]] = None) -> float:
+    """
+    Draw a simple grid-less table with a shaded header row; returns the y
+    below it. `cell_colors` maps (row, column) to (text colour, font style).
+    """
+    line_height = size / _PT_PER_MM * 1.15
+    row_height = line_height + 2 * padding
+    baseline = padding + line_height * 0.8
+
+    doc.rect(x, y, sum(widths), row_height, fill=(240, 240, 240))
+    cell_x = x
+    for label, width in zip(head, widths):
+        doc.text(cell_x + padding, y + baseline, fit_text(label, width - 2 * padding, size, "bold"),
+                 size=size, style="bold")
+        cell_x += width
+    y += row_height
+
+    for row_index, row in enumerate(rows):
+        if row_index % 2:
+            doc.rect(x, y, sum(widths), row_height, fill=(250, 250, 250))
+        cell_x = x
+        for col_index, (value, width) in enumerate(zip(row, widths)):
+            color, style = (cell_colors or {}).get((row_index, col_index), ((0, 0, 0), "normal"))
+            doc.text(cell_x + padding, y + baseline, fit_text(str(value), width - 2 * padding, size, style),
+                     size=size, style=style, color=color)
+            cell_x += width
+        y += row_height
+    return y
@@ -0,0 +1,227 @@
+"""
+Issue photo helpers.
+
+Issues only keep photo IDs; the image bytes live in the photo blob store.
+These helpers convert legacy inline base64 photos (data URLs) and multipart
+uploads into blobs, and maintain thumbnail variants per photo.
+
+Photos are content-addressed, so the same image attached to several issues
+is stored once. `photo_refs` counts the issues using each photo: a reference
+is taken (retain_photo) before the blob is stored or attached, and the blob
+is deleted only when release_photo drops the count to zero. Thumbnails are
+cached per photo in `photo_variants` and mirrored onto each issue as
+`photo_thumbnails` for list views.
+"""
+import base64
+import binascii
+from typing import Dict, List, Tuple
+
+from fastapi import UploadFile
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from .blobstore import content_id, photo_store
+from .config import PHOTO_MAX_BYTES
+from .database import db
+from .exceptions import ValidationError
+from .imaging import process_photo, render_thumbnails
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def is_inline_photo(photo: str) -> bool:
+    """True if `photo` is inline base64 content rather than a blob ID"""
+    return photo.startswith("data:") or len(photo) > 64
+
+
+def decode_inline_photo(photo: str) -> Tuple[bytes, str]:
+    """Decode a base64 data URL (or bare base64 string) into bytes and content type"""
+    content_type = "image/jpeg"
+    payload = photo
+    if photo.startswith("data:"):
+        header, _, payload = photo.partition(",")
+        media_type = header[len("data:"):].split(";")[0]
+        if media_type:
+            content_type = media_type
+    try:
+        data = base64.b64decode(payload, validate=False)
+    except (binascii.Error, ValueError):
+        raise ValidationError("Photo is not valid base64 data", field="photos")
+    if len(data) > PHOTO_MAX_BYTES:
+        raise ValidationError(
+            "Photo exceeds maximum size",
+            field="photos",
+            details={"max_bytes": PHOTO_MAX_BYTES}
+        )
+    return data, content_type
+
+
+async def verify_photo_id(photo_id: str) -> None:
+    """Reject IDs that are not a stored original photo (unknown blobs or thumbnail variants)"""
+    info = await photo_store.info(photo_id)
+    if not info or info.metadata.get("variant_of"):
+        raise ValidationError("Unknown photo ID", field="photos", details={"photo_id": photo_id})
+
+
+async def store_inline_photos(photos: List[str], ids_attached: bool = False) -> List[str]:
+    """
+    Store inline photos in the blob store and return their IDs.
+
+    Photo IDs pass through after checking they name a stored original, and
+    count as a new reference. `ids_attached=True` is for rewriting an issue
+    that already holds those IDs (migration): they are kept as they are.
+    """
+    photo_ids = []
+    retained = []
+    try:
+        for photo in photos or []:
+            if is_inline_photo(photo):
+                data, content_type = decode_inline_photo(photo)
+                photo = content_id(data)
+                await retain_photo(photo)
+                retained.append(photo)
+                await photo_store.put(data, content_type)
+            elif not ids_attached:
+                await verify_photo_id(photo)
+                await retain_photo(photo)
+                retained.append(photo)
+                # A delete that ran between the check and the reference
+                # leaves nothing to attach, so check again
+                await verify_photo_id(photo)
+            photo_ids.append(photo)
+    except Exception:
+        # The issue is not written, so give back the references taken so far
+        await delete_photos(retained)
+        raise
+    return photo_ids
+
+
+async def store_uploaded_photo(upload: UploadFile) -> str:
+    """Downscale a multipart upload in the worker pool and store it"""
+    # Starlette has already spooled the part to a temporary file and counted it
+    if upload.size is not None and upload.size > PHOTO_MAX_BYTES:
+        raise ValidationError(
+            "Photo exceeds maximum size",
+            field="files",
+            details={"max_bytes": PHOTO_MAX_BYTES, "filename": upload.filename}
+        )
+    await upload.seek(0)
+    raw = await upload.read()
+    try:
+        data = await process_photo(raw)
+    except ValueError as exc:
+        raise ValidationError(str(exc), field="files", details={"filename": upload.filename})
+    await retain_photo(content_id(data))
+    info = await photo_store.put(data, "image/jpeg", {"filename": upload.filename})
+    return info.id
+
+
+async def generate_photo_thumbnails(photo_id: str) -> Dict[str, str]:
+    """
+    Ensure thumbnails exist for `photo_id` and attach them to every issue using it.
+
+    Intended to run as a background task after a photo is stored.
+    """
+    try:
+        cached = await db.photo_variants.find_one({"_id": photo_id})
+        if cached:
+            variants = cached["variants"]
+        else:
+            data = await photo_store.read(photo_id)
+            if not data:
+                return {}
+            rendered = await render_thumbnails(data)
+            variants = {}
+            for name, thumbnail in rendered.items():
+                info = await photo_store.put(thumbnail, "image/jpeg", {"variant_of": photo_id, "variant": name})
+                variants[name] = info.id
+            await db.photo_variants.update_one(
+                {"_id": photo_id}, {"$set": {"variants": variants}}, upsert=True
+            )
+        await db.issues.update_many(
+            {"photos": photo_id},
+            {"$set": {f"photo_thumbnails.{photo_id}": variants}}
+        )
+        return variants
+    except Exception as exc:
+        logger.error(
+            "Thumbnail generation failed",
+            extra={"details": {"photo_id": photo_id, "error": str(exc)}}
+        )
+        return {}
+
+
+async def retain_photo(photo_id: str) -> None:
+    """Count one more issue using `photo_id`; call before storing or attaching it"""
+    result = await db.photo_refs.update_one({"_id": photo_id}, {"$inc": {"refs": 1}})
+    if result.matched_count:
+        return
+    # First reference since counting began: start from the issues already using it
+    existing = await db.issues.count_documents({"photos": photo_id})
+    try:
+        await db.photo_refs.update_one({"_id": photo_id}, {"$max": {"refs": existing}}, upsert=True)
+    except DuplicateKeyError:
+        # Seeded concurrently by another caller
+        pass
+    await db.photo_refs.update_one({"_id": photo_id}, {"$inc": {"refs": 1}})
+
+
+async def release_photo(photo_id: str) -> None:
+    """Drop one reference to `photo_id`, deleting the photo when none remain"""
+    counter = await db.photo_refs.find_one_and_update(
+        {"_id": photo_id}, {"$inc": {"refs": -1}}, return_document=ReturnDocument.AFTER
+    )
+    if counter is None:
+        # Stored before counting began; the releasing issue is already gone
+        remaining = await db.issues.count_documents({"photos": photo_id})
+        if remaining:
+            try:
+                await db.photo_refs.update_one({"_id": photo_id}, {"$max": {"refs": remaining}}, upsert=True)
+            except DuplicateKeyError:
+                pass
+            return
+    elif counter["refs"] > 0:
+        return
+    await _purge_photo(photo_id)
+
+
+async def _purge_photo(photo_id: str) -> None:
+    """
+    Delete a photo and its thumbnails, then re-check its count.
+
+    An upload of identical bytes may take a reference while the delete is in
+    progress and find the blob still present; the photo is then put back.
+    Uploads that take their reference after the re-check store the blob
+    themselves, since put() finds it missing.
+    """
+    info = await photo_store.info(photo_id)
+    data = await photo_store.read(photo_id) if info else b""
+
+    cached = await db.photo_variants.find_one({"_id": photo_id})
+    if cached:
+        for variant_id in cached["variants"].values():
+            await photo_store.delete(variant_id)
+        await db.photo_variants.delete_one({"_id": photo_id})
+    await photo_store.delete(photo_id)
+
+    counter = await db.photo_refs.find_one({"_id": photo_id})
+    if counter and counter["refs"] > 0:
+        if info:
+            await photo_store.put(data, info.content_type, info.metadata)
+            await generate_photo_thumbnails(photo_id)
+        logger.info("Photo re-attached during delete, restored", extra={"details": {"photo_id": photo_id}})
+        return
+    await db.photo_refs.delete_one({"_id": photo_id, "refs": {"$lte": 0}})
+
+
+async def delete_photos(photo_ids: List[str]) -> None:
+    """
+    Release one reference to each photo, deleting photos no issue uses anymore.
+
+    Must be called after the owning issue has been removed or updated.
+    """
+    for photo_id in photo_ids or []:
+        if is_inline_photo(photo_id):
+            continue
+        await release_photo(photo_id)
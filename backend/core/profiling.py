@@ -0,0 +1,121 @@
+"""
+On-demand request profiling.
+
+An admin can profile a single request by sending `X-Profile: 1` (or
+`?_profile=1`). The request runs under cProfile and the top functions by
+cumulative time are kept in a bounded in-memory ring buffer, served from
+GET /api/debug/profiles/{request_id} using the request's X-Request-ID.
+
+cProfile hooks the whole event-loop thread, so other requests that
+interleave with the profiled one show up in its profile too; only one
+request is profiled at a time. The buffer is per worker process, so fetch
+profiles from the worker that served the request.
+"""
+import cProfile
+import io
+import pstats
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from starlette.datastructures import Headers, QueryParams
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .auth import ROLE_ADMIN
+from .config import PROFILE_BUFFER_SIZE, PROFILE_TOP_N
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "_profile"
+
+
+class ProfileBuffer:
+    """Keeps the most recent profiles keyed by request_id"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def add(self, profile: Dict[str, Any]) -> None:
+        self._profiles[profile["request_id"]] = profile
+        while len(self._profiles) > self.max_size:
+            self._profiles.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        return self._profiles.get(request_id)
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """Newest first, without the stats text"""
+        return [
+            {key: value for key, value in profile.items() if key != "stats"}
+            for profile in reversed(self._profiles.values())
+        ]
+
+
+profile_buffer = ProfileBuffer(PROFILE_BUFFER_SIZE)
+
+
+def _profile_requested(scope: Scope) -> bool:
+    if Headers(scope=scope).get(PROFILE_HEADER, "").lower() in ("1", "true", "yes"):
+        return True
+    query = scope.get("query_string", b"")
+    return bool(query) and QueryParams(query).get(PROFILE_QUERY_PARAM, "").lower() in ("1", "true", "yes")
+
+
+def _format_stats(profiler: cProfile.Profile) -> str:
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_N)
+    return out.getvalue()
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware running admin-flagged requests under cProfile.
+
+    Must sit inside AuthMiddleware (for the role) and RequestLoggingMiddleware
+    (for the request_id), i.e. be added to the app before both.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.get("state", {})
+        request_id = state.get("request_id")
+        if state.get("auth_role") != ROLE_ADMIN or not request_id:
+            await self.app(scope, receive, send)
+            return
+        if self._active:
+            logger.warning("Profile skipped, another request is being profiled",
+                           extra={"request_id": request_id})
+            await self.app(scope, receive, send)
+            return
+
+        self._active = True
+        profiler = cProfile.Profile()
+        start_time = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+            self._active = False
+            duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+            profile_buffer.add({
+                "request_id": request_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "duration_ms": duration_ms,
+                "stats": _format_stats(profiler),
+            })
+            logger.info("Request profiled", extra={"request_id": request_id, "duration_ms": duration_ms})
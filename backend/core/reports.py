@@ -0,0 +1,396 @@
+"""
+Batch device inspection reports.
+
+Server-side counterpart of the per-stretcher PDF built in
+frontend/src/pages/Export.jsx. A batch is loaded with one query per
+collection, each product's report is rendered in a ProcessPoolExecutor
+(layout is CPU bound), and the PDFs are streamed as a zip archive while
+later reports are still rendering.
+
+Inspection checklist answers follow the frontend's defaults: every item
+passes unless an unresolved "other" issue lists it as failed.
+"""
+import asyncio
+import re
+import time
+import unicodedata
+import zipfile
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from .config import REPORT_BATCH_MAX_PRODUCTS, REPORT_WORKERS
+from .database import db
+from .exceptions import NotFoundError, ValidationError
+from .pdf import PDFDocument, table
+
+ZIP_MEDIA_TYPE = "application/zip"
+
+VISUAL_INSPECTION = [
+    "All mechanical and screw connections are sealed",
+    "All welds are intact, without cracks or breaks",
+    "All components are in good order, not broken or bent",
+    "The mattress cover is not torn, has no cracks or holes",
+    "Belts not frayed or torn",
+    "Belt stitching is not loose or frayed",
+]
+
+FUNCTIONALITY_INSPECTION = [
+    "Adjustable backrest or headrest works properly",
+    "Adjustable footrest or shank works properly",
+    "The stretchers are easy to manoeuvre and rotate 360°",
+    "The side rails work properly",
+    "The loading wheels turn freely",
+    "Wheel brakes work properly",
+    "The front swivel wheel lock works properly",
+    "All levers are intact and working properly",
+    "All fastening straps and buckles work properly",
+    "The monoblock can be easily loaded into and unloaded from the vehicle",
+    "The monoblock works properly in all height positions",
+    "Indicators working properly",
+    "The nut on the locking pin is properly tightened",
+]
+
+_VISUAL_RE = re.compile(r"Visual Inspection Issues:\n([\s\S]*?)(?=\n\nFunctionality|\n\nAdditional|\Z)")
+_FUNCTIONALITY_RE = re.compile(r"Functionality Inspection Issues:\n([\s\S]*?)(?=\n\nAdditional|\Z)")
+
+# Rows shown in the issue and service tables, as in the frontend report
+REPORT_ISSUE_ROWS = 5
+REPORT_SERVICE_ROWS = 4
+
+_ISSUE_FIELDS = {
+    "_id": 0, "product_id": 1, "title": 1, "issue_type": 1, "severity": 1,
+    "status": 1, "created_at": 1, "description": 1,
+}
+_SERVICE_FIELDS = {
+    "_id": 0, "product_id": 1, "service_type": 1, "technician_name": 1,
+    "service_date": 1, "description": 1,
+}
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_report_executor() -> ProcessPoolExecutor:
+    """Return the shared report worker pool, creating it on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=REPORT_WORKERS)
+    return _executor
+
+
+def shutdown_report_executor() -> None:
+    """Stop the report worker pool (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+# ---------------------------------------------------------------------------
+# Report content
+# ---------------------------------------------------------------------------
+
+def _listed_items(pattern: re.Pattern, description: str) -> Set[str]:
+    match = pattern.search(description)
+    if not match:
+        return set()
+    return {re.sub(r"^-\s*", "", item).strip() for item in match.group(1).split("\n")} - {""}
+
+
+def failed_inspection_items(issues: List[Dict[str, Any]]) -> Tuple[Set[int], Set[int]]:
+    """Indexes of visual and functionality items failed by unresolved "other" issues"""
+    visual: Set[str] = set()
+    functionality: Set[str] = set()
+    for issue in issues:
+        if issue.get("issue_type") != "other" or issue.get("status") == "resolved":
+            continue
+        description = issue.get("description") or ""
+        visual |= _listed_items(_VISUAL_RE, description)
+        functionality |= _listed_items(_FUNCTIONALITY_RE, description)
+    return (
+        {index for index, item in enumerate(VISUAL_INSPECTION) if item in visual},
+        {index for index, item in enumerate(FUNCTIONALITY_INSPECTION) if item in functionality},
+    )
+
+
+def device_suitability(issues: List[Dict[str, Any]]) -> Tuple[bool, str]:
+    """Whether the device is fit for use, and why"""
+    open_issues = [issue for issue in issues if issue.get("status") != "resolved"]
+    serious = [issue for issue in open_issues if issue.get("severity") in ("critical", "high")]
+    if serious:
+        return False, f"{len(serious)} unresolved high/critical issue(s)"
+    if open_issues:
+        return True, f"{len(open_issues)} minor issue(s) (low/medium severity)"
+    return True, "All issues resolved or no issues reported"
+
+
+def _parse_date(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _format_date(value: Any, fmt: str) -> str:
+    parsed = _parse_date(value)
+    return parsed.strftime(fmt) if parsed else str(value or "-")
+
+
+def _short(text: Any, length: int) -> str:
+    text = str(text or "")
+    return text[:length] + ("..." if len(text) > length else "")
+
+
+# ---------------------------------------------------------------------------
+# Rendering (runs in worker processes)
+# ---------------------------------------------------------------------------
+
+BLUE = (0, 102, 204)
+GREEN = (0, 128, 0)
+RED = (255, 0, 0)
+GRAY = (100, 100, 100)
+LIGHT_GRAY = (150, 150, 150)
+RULE = (200, 200, 200)
+MARGIN = 15.0
+SIGNATURE_Y = 277.0
+# Table row height at 7pt with 1.5mm padding
+_ROW_HEIGHT = 5.9
+
+
+def _section_title(doc: PDFDocument, y: float, title: str) -> float:
+    doc.text(MARGIN, y, title, size=9, style="bold", color=BLUE)
+    return y + 3
+
+
+def _ensure_room(doc: PDFDocument, y: float, rows: int) -> float:
+    """Start a new page when a section of `rows` table rows would reach the signature"""
+    if y + 3 + (rows + 1) * _ROW_HEIGHT > SIGNATURE_Y - 8:
+        doc.add_page()
+        return MARGIN + 5
+    return y
+
+
+def _checklist(doc: PDFDocument, y: float, title: str, items: List[str], failed: Set[int]) -> float:
+    y = _ensure_room(doc, y, len(items))
+    y = _section_title(doc, y, title)
+    rows = [[item, "No" if index in failed else "Yes"] for index, item in enumerate(items)]
+    colors = {
+        (index, 1): (RED, "bold") if index in failed else (GREEN, "normal")
+        for index in range(len(items))
+    }
+    return table(doc, MARGIN, y, [150, 20], ["Check Item", "Status"], rows, cell_colors=colors) + 4
+
+
+def _history(doc: PDFDocument, y: float, title: str, head: List[str], widths: List[float],
+             rows: List[List[str]], empty: str) -> float:
+    y = _ensure_room(doc, y, max(len(rows), 1))
+    y = _section_title(doc, y, title)
+    if not rows:
+        doc.text(MARGIN, y + 3, empty, size=7, style="italic", color=LIGHT_GRAY)
+        return y + 6
+    return table(doc, MARGIN, y, widths, head, rows) + 4
+
+
+def render_service_report(data: Dict[str, Any]) -> bytes:
+    """
+    Render one device inspection report as PDF bytes.
+
+    `data` holds the product, its issues (newest first), its latest
+    services, the report date (ISO) and the reporter's name. Runs inside a
+    worker process.
+    """
+    product = data["product"]
+    issues = data["issues"]
+    services = data["services"]
+    report_date = date.fromisoformat(data["report_date"])
+    doc = PDFDocument(title=f"Device Inspection Report {product.get('serial_number', '')}")
+    right = doc.width - MARGIN
+
+    doc.text(MARGIN, 23, "DIMEDA", size=14, style="bold", color=BLUE)
+    doc.text(right, 21, "Device Inspection Report", size=16, style="bold", align="right")
+    doc.text(right, 27, f"Report Date: {report_date.strftime('%B')} {report_date.day}, {report_date.year}",
+             size=10, color=GRAY, align="right")
+    doc.line(MARGIN, 35, right, 35, color=RULE)
+
+    # Product information (left) and conclusion (right)
+    y = 41.0
+    doc.text(MARGIN, y, "Product Information", size=10, style="bold", color=BLUE)
+    registered = _parse_date(product.get("registration_date"))
+    info = [
+        ("Serial Number:", product.get("serial_number")),
+        ("Model:", product.get("model_name")),
+        ("City:", product.get("city")),
+        ("Location:", product.get("location_detail") or "-"),
+        ("Registration:", f"{registered.strftime('%b')} {registered.day}, {registered.year}" if registered else "-"),
+    ]
+    left_y = y + 5
+    for label, value in info:
+        doc.text(MARGIN, left_y, label, size=8, style="bold")
+        doc.text(MARGIN + 25, left_y, str(value or "-"), size=8)
+        left_y += 4
+
+    right_x = MARGIN + (doc.width - MARGIN * 3) / 2 + MARGIN
+    suitable, reason = device_suitability(issues)
+    doc.text(right_x, y, "Conclusion", size=10, style="bold", color=BLUE)
+    doc.text(right_x, y + 6, "Device is suitable for use" if suitable else "Device is NOT suitable for use",
+             size=11, style="bold", color=GREEN if suitable else RED)
+    doc.text(right_x, y + 11, reason, size=7, color=GRAY)
+
+    y = max(left_y, y + 11) + 4
+    doc.line(MARGIN, y, right, y, color=RULE)
+    y += 4
+
+    failed_visual, failed_functionality = failed_inspection_items(issues)
+    y = _checklist(doc, y, "Visual Inspection", VISUAL_INSPECTION, failed_visual)
+    y = _checklist(doc, y, "Functionality Inspection", FUNCTIONALITY_INSPECTION, failed_functionality)
+
+    issue_rows = [
+        [_short(issue.get("title"), 20), issue.get("issue_type") or "", issue.get("severity") or "",
+         issue.get("status") or "", _format_date(issue.get("created_at"), "%m/%d/%y")]
+        for issue in issues[:REPORT_ISSUE_ROWS]
+    ]
+    y = _history(doc, y, "Issues", ["Title", "Type", "Severity", "Status", "Date"],
+                 [52, 32, 32, 32, 32], issue_rows, "No issues reported")
+
+    service_rows = [
+        [service.get("service_type") or "", service.get("technician_name") or "",
+         _format_date(service.get("service_date"), "%m/%d/%y"), _short(service.get("description"), 30)]
+        for service in services[:REPORT_SERVICE_ROWS]
+    ]
+    _history(doc, y, "Service Records", ["Type", "Technician", "Date", "Description"],
+             [35, 40, 25, 80], service_rows, "No service records")
+
+    # Signature block on the last page
+    doc.line(MARGIN, SIGNATURE_Y - 6, right, SIGNATURE_Y - 6, color=RULE)
+    doc.text(MARGIN, SIGNATURE_Y, "Name:", size=8)
+    doc.text(MARGIN + 12, SIGNATURE_Y, data["reporter"], size=8, style="bold")
+    doc.text(MARGIN, SIGNATURE_Y + 5, "Date:", size=8)
+    doc.text(MARGIN + 12, SIGNATURE_Y + 5, report_date.strftime("%m/%d/%Y"), size=8)
+    doc.text(right - 45, SIGNATURE_Y, "Signature:", size=8)
+    doc.line(right - 32, SIGNATURE_Y + 2, right, SIGNATURE_Y + 2)
+    return doc.output()
+
+
+# ---------------------------------------------------------------------------
+# Batch loading and streaming
+# ---------------------------------------------------------------------------
+
+async def load_report_batch(product_ids: Optional[List[str]] = None,
+                            city: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Load the products of a batch with their issues and latest services,
+    one query per collection. Returns one entry per product.
+    """
+    query = {"id": {"$in": product_ids}} if product_ids else {"city": city}
+    products = await db.products.find(query, {"_id": 0}).sort("serial_number", 1).to_list(
+        REPORT_BATCH_MAX_PRODUCTS + 1
+    )
+    if product_ids:
+        missing = sorted(set(product_ids) - {product["id"] for product in products})
+        if missing:
+            raise ValidationError("Unknown product IDs", field="product_ids", details={"missing": missing})
+    if not products:
+        raise NotFoundError("Products", city, message=f"No products found in {city}")
+    if len(products) > REPORT_BATCH_MAX_PRODUCTS:
+        raise ValidationError(
+            f"A report batch is limited to {REPORT_BATCH_MAX_PRODUCTS} products",
+            field="product_ids" if product_ids else "city"
+        )
+
+    ids = [product["id"] for product in products]
+    issues: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    # Every issue is needed: open ones decide suitability and checklist answers
+    async for issue in db.issues.find({"product_id": {"$in": ids}}, _ISSUE_FIELDS).sort(
+        [("created_at", -1), ("id", -1)]
+    ):
+        issues[issue["product_id"]].append(issue)
+
+    services: Dict[str, List[Dict[str, Any]]] = {}
+    pipeline = [
+        {"$match": {"product_id": {"$in": ids}}},
+        {"$sort": {"service_date": -1}},
+        {"$project": _SERVICE_FIELDS},
+        {"$group": {"_id": "$product_id", "services": {"$push": "$$ROOT"}}},
+        {"$project": {"services": {"$slice": ["$services", REPORT_SERVICE_ROWS]}}},
+    ]
+    async for group in db.services.aggregate(pipeline):
+        services[group["_id"]] = group["services"]
+
+    return [
+        {"product": product, "issues": issues.get(product["id"], []), "services": services.get(product["id"], [])}
+        for product in products
+    ]
+
+
+def safe_file_name(text: str) -> str:
+    """ASCII-only file name part (Content-Disposition headers and zip entries)"""
+    ascii_text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", ascii_text).strip("_") or "report"
+
+
+def report_file_name(product: Dict[str, Any], report_date: date) -> str:
+    serial = safe_file_name(product.get("serial_number") or product["id"])
+    return f"Device_Report_{serial}_{report_date.strftime('%Y%m%d')}.pdf"
+
+
+class _ZipStream:
+    """Write-only sink for zipfile; written bytes are collected until drained"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def report_zip_chunks(batch: List[Dict[str, Any]], report_date: date, reporter: str) -> AsyncIterator[bytes]:
+    """
+    Render every report of a batch in the worker pool and stream them as
+    one zip archive, in batch order. A bounded window of reports is in
+    flight at a time so memory stays flat for large batches.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_report_executor()
+    window = REPORT_WORKERS * 2
+    entries = iter(batch)
+    pending: Deque[Tuple[Dict[str, Any], asyncio.Future]] = deque()
+
+    def submit() -> None:
+        entry = next(entries, None)
+        if entry is not None:
+            payload = {**entry, "report_date": report_date.isoformat(), "reporter": reporter}
+            pending.append((entry["product"], loop.run_in_executor(executor, render_service_report, payload)))
+
+    stream = _ZipStream()
+    names: Set[str] = set()
+    try:
+        for _ in range(window):
+            submit()
+        # PDF content streams are already deflated, so entries are stored as-is
+        with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_STORED) as archive:
+            while pending:
+                product, future = pending.popleft()
+                pdf = await future
+                submit()
+                name = report_file_name(product, report_date)
+                if name in names:
+                    name = name.replace(".pdf", f"_{product['id'][:8]}.pdf")
+                names.add(name)
+                archive.writestr(zipfile.ZipInfo(name, date_time=time.localtime()[:6]), pdf)
+                yield stream.drain()
+        yield stream.drain()
+    finally:
+        for _, future in pending:
+            future.cancel()
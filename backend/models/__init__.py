@@ -1,7 +1,10 @@
 # Models module
-from .product import ProductBase, ProductCreate, Product
+from .product import ProductBase, ProductCreate, Product, ProductFull
 from .service import ServiceRecordBase, ServiceRecordCreate, ServiceRecord
 from .issue import IssueBase, IssueCreate, Issue, CustomerIssueCreate, IssueUpdate
 from .maintenance import ScheduledMaintenanceBase, ScheduledMaintenanceCreate, ScheduledMaintenance, ScheduledMaintenanceUpdate
 from .auth import LoginRequest
 from .technician import TechnicianUnavailable
+from .pagination import Page
+from .export import ExportJobCreate, ExportJob
+from .report import ServiceReportBatch
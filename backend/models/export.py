@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import Dict, Literal, Optional
+
+class ExportJobCreate(BaseModel):
+    data_type: str  # Any registered exporter: services, products, issues, maintenance, ...
+    format: Literal["csv", "ndjson"] = "csv"
+    date_from: Optional[str] = None  # YYYY-MM-DD, inclusive, on the exporter's date field
+    date_to: Optional[str] = None  # YYYY-MM-DD, inclusive
+    filters: Dict[str, str] = {}  # Equality filters on stored fields, e.g. {"city": "Kaunas"}
+    since: Optional[str] = None  # ISO timestamp: export only rows changed after it, plus tombstones
+    until: Optional[str] = None  # ISO timestamp, inclusive; defaults to the time the job is queued
+
+class ExportJob(BaseModel):
+    id: str
+    data_type: str
+    format: str
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    filters: Dict[str, str] = {}
+    since: Optional[str] = None
+    until: Optional[str] = None
+    status: str  # queued, running, completed, failed
+    rows_written: int = 0
+    total_rows: Optional[int] = None
+    progress: float = 0.0  # 0..1
+    file_size: Optional[int] = None
+    download_url: Optional[str] = None
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    expires_at: str
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from typing import Dict, List, Optional
 import uuid
 from datetime import datetime, timezone
 
@@ -13,7 +13,7 @@ class IssueBase(BaseModel):
     warranty_status: Optional[str] = None  # warranty, non_warranty
 
 class IssueCreate(IssueBase):
-    photos: Optional[List[str]] = []  # base64 encoded images
+    photos: Optional[List[str]] = []  # base64 encoded images, moved to the photo store on create
     product_location: Optional[str] = None  # Address/location info from customer
     source: Optional[str] = None  # "customer" for customer-reported issues
 
@@ -29,7 +29,8 @@ class Issue(IssueBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     issue_code: Optional[str] = None  # Unique code: YYYY_SN_MM_DD_ORDER
     status: str = "open"  # open, in_progress, in_service, resolved
-    photos: List[str] = []
+    photos: List[str] = []  # Photo blob IDs, served by GET /issues/{id}/photos/{photo_id}
+    photo_thumbnails: Dict[str, Dict[str, str]] = {}  # photo_id -> {size: thumbnail blob ID}
     resolution: Optional[str] = None  # Inspection Note (first stage diagnosis)
     service_note: Optional[str] = None  # Service Note (warranty repair completion)
     technician_name: Optional[str] = None
@@ -42,6 +43,7 @@ class Issue(IssueBase):
     source: Optional[str] = None  # "customer" for customer-reported issues
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     resolved_at: Optional[str] = None
+    updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     # Spare parts tracking
     spare_parts_used: bool = False
     spare_parts: Optional[str] = None  # List of spare parts used
@@ -22,6 +22,7 @@ class ScheduledMaintenance(ScheduledMaintenanceBase):
     status: str = "scheduled"  # scheduled, in_progress, completed, cancelled, pending_schedule
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     completed_at: Optional[str] = None
+    updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
 class ScheduledMaintenanceUpdate(BaseModel):
     scheduled_date: Optional[str] = None
@@ -1,7 +1,10 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import List, Optional
 import uuid
 from datetime import datetime, timezone
+from .issue import Issue
+from .service import ServiceRecord
+from .maintenance import ScheduledMaintenance
 
 # Valid model types for stretchers
 VALID_MODEL_TYPES = ["powered", "roll_in"]
@@ -23,3 +26,11 @@ class Product(ProductBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     registration_date: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     status: str = "active"
+    updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+class ProductFull(BaseModel):
+    """Product with its issues (without photos), services and scheduled maintenance"""
+    product: Product
+    issues: List[Issue] = []
+    services: List[ServiceRecord] = []
+    maintenance: List[ScheduledMaintenance] = []
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class ServiceReportBatch(BaseModel):
+    product_ids: List[str] = []  # Either explicit products...
+    city: Optional[str] = None  # ...or every product in a city
+    reporter_name: str
+    reporter_surname: str
+    report_date: Optional[str] = None  # YYYY-MM-DD, defaults to today
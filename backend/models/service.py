@@ -19,3 +19,4 @@ class ServiceRecord(ServiceRecordBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     service_date: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
@@ -1,9 +1,11 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 import uuid
+from datetime import datetime, timezone
 
 class TechnicianUnavailable(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     technician_name: str
     date: str  # YYYY-MM-DD format
     reason: Optional[str] = None
+    updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
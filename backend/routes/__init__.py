@@ -9,3 +9,6 @@ from .stats import router as stats_router
 from .technician import router as technician_router
 from .translations import router as translations_router
 from .customers import router as customers_router
+from .dashboard import router as dashboard_router
+from .debug import router as debug_router
+from .reports import router as reports_router
@@ -5,45 +5,33 @@ from core.config import (
     ADMIN_PASSWORD, TECHNICIAN_PASSWORD, CUSTOMER_ACCESS_PASSWORD, APP_ACCESS_PASSWORD
 )
 from core.auth import (
-    generate_auth_token, valid_tokens, valid_technician_tokens, valid_customer_tokens
+    ROLE_ADMIN, ROLE_CUSTOMER, ROLE_TECHNICIAN,
+    get_request_token, get_token_role, issue_token, revoke_token
 )
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+async def start_session(response: Response, role: str) -> str:
+    """Issue a token for `role` and set it as the auth cookie"""
+    token = await issue_token(role)
+    
+    response.set_cookie(
+        key=AUTH_COOKIE_NAME,
+        value=token,
+        httponly=True,
+        secure=True,
+        samesite="none",
+        max_age=AUTH_TOKEN_EXPIRY_DAYS * 24 * 60 * 60,
+        path="/"
+    )
+    return token
+
 @router.post("/login")
 async def login(request: LoginRequest, response: Response):
     # Check for admin password
-    if request.password == ADMIN_PASSWORD:
-        token = generate_auth_token()
-        valid_tokens.add(token)
-        
-        response.set_cookie(
-            key=AUTH_COOKIE_NAME,
-            value=token,
-            httponly=True,
-            secure=True,
-            samesite="none",
-            max_age=AUTH_TOKEN_EXPIRY_DAYS * 24 * 60 * 60,
-            path="/"
-        )
-        
-        return {"message": "Admin login successful", "token": token, "type": "admin"}
-    
     # For backward compatibility, also accept old password
-    if request.password == APP_ACCESS_PASSWORD:
-        token = generate_auth_token()
-        valid_tokens.add(token)
-        
-        response.set_cookie(
-            key=AUTH_COOKIE_NAME,
-            value=token,
-            httponly=True,
-            secure=True,
-            samesite="none",
-            max_age=AUTH_TOKEN_EXPIRY_DAYS * 24 * 60 * 60,
-            path="/"
-        )
-        
+    if request.password in (ADMIN_PASSWORD, APP_ACCESS_PASSWORD):
+        token = await start_session(response, ROLE_ADMIN)
         return {"message": "Admin login successful", "token": token, "type": "admin"}
     
     raise HTTPException(status_code=401, detail="Invalid password")
@@ -53,19 +41,7 @@ async def technician_login(request: LoginRequest, response: Response):
     if request.password != TECHNICIAN_PASSWORD:
         raise HTTPException(status_code=401, detail="Invalid technician password")
     
-    token = generate_auth_token()
-    valid_technician_tokens.add(token)
-    
-    response.set_cookie(
-        key=AUTH_COOKIE_NAME,
-        value=token,
-        httponly=True,
-        secure=True,
-        samesite="none",
-        max_age=AUTH_TOKEN_EXPIRY_DAYS * 24 * 60 * 60,
-        path="/"
-    )
-    
+    token = await start_session(response, ROLE_TECHNICIAN)
     return {"message": "Technician login successful", "token": token, "type": "technician"}
 
 @router.post("/customer-login")
@@ -73,51 +49,19 @@ async def customer_login(request: LoginRequest, response: Response):
     if request.password != CUSTOMER_ACCESS_PASSWORD:
         raise HTTPException(status_code=401, detail="Invalid customer password")
     
-    token = generate_auth_token()
-    valid_customer_tokens.add(token)
-    
-    response.set_cookie(
-        key=AUTH_COOKIE_NAME,
-        value=token,
-        httponly=True,
-        secure=True,
-        samesite="none",
-        max_age=AUTH_TOKEN_EXPIRY_DAYS * 24 * 60 * 60,
-        path="/"
-    )
-    
+    token = await start_session(response, ROLE_CUSTOMER)
     return {"message": "Customer login successful", "token": token, "type": "customer"}
 
 @router.get("/check")
 async def check_auth(request: Request):
-    from core.config import AUTH_HEADER_NAME
-    auth_token = request.cookies.get(AUTH_COOKIE_NAME)
-    if not auth_token:
-        auth_token = request.headers.get(AUTH_HEADER_NAME)
-    
-    if auth_token:
-        if auth_token in valid_tokens:
-            return {"authenticated": True, "type": "admin"}
-        elif auth_token in valid_technician_tokens:
-            return {"authenticated": True, "type": "technician"}
-        elif auth_token in valid_customer_tokens:
-            return {"authenticated": True, "type": "customer"}
+    role = await get_token_role(get_request_token(request))
+    if role:
+        return {"authenticated": True, "type": role}
     return {"authenticated": False, "type": None}
 
 @router.post("/logout")
 async def logout(request: Request, response: Response):
-    from core.config import AUTH_HEADER_NAME
-    auth_token = request.cookies.get(AUTH_COOKIE_NAME)
-    if not auth_token:
-        auth_token = request.headers.get(AUTH_HEADER_NAME)
-    
-    if auth_token:
-        if auth_token in valid_tokens:
-            valid_tokens.discard(auth_token)
-        if auth_token in valid_technician_tokens:
-            valid_technician_tokens.discard(auth_token)
-        if auth_token in valid_customer_tokens:
-            valid_customer_tokens.discard(auth_token)
+    await revoke_token(get_request_token(request))
     
     response.delete_cookie(key=AUTH_COOKIE_NAME, path="/")
     return {"message": "Logged out successfully"}
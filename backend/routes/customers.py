@@ -2,6 +2,7 @@ from fastapi import APIRouter
 from typing import List
 from datetime import datetime, timezone
 from bson import ObjectId
+from core.changes import record_tombstones
 from core.database import db
 from core.exceptions import NotFoundError, ResourceExistsError, ValidationError
 from core.logging_config import get_logger
@@ -71,7 +72,7 @@ async def create_customer(customer: CustomerCreate):
     
     customer_dict = customer.model_dump()
     customer_dict["created_at"] = datetime.now(timezone.utc)
-    customer_dict["updated_at"] = None
+    customer_dict["updated_at"] = customer_dict["created_at"]
     
     result = await db.customers.insert_one(customer_dict)
     
@@ -114,6 +115,7 @@ async def delete_customer(customer_id: str):
         raise NotFoundError("Customer", customer_id)
     
     await db.customers.delete_one({"_id": ObjectId(customer_id)})
+    await record_tombstones("customers", [customer_id])
     logger.info(f"Deleted customer {customer_id}")
     
     return {"message": "Customer deleted successfully"}
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Query
+from core.database import db
+from routes.stats import compute_stats
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+# Issue statuses listed in the dashboard "open issues" card
+UNRESOLVED_STATUSES = ["open", "in_progress", "in_service"]
+
+@router.get("/summary")
+async def get_dashboard_summary(
+    services_limit: int = Query(10, ge=1, le=100),
+    issues_limit: int = Query(8, ge=1, le=100)
+):
+    """
+    Stats plus the latest services and unresolved issues, each carrying
+    product_serial and product_city, from a single aggregation.
+    """
+    pipeline = [
+        {"$match": {"status": {"$in": UNRESOLVED_STATUSES}}},
+        {"$sort": {"created_at": -1}},
+        {"$limit": issues_limit},
+        {"$project": {"_id": 0, "photos": 0, "photo_thumbnails": 0}},
+        {"$set": {"_kind": "issue"}},
+        {"$unionWith": {
+            "coll": "services",
+            "pipeline": [
+                {"$sort": {"service_date": -1}},
+                {"$limit": services_limit},
+                {"$project": {"_id": 0}},
+                {"$set": {"_kind": "service"}}
+            ]
+        }},
+        {"$lookup": {
+            "from": "products",
+            "let": {"product_id": "$product_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$id", "$$product_id"]}}},
+                {"$limit": 1},
+                {"$project": {"_id": 0, "serial_number": 1, "city": 1}}
+            ],
+            "as": "_product"
+        }},
+        {"$set": {
+            "product_serial": {"$first": "$_product.serial_number"},
+            "product_city": {"$first": "$_product.city"}
+        }},
+        {"$facet": {
+            "open_issues": [
+                {"$match": {"_kind": "issue"}},
+                {"$sort": {"created_at": -1}},
+                {"$project": {"_kind": 0, "_product": 0}}
+            ],
+            "recent_services": [
+                {"$match": {"_kind": "service"}},
+                {"$sort": {"service_date": -1}},
+                {"$project": {"_kind": 0, "_product": 0}}
+            ]
+        }}
+    ]
+    result = await db.issues.aggregate(pipeline).to_list(1)
+    facets = result[0] if result else {"open_issues": [], "recent_services": []}
+    
+    return {
+        "stats": await compute_stats(),
+        "recent_services": facets["recent_services"],
+        "open_issues": facets["open_issues"]
+    }
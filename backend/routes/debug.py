@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from core.auth import require_admin
+from core.exceptions import NotFoundError
+from core.profiling import profile_buffer
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+@router.get("/profiles")
+async def list_profiles(request: Request):
+    """Recently captured request profiles on this worker, newest first"""
+    require_admin(request)
+    return profile_buffer.summaries()
+
+@router.get("/profiles/{request_id}")
+async def get_profile(request_id: str, request: Request, format: str = "json"):
+    """
+    Profile captured for a request sent with `X-Profile: 1`.
+    Pass `format=text` to get the raw pstats listing.
+    """
+    require_admin(request)
+    profile = profile_buffer.get(request_id)
+    if not profile:
+        raise NotFoundError("Profile", request_id)
+    if format == "text":
+        return PlainTextResponse(profile["stats"])
+    return profile
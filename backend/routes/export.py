@@ -1,106 +1,68 @@
+from datetime import datetime, timezone
+from typing import Optional
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
-from datetime import datetime
-import io
-import csv
-from core.database import db
+from fastapi.responses import FileResponse
+from core.changes import ChangeWindow
+from core.csv_stream import prefetch
+from core.exceptions import BusinessLogicError, NotFoundError, ValidationError
+from core.export_jobs import JOB_COMPLETED, artifact_path, export_jobs, get_job, public_job
+from core.exporters import EXPORTERS, EXPORT_FORMATS, GZIP_MEDIA_TYPE, export_response, get_exporter
+from models.export import ExportJob, ExportJobCreate
 
 router = APIRouter(prefix="/export", tags=["export"])
 
 @router.get("/csv")
 async def export_csv(data_type: str = "services"):
-    if data_type == "services":
-        records = await db.services.find({}, {"_id": 0}).to_list(10000)
-        if not records:
-            raise HTTPException(status_code=404, detail="No service records found")
-        
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=["id", "product_id", "technician_name", "service_type", "description", "issues_found", "warranty_status", "service_date", "created_at"])
-        writer.writeheader()
-        for record in records:
-            writer.writerow(record)
-        
-        output.seek(0)
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename=service_records_{datetime.now().strftime('%Y%m%d')}.csv"}
-        )
+    exporter = get_exporter(data_type)
+    if not exporter:
+        raise HTTPException(status_code=400, detail=f"Invalid data type. Use: {', '.join(EXPORTERS)}")
     
-    elif data_type == "products":
-        records = await db.products.find({}, {"_id": 0}).to_list(10000)
-        if not records:
-            raise HTTPException(status_code=404, detail="No products found")
-        
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=["id", "serial_number", "model_name", "city", "location_detail", "notes", "registration_date", "status"])
-        writer.writeheader()
-        for record in records:
-            writer.writerow(record)
-        
-        output.seek(0)
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename=products_{datetime.now().strftime('%Y%m%d')}.csv"}
-        )
-    
-    elif data_type == "issues":
-        records = await db.issues.find({}, {"_id": 0, "photos": 0}).to_list(10000)
-        if not records:
-            raise HTTPException(status_code=404, detail="No issues found")
-        
-        products = await db.products.find({}, {"_id": 0}).to_list(10000)
-        product_map = {p["id"]: p for p in products}
-        
-        output = io.StringIO()
-        fieldnames = ["issue_type", "date", "resolved_date", "serial_number", "city", "technician_name", "warranty_status"]
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for record in records:
-            product = product_map.get(record.get("product_id"), {})
-            
-            resolved_date = record.get("resolved_at")
-            if resolved_date:
-                try:
-                    resolved_date = datetime.fromisoformat(resolved_date.replace("Z", "+00:00")).strftime("%Y-%m-%d")
-                except (ValueError, TypeError):
-                    pass
-            else:
-                resolved_date = "N/A"
-            
-            created_date = record.get("created_at", "")
-            if created_date:
-                try:
-                    created_date = datetime.fromisoformat(created_date.replace("Z", "+00:00")).strftime("%Y-%m-%d")
-                except (ValueError, TypeError):
-                    pass
-            
-            warranty = record.get("warranty_status", "")
-            if warranty == "warranty":
-                warranty = "Warranty"
-            elif warranty == "non_warranty":
-                warranty = "Non Warranty"
-            else:
-                warranty = "N/A"
-            
-            writer.writerow({
-                "issue_type": record.get("issue_type", ""),
-                "date": created_date,
-                "resolved_date": resolved_date,
-                "serial_number": product.get("serial_number", "Unknown"),
-                "city": product.get("city", "Unknown"),
-                "technician_name": record.get("technician_name", "N/A"),
-                "warranty_status": warranty,
-            })
-        
-        output.seek(0)
-        today = datetime.now().strftime("%Y-%m-%d")
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f'attachment; filename="Issue Report ({today}).csv"'}
-        )
+    rows = await prefetch(exporter.rows())
+    if rows is None:
+        raise HTTPException(status_code=404, detail=exporter.empty_message)
+    return export_response(exporter, rows, "csv")
+
+@router.post("/jobs", response_model=ExportJob, status_code=202)
+async def create_export_job(job: ExportJobCreate):
+    """Queue an export to be built in the background; poll GET /export/jobs/{id} for progress"""
+    return await export_jobs.submit(
+        job.data_type, job.format, date_from=job.date_from, date_to=job.date_to, filters=job.filters,
+        since=job.since, until=job.until
+    )
+
+@router.get("/jobs/{job_id}", response_model=ExportJob)
+async def get_export_job(job_id: str):
+    return public_job(await get_job(job_id))
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(job_id: str):
+    job = await get_job(job_id, include_private=True)
+    if job["status"] != JOB_COMPLETED:
+        raise BusinessLogicError("Export job has not completed", details={"status": job["status"]})
+    path = artifact_path(job)
+    if job["purge_at"].replace(tzinfo=timezone.utc) <= datetime.now(timezone.utc) or not path.exists():
+        raise NotFoundError("Export artifact", job_id, message="Export artifact has expired")
+    return FileResponse(path, media_type=GZIP_MEDIA_TYPE, filename=job["download_name"])
+
+@router.get("/{data_type}")
+async def export_data(data_type: str, format: str = "csv", gzip: bool = False,
+                      since: Optional[str] = None, until: Optional[str] = None):
+    """
+    Stream an export of `data_type` as CSV or NDJSON, optionally gzip-compressed.
+    With `since`/`until` only rows changed in that window are exported, plus
+    tombstones for deletes; pass the X-Export-Watermark header back as `since`.
+    """
+    exporter = get_exporter(data_type)
+    if not exporter:
+        raise ValidationError(f"Unknown export type. Use: {', '.join(EXPORTERS)}", field="data_type")
+    if format not in EXPORT_FORMATS:
+        raise ValidationError(f"Unknown export format. Use: {', '.join(EXPORT_FORMATS)}", field="format")
     
-    raise HTTPException(status_code=400, detail="Invalid data type. Use: services, products, or issues")
+    window = ChangeWindow.parse(since, until)
+    rows = exporter.rows(exporter.build_match(window=window), window)
+    if not window:
+        rows = await prefetch(rows)
+        if rows is None:
+            raise NotFoundError(data_type, message=exporter.empty_message)
+    # An empty incremental export is a normal answer: nothing changed
+    return export_response(exporter, rows, format, compress=gzip, window=window)
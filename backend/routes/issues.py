@@ -1,10 +1,19 @@
-from fastapi import APIRouter
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, File, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Union
+from pymongo import DESCENDING
 from datetime import datetime, timezone, timedelta
 from models.issue import IssueCreate, Issue, CustomerIssueCreate, IssueUpdate, RepairAttempt
 from models.maintenance import ScheduledMaintenance
 from models.service import ServiceRecord
+from models.pagination import Page
+from core.changes import delete_tracked, record_tombstones, touch
 from core.database import db
+from core.counters import next_daily_sequence, increment_stats, issue_status_deltas
+from core.blobstore import photo_store
+from core.pagination import MAX_PAGE_SIZE, list_response
+from core.photos import store_inline_photos, store_uploaded_photo, delete_photos, generate_photo_thumbnails
+from core.config import THUMBNAIL_SIZES
 from core.exceptions import NotFoundError, ValidationError, DatabaseError
 from core.logging_config import get_logger
 import uuid
@@ -13,6 +22,26 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/issues", tags=["issues"])
 
+async def _issues_already_coded(now: datetime) -> int:
+    """
+    Seed for a day's issue code counter: one past the highest ORDER already
+    used today, so codes issued before the counter existed are not repeated.
+    """
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    today_end = today_start + timedelta(days=1)
+    cursor = db.issues.find(
+        {"created_at": {"$gte": today_start.isoformat(), "$lt": today_end.isoformat()}},
+        {"_id": 0, "issue_code": 1},
+    )
+    count = 0
+    used = 0
+    async for issue in cursor:
+        count += 1
+        order = (issue.get("issue_code") or "").rsplit("_", 1)[-1]
+        if order.isdigit():
+            used = max(used, int(order) + 1)
+    return max(used, count)
+
 async def generate_issue_code(product_id: str) -> str:
     """Generate unique issue code: YYYY_SN_MM_DD_ORDER"""
     now = datetime.now(timezone.utc)
@@ -24,20 +53,16 @@ async def generate_issue_code(product_id: str) -> str:
     product = await db.products.find_one({"id": product_id}, {"_id": 0})
     serial = product.get("serial_number", "UNK") if product else "UNK"
     
-    # Get next order number (count issues today + 1)
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
-    today_end = (now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)).isoformat()
-    
-    order_count = await db.issues.count_documents({
-        "created_at": {"$gte": today_start, "$lt": today_end}
-    })
-    order_num = order_count  # 0-indexed
+    # Get next order number from the atomic per-day counter
+    order_num = await next_daily_sequence(
+        "issue_code", now, seed=lambda: _issues_already_coded(now)
+    ) - 1  # 0-indexed
     
     # Format: YYYY_SN_MM_DD_ORDER
     return f"{year}_{serial}_{month}_{day}_{order_num}"
 
 @router.post("", response_model=Issue)
-async def create_issue(issue: IssueCreate):
+async def create_issue(issue: IssueCreate, background_tasks: BackgroundTasks):
     product = await db.products.find_one({"id": issue.product_id}, {"_id": 0})
     if not product:
         raise NotFoundError("Product", issue.product_id)
@@ -46,7 +71,10 @@ async def create_issue(issue: IssueCreate):
     issue_code = await generate_issue_code(issue.product_id)
     logger.info(f"Creating issue with code {issue_code} for product {issue.product_id}")
     
-    issue_obj = Issue(**issue.model_dump())
+    issue_data = issue.model_dump()
+    issue_data["photos"] = await store_inline_photos(issue.photos)
+    
+    issue_obj = Issue(**issue_data)
     issue_obj.issue_code = issue_code
     
     # Set technician_assigned_at if technician is provided at creation
@@ -55,6 +83,9 @@ async def create_issue(issue: IssueCreate):
     
     doc = issue_obj.model_dump()
     await db.issues.insert_one(doc)
+    await increment_stats(**issue_status_deltas(None, issue_obj.status))
+    for photo_id in issue_obj.photos:
+        background_tasks.add_task(generate_photo_thumbnails, photo_id)
     
     # Auto-schedule maintenance based on issue type
     now = datetime.now(timezone.utc)
@@ -132,15 +163,24 @@ async def create_issue(issue: IssueCreate):
     
     return issue_obj
 
-@router.get("", response_model=List[Issue])
-async def get_issues(product_id: Optional[str] = None, status: Optional[str] = None):
+@router.get("", response_model=Union[List[Issue], Page[Issue]])
+async def get_issues(
+    request: Request,
+    response: Response,
+    product_id: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
     query = {}
     if product_id:
         query["product_id"] = product_id
     if status:
         query["status"] = status
-    issues = await db.issues.find(query, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    return issues
+    return await list_response(
+        request, response, db.issues, query, sort_field="created_at", direction=DESCENDING,
+        limit=limit, cursor=cursor
+    )
 
 @router.get("/{issue_id}", response_model=Issue)
 async def get_issue(issue_id: str):
@@ -149,6 +189,63 @@ async def get_issue(issue_id: str):
         raise NotFoundError("Issue", issue_id)
     return issue
 
+@router.post("/{issue_id}/photos", response_model=Issue)
+async def upload_issue_photos(issue_id: str, background_tasks: BackgroundTasks, files: List[UploadFile] = File(...)):
+    """Attach photos via multipart upload; images are downscaled before storage"""
+    existing = await db.issues.find_one({"id": issue_id}, {"_id": 0, "id": 1})
+    if not existing:
+        raise NotFoundError("Issue", issue_id)
+    
+    photo_ids = []
+    try:
+        for upload in files:
+            photo_ids.append(await store_uploaded_photo(upload))
+    except Exception:
+        # Nothing references the photos stored so far; don't leave them behind
+        await delete_photos(photo_ids)
+        raise
+    
+    logger.info(f"Attached {len(photo_ids)} photos to issue {issue_id}")
+    await db.issues.update_one({"id": issue_id}, touch({"$push": {"photos": {"$each": photo_ids}}}))
+    for photo_id in photo_ids:
+        background_tasks.add_task(generate_photo_thumbnails, photo_id)
+    return await db.issues.find_one({"id": issue_id}, {"_id": 0})
+
+@router.get("/{issue_id}/photos/{photo_id}")
+async def get_issue_photo(issue_id: str, photo_id: str, request: Request, size: Optional[str] = None):
+    """Stream a stored issue photo (or a thumbnail variant via ?size=) with caching headers"""
+    if size and size not in THUMBNAIL_SIZES:
+        raise ValidationError(f"Unknown photo size. Use: {', '.join(THUMBNAIL_SIZES)}", field="size")
+    
+    issue = await db.issues.find_one(
+        {"id": issue_id, "photos": photo_id},
+        {"_id": 0, "id": 1, f"photo_thumbnails.{photo_id}": 1}
+    )
+    if not issue:
+        raise NotFoundError("Photo", photo_id)
+    
+    # Fall back to the original until the thumbnail has been generated
+    blob_id = photo_id
+    if size:
+        blob_id = issue.get("photo_thumbnails", {}).get(photo_id, {}).get(size, photo_id)
+    
+    info = await photo_store.info(blob_id)
+    if not info:
+        raise NotFoundError("Photo", photo_id)
+    
+    # Blobs are immutable, so the content hash is a strong validator. A
+    # thumbnail URL answered with the original must be revalidated, otherwise
+    # the browser keeps the full-size image once the thumbnail exists.
+    headers = {
+        "ETag": info.etag,
+        "Cache-Control": "private, no-cache" if size and blob_id == photo_id else "private, max-age=31536000, immutable",
+    }
+    if request.headers.get("if-none-match") == info.etag:
+        return Response(status_code=304, headers=headers)
+    
+    headers["Content-Length"] = str(info.length)
+    return StreamingResponse(photo_store.stream(blob_id), media_type=info.content_type, headers=headers)
+
 @router.put("/{issue_id}", response_model=Issue)
 async def update_issue(issue_id: str, update: IssueUpdate):
     existing = await db.issues.find_one({"id": issue_id}, {"_id": 0})
@@ -162,7 +259,7 @@ async def update_issue(issue_id: str, update: IssueUpdate):
         update_data["technician_name"] = None
         update_data["technician_assigned_at"] = None
         if existing.get("source") == "customer":
-            await db.scheduled_maintenance.delete_many({
+            await delete_tracked("scheduled_maintenance", {
                 "issue_id": issue_id,
                 "source": "customer_issue"
             })
@@ -240,7 +337,7 @@ async def update_issue(issue_id: str, update: IssueUpdate):
                 # Update existing entry
                 await db.scheduled_maintenance.update_many(
                     {"issue_id": issue_id, "source": "warranty_service"},
-                    {"$set": {"technician_name": update_data["technician_name"]}}
+                    touch({"$set": {"technician_name": update_data["technician_name"]}})
                 )
             else:
                 # Create new entry since none exists
@@ -261,7 +358,7 @@ async def update_issue(issue_id: str, update: IssueUpdate):
         if existing.get("source") == "customer":
             await db.scheduled_maintenance.update_many(
                 {"issue_id": issue_id, "source": "customer_issue"},
-                {"$set": {"technician_name": update_data["technician_name"]}}
+                touch({"$set": {"technician_name": update_data["technician_name"]}})
             )
     
     if update_data.get("status") == "resolved":
@@ -338,22 +435,27 @@ async def update_issue(issue_id: str, update: IssueUpdate):
     if existing.get("is_warranty_route") and update_data.get("status") == "resolved":
         parent_id = existing.get("parent_issue_id")
         if parent_id:
-            await db.issues.update_one(
+            parent_before = await db.issues.find_one_and_update(
                 {"id": parent_id},
-                {"$set": {
+                touch({"$set": {
                     "status": "resolved",
                     "resolved_at": datetime.now(timezone.utc).isoformat()
-                }}
+                }}),
+                projection={"_id": 0, "status": 1}
             )
+            if parent_before:
+                await increment_stats(**issue_status_deltas(parent_before.get("status"), "resolved"))
     
-    await db.issues.update_one({"id": issue_id}, {"$set": update_data})
+    await db.issues.update_one({"id": issue_id}, touch({"$set": update_data}))
+    if "status" in update_data:
+        await increment_stats(**issue_status_deltas(existing.get("status"), update_data["status"]))
     updated = await db.issues.find_one({"id": issue_id}, {"_id": 0})
     
     # Update maintenance item status when issue is resolved
     if update_data.get("status") == "resolved":
         await db.scheduled_maintenance.update_many(
             {"issue_id": issue_id},
-            {"$set": {"status": "completed"}}
+            touch({"$set": {"status": "completed"}})
         )
     
     # AUTO-RESOLVE PARENT: When a child issue is resolved, check if all siblings are resolved
@@ -365,18 +467,21 @@ async def update_issue(issue_id: str, update: IssueUpdate):
         all_resolved = all(child.get("status") == "resolved" for child in all_children)
         if all_resolved and len(all_children) > 0:
             # Auto-resolve the parent issue
-            await db.issues.update_one(
+            parent_before = await db.issues.find_one_and_update(
                 {"id": parent_id},
-                {"$set": {
+                touch({"$set": {
                     "status": "resolved",
                     "resolved_at": datetime.now(timezone.utc).isoformat(),
                     "resolution": updated.get("resolution") or "All child issues resolved"
-                }}
+                }}),
+                projection={"_id": 0, "status": 1}
             )
+            if parent_before:
+                await increment_stats(**issue_status_deltas(parent_before.get("status"), "resolved"))
             # Also update the parent's maintenance item if exists
             await db.scheduled_maintenance.update_many(
                 {"issue_id": parent_id},
-                {"$set": {"status": "completed"}}
+                touch({"$set": {"status": "completed"}})
             )
     
     # Auto-create service record for non-warranty resolved issues
@@ -391,6 +496,7 @@ async def update_issue(issue_id: str, update: IssueUpdate):
             service_date=datetime.now(timezone.utc).isoformat(),
         )
         await db.services.insert_one(service_obj.model_dump())
+        await increment_stats(total_services=1)
     
     return updated
 
@@ -437,27 +543,34 @@ async def delete_issue(issue_id: str):
     logger.info(f"Deleting issue {issue_id} and related entries")
     
     # Delete all related scheduled maintenance entries
-    await db.scheduled_maintenance.delete_many({"issue_id": issue_id})
+    await delete_tracked("scheduled_maintenance", {"issue_id": issue_id})
     
     # If this is a parent issue with a warranty child, also delete the child
     if existing.get("child_issue_id"):
         child_id = existing["child_issue_id"]
         # Delete child's maintenance entries
-        await db.scheduled_maintenance.delete_many({"issue_id": child_id})
+        await delete_tracked("scheduled_maintenance", {"issue_id": child_id})
         # Delete the child issue
-        await db.issues.delete_one({"id": child_id})
+        child = await db.issues.find_one_and_delete({"id": child_id}, projection={"_id": 0, "status": 1})
+        if child:
+            await record_tombstones("issues", [child_id])
+            await increment_stats(**issue_status_deltas(child.get("status"), None))
     
     # If this is a warranty route (child) issue, update the parent to remove child reference
     if existing.get("parent_issue_id"):
         await db.issues.update_one(
             {"id": existing["parent_issue_id"]},
-            {"$unset": {"child_issue_id": ""}}
+            touch({"$unset": {"child_issue_id": ""}})
         )
     
     # Delete the issue itself
     result = await db.issues.delete_one({"id": issue_id})
     if result.deleted_count == 0:
         raise NotFoundError("Issue", issue_id)
+    await record_tombstones("issues", [issue_id])
+    await increment_stats(**issue_status_deltas(existing.get("status"), None))
+    
+    await delete_photos(existing.get("photos", []))
     
     logger.info(f"Successfully deleted issue {issue_id}")
     return {"message": "Issue and related entries deleted successfully"}
@@ -481,4 +594,5 @@ async def create_customer_issue(issue: CustomerIssueCreate):
     issue_obj = Issue(**issue_data)
     doc = issue_obj.model_dump()
     await db.issues.insert_one(doc)
+    await increment_stats(**issue_status_deltas(None, issue_obj.status))
     return issue_obj
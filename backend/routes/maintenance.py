@@ -1,8 +1,14 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import List, Optional, Union
 from datetime import datetime, timezone, timedelta
 from models.maintenance import ScheduledMaintenanceCreate, ScheduledMaintenance, ScheduledMaintenanceUpdate
+from models.pagination import Page
+from core.changes import record_tombstones, touch
 from core.database import db
+from core.pagination import MAX_PAGE_SIZE, list_response
+
+# Default page size for the dashboard upcoming/overdue/this-month lists
+SHORT_LIST_LIMIT = 100
 
 router = APIRouter(prefix="/scheduled-maintenance", tags=["maintenance"])
 
@@ -17,13 +23,17 @@ async def create_scheduled_maintenance(maintenance: ScheduledMaintenanceCreate):
     await db.scheduled_maintenance.insert_one(doc)
     return maintenance_obj
 
-@router.get("", response_model=List[ScheduledMaintenance])
+@router.get("", response_model=Union[List[ScheduledMaintenance], Page[ScheduledMaintenance]])
 async def get_scheduled_maintenance(
+    request: Request,
+    response: Response,
     product_id: Optional[str] = None,
     status: Optional[str] = None,
     month: Optional[int] = None,
     year: Optional[int] = None,
-    include_pending: Optional[bool] = True
+    include_pending: Optional[bool] = True,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
 ):
     query = {}
     if product_id:
@@ -54,8 +64,10 @@ async def get_scheduled_maintenance(
         else:
             query["scheduled_date"] = {"$gte": f"{year}-01-01", "$lt": f"{year + 1}-01-01"}
     
-    maintenance = await db.scheduled_maintenance.find(query, {"_id": 0}).sort("scheduled_date", 1).to_list(1000)
-    return maintenance
+    return await list_response(
+        request, response, db.scheduled_maintenance, query, sort_field="scheduled_date",
+        limit=limit, cursor=cursor
+    )
 
 @router.get("/upcoming/count")
 async def get_upcoming_maintenance_count():
@@ -75,32 +87,43 @@ async def get_upcoming_maintenance_count():
     return {"upcoming": upcoming, "overdue": overdue}
 
 @router.get("/upcoming/list")
-async def get_upcoming_maintenance_list():
+async def get_upcoming_maintenance_list(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
     """Get detailed list of upcoming maintenance within 30 days"""
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     next_30_days = (datetime.now(timezone.utc) + timedelta(days=30)).strftime("%Y-%m-%d")
     
-    upcoming = await db.scheduled_maintenance.find({
+    return await list_response(request, response, db.scheduled_maintenance, {
         "status": "scheduled",
         "scheduled_date": {"$gte": today, "$lte": next_30_days}
-    }, {"_id": 0}).sort("scheduled_date", 1).to_list(100)
-    
-    return upcoming
+    }, sort_field="scheduled_date", limit=limit, cursor=cursor, default_limit=SHORT_LIST_LIMIT)
 
 @router.get("/overdue/list")
-async def get_overdue_maintenance_list():
+async def get_overdue_maintenance_list(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
     """Get detailed list of overdue maintenance"""
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     
-    overdue = await db.scheduled_maintenance.find({
+    return await list_response(request, response, db.scheduled_maintenance, {
         "status": "scheduled",
         "scheduled_date": {"$lt": today}
-    }, {"_id": 0}).sort("scheduled_date", 1).to_list(100)
-    
-    return overdue
+    }, sort_field="scheduled_date", limit=limit, cursor=cursor, default_limit=SHORT_LIST_LIMIT)
 
 @router.get("/this-month/list")
-async def get_this_month_maintenance_list():
+async def get_this_month_maintenance_list(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
     """Get detailed list of this month's scheduled maintenance"""
     now = datetime.now(timezone.utc)
     start_of_month = now.replace(day=1).strftime("%Y-%m-%d")
@@ -111,12 +134,10 @@ async def get_this_month_maintenance_list():
     else:
         end_of_month = f"{now.year}-{now.month + 1:02d}-01"
     
-    this_month = await db.scheduled_maintenance.find({
+    return await list_response(request, response, db.scheduled_maintenance, {
         "status": "scheduled",
         "scheduled_date": {"$gte": start_of_month, "$lt": end_of_month}
-    }, {"_id": 0}).sort("scheduled_date", 1).to_list(100)
-    
-    return this_month
+    }, sort_field="scheduled_date", limit=limit, cursor=cursor, default_limit=SHORT_LIST_LIMIT)
 
 @router.get("/{maintenance_id}", response_model=ScheduledMaintenance)
 async def get_scheduled_maintenance_by_id(maintenance_id: str):
@@ -135,7 +156,7 @@ async def update_scheduled_maintenance(maintenance_id: str, update: ScheduledMai
     if update_data.get("status") == "completed":
         update_data["completed_at"] = datetime.now(timezone.utc).isoformat()
     
-    await db.scheduled_maintenance.update_one({"id": maintenance_id}, {"$set": update_data})
+    await db.scheduled_maintenance.update_one({"id": maintenance_id}, touch({"$set": update_data}))
     updated = await db.scheduled_maintenance.find_one({"id": maintenance_id}, {"_id": 0})
     return updated
 
@@ -144,4 +165,5 @@ async def delete_scheduled_maintenance(maintenance_id: str):
     result = await db.scheduled_maintenance.delete_one({"id": maintenance_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Scheduled maintenance not found")
+    await record_tombstones("scheduled_maintenance", [maintenance_id])
     return {"message": "Scheduled maintenance deleted successfully"}
@@ -1,9 +1,13 @@
-from fastapi import APIRouter
-from typing import List
+from fastapi import APIRouter, Query, Request, Response
+from typing import List, Optional, Union
 from datetime import datetime, timezone, timedelta
-from models.product import ProductCreate, Product
+from models.product import ProductCreate, Product, ProductFull
 from models.maintenance import ScheduledMaintenance
+from models.pagination import Page
 from core.database import db
+from core.changes import delete_tracked, record_tombstones, touch
+from core.counters import increment_stats
+from core.pagination import MAX_PAGE_SIZE, list_response
 from core.config import VALID_CITIES
 from core.exceptions import NotFoundError, ResourceExistsError, InvalidFieldError
 from core.logging_config import get_logger
@@ -39,6 +43,7 @@ async def create_product(product: ProductCreate):
     product_obj = Product(**product_data)
     doc = product_obj.model_dump()
     await db.products.insert_one(doc)
+    await increment_stats(total_products=1)
     
     # Auto-schedule yearly maintenance for 5 years
     for year_offset in range(1, 6):
@@ -58,13 +63,22 @@ async def create_product(product: ProductCreate):
     logger.info(f"Product {product.serial_number} created with ID {product_obj.id}")
     return product_obj
 
-@router.get("", response_model=List[Product])
-async def get_products():
-    products = await db.products.find({}, {"_id": 0}).to_list(1000)
-    for product in products:
-        if not product.get("registration_date"):
-            product["registration_date"] = datetime.now(timezone.utc).isoformat()
-    return products
+def _with_registration_date(product: dict) -> dict:
+    if not product.get("registration_date"):
+        product["registration_date"] = datetime.now(timezone.utc).isoformat()
+    return product
+
+@router.get("", response_model=Union[List[Product], Page[Product]])
+async def get_products(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    return await list_response(
+        request, response, db.products, {}, sort_field="_id",
+        limit=limit, cursor=cursor, transform=_with_registration_date
+    )
 
 @router.get("/{product_id}", response_model=Product)
 async def get_product(product_id: str):
@@ -75,6 +89,48 @@ async def get_product(product_id: str):
         product["registration_date"] = datetime.now(timezone.utc).isoformat()
     return product
 
+@router.get("/{product_id}/full", response_model=ProductFull)
+async def get_product_full(
+    product_id: str,
+    issues_limit: int = Query(100, ge=1, le=1000),
+    services_limit: int = Query(100, ge=1, le=1000),
+    maintenance_limit: int = Query(100, ge=1, le=1000)
+):
+    """Product with its issues, services and maintenance in one aggregation"""
+    def related(collection: str, sort: dict, limit: int, exclude: tuple = ()) -> dict:
+        projection = {"_id": 0, **{field: 0 for field in exclude}}
+        return {"$lookup": {
+            "from": collection,
+            "let": {"product_id": "$id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$product_id", "$$product_id"]}}},
+                {"$sort": sort},
+                {"$limit": limit},
+                {"$project": projection}
+            ],
+            "as": collection
+        }}
+    
+    pipeline = [
+        {"$match": {"id": product_id}},
+        {"$limit": 1},
+        related("issues", {"created_at": -1}, issues_limit, exclude=("photos", "photo_thumbnails")),
+        related("services", {"service_date": -1}, services_limit),
+        related("scheduled_maintenance", {"scheduled_date": 1}, maintenance_limit),
+        {"$project": {"_id": 0}}
+    ]
+    results = await db.products.aggregate(pipeline).to_list(1)
+    if not results:
+        raise NotFoundError("Product", product_id)
+    
+    doc = results[0]
+    issues = doc.pop("issues")
+    services = doc.pop("services")
+    maintenance = doc.pop("scheduled_maintenance")
+    if not doc.get("registration_date"):
+        doc["registration_date"] = datetime.now(timezone.utc).isoformat()
+    return {"product": doc, "issues": issues, "services": services, "maintenance": maintenance}
+
 @router.get("/serial/{serial_number}", response_model=Product)
 async def get_product_by_serial(serial_number: str):
     product = await db.products.find_one({"serial_number": serial_number}, {"_id": 0})
@@ -109,7 +165,7 @@ async def update_product(product_id: str, product: ProductCreate):
         except (ValueError, TypeError):
             reg_date = datetime.strptime(update_data["registration_date"][:10], "%Y-%m-%d").replace(tzinfo=timezone.utc)
         
-        await db.scheduled_maintenance.delete_many({
+        await delete_tracked("scheduled_maintenance", {
             "product_id": product_id,
             "source": "auto_yearly"
         })
@@ -128,7 +184,7 @@ async def update_product(product_id: str, product: ProductCreate):
             )
             await db.scheduled_maintenance.insert_one(maintenance_obj.model_dump())
     
-    await db.products.update_one({"id": product_id}, {"$set": update_data})
+    await db.products.update_one({"id": product_id}, touch({"$set": update_data}))
     updated = await db.products.find_one({"id": product_id}, {"_id": 0})
     if not updated.get("registration_date"):
         updated["registration_date"] = datetime.now(timezone.utc).isoformat()
@@ -139,5 +195,7 @@ async def delete_product(product_id: str):
     result = await db.products.delete_one({"id": product_id})
     if result.deleted_count == 0:
         raise NotFoundError("Product", product_id)
+    await record_tombstones("products", [product_id])
+    await increment_stats(total_products=-1)
     logger.info(f"Deleted product {product_id}")
     return {"message": "Product deleted successfully"}
@@ -0,0 +1,36 @@
+from datetime import date, datetime, timezone
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from core.exceptions import ValidationError
+from core.logging_config import get_logger
+from core.reports import ZIP_MEDIA_TYPE, load_report_batch, report_zip_chunks, safe_file_name
+from models.report import ServiceReportBatch
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+@router.post("/service-batch")
+async def service_report_batch(batch: ServiceReportBatch):
+    """Device inspection reports for a list of products or a whole city, as a zip of PDFs"""
+    if bool(batch.product_ids) == bool(batch.city):
+        raise ValidationError("Provide either product_ids or city", field="product_ids")
+    if not batch.reporter_name.strip() or not batch.reporter_surname.strip():
+        raise ValidationError("Reporter name and surname are required", field="reporter_name")
+    try:
+        report_date = date.fromisoformat(batch.report_date) if batch.report_date else datetime.now(timezone.utc).date()
+    except ValueError:
+        raise ValidationError("Invalid report date, expected YYYY-MM-DD", field="report_date")
+    
+    entries = await load_report_batch(batch.product_ids, batch.city)
+    logger.info(
+        "Generating service report batch",
+        extra={"details": {"products": len(entries), "city": batch.city}}
+    )
+    reporter = f"{batch.reporter_name.strip()} {batch.reporter_surname.strip()}"
+    scope = safe_file_name(batch.city or "Selection")
+    return StreamingResponse(
+        report_zip_chunks(entries, report_date, reporter),
+        media_type=ZIP_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="Device_Reports_{scope}_{report_date.strftime("%Y%m%d")}.zip"'}
+    )
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import List, Optional, Union
+from pymongo import DESCENDING
 from datetime import datetime, timezone
 from models.service import ServiceRecordCreate, ServiceRecord
+from models.pagination import Page
 from core.database import db
+from core.changes import record_tombstones
+from core.counters import increment_stats
+from core.pagination import MAX_PAGE_SIZE, list_response
 
 router = APIRouter(prefix="/services", tags=["services"])
 
@@ -19,13 +24,22 @@ async def create_service_record(service: ServiceRecordCreate):
     service_obj = ServiceRecord(**service_data)
     doc = service_obj.model_dump()
     await db.services.insert_one(doc)
+    await increment_stats(total_services=1)
     return service_obj
 
-@router.get("", response_model=List[ServiceRecord])
-async def get_services(product_id: Optional[str] = None):
+@router.get("", response_model=Union[List[ServiceRecord], Page[ServiceRecord]])
+async def get_services(
+    request: Request,
+    response: Response,
+    product_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
     query = {"product_id": product_id} if product_id else {}
-    services = await db.services.find(query, {"_id": 0}).sort("service_date", -1).to_list(1000)
-    return services
+    return await list_response(
+        request, response, db.services, query, sort_field="service_date", direction=DESCENDING,
+        limit=limit, cursor=cursor
+    )
 
 @router.get("/{service_id}", response_model=ServiceRecord)
 async def get_service(service_id: str):
@@ -39,4 +53,6 @@ async def delete_service(service_id: str):
     result = await db.services.delete_one({"id": service_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Service record not found")
+    await record_tombstones("services", [service_id])
+    await increment_stats(total_services=-1)
     return {"message": "Service record deleted successfully"}
@@ -1,6 +1,7 @@
-from fastapi import APIRouter
-from core.database import db
+from fastapi import APIRouter, Request
+from core.auth import require_admin
 from core.config import VALID_CITIES
+from core.counters import read_stats, rebuild_stats
 
 router = APIRouter(tags=["stats"])
 
@@ -12,18 +13,25 @@ async def root():
 async def get_cities():
     return {"cities": VALID_CITIES}
 
-@router.get("/stats")
-async def get_stats():
-    total_products = await db.products.count_documents({})
-    total_services = await db.services.count_documents({})
-    open_issues = await db.issues.count_documents({"status": "open"})
-    resolved_issues = await db.issues.count_documents({"status": "resolved"})
-    recent_services = await db.services.count_documents({})
-    
+def _stats_response(stats: dict) -> dict:
     return {
-        "total_products": total_products,
-        "total_services": total_services,
-        "open_issues": open_issues,
-        "resolved_issues": resolved_issues,
-        "recent_services": recent_services
+        "total_products": stats["total_products"],
+        "total_services": stats["total_services"],
+        "open_issues": stats["open_issues"],
+        "resolved_issues": stats["resolved_issues"],
+        "recent_services": stats["total_services"]
     }
+
+async def compute_stats() -> dict:
+    """Headline counts shown on the dashboard (single counters document read)"""
+    return _stats_response(await read_stats())
+
+@router.get("/stats")
+async def get_stats():
+    return await compute_stats()
+
+@router.post("/stats/rebuild")
+async def rebuild_stats_counters(request: Request):
+    """Recompute the stats counters from the collections (admin only: scans every collection)"""
+    require_admin(request)
+    return _stats_response(await rebuild_stats())
@@ -1,13 +1,24 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import Optional
 from models.technician import TechnicianUnavailable
+from core.changes import delete_tracked, now_iso
 from core.database import db
+from core.pagination import MAX_PAGE_SIZE, list_response
 
 router = APIRouter(prefix="/technician-unavailable", tags=["technician"])
 
 @router.get("/{technician_name}")
-async def get_technician_unavailable_days(technician_name: str):
-    days = await db.technician_unavailable.find({"technician_name": technician_name}, {"_id": 0}).to_list(1000)
-    return days
+async def get_technician_unavailable_days(
+    technician_name: str,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    return await list_response(
+        request, response, db.technician_unavailable, {"technician_name": technician_name},
+        sort_field="_id", limit=limit, cursor=cursor
+    )
 
 @router.post("")
 async def add_technician_unavailable_day(data: TechnicianUnavailable):
@@ -18,15 +29,16 @@ async def add_technician_unavailable_day(data: TechnicianUnavailable):
     if existing:
         raise HTTPException(status_code=400, detail="Day already marked as unavailable")
     
+    data.updated_at = now_iso()
     await db.technician_unavailable.insert_one(data.model_dump())
     return {"message": "Unavailable day added", "data": data.model_dump()}
 
 @router.delete("/{technician_name}/{date}")
 async def remove_technician_unavailable_day(technician_name: str, date: str):
-    result = await db.technician_unavailable.delete_one({
+    deleted = await delete_tracked("technician_unavailable", {
         "technician_name": technician_name,
         "date": date
     })
-    if result.deleted_count == 0:
+    if deleted == 0:
         raise HTTPException(status_code=404, detail="Unavailable day not found")
     return {"message": "Unavailable day removed"}
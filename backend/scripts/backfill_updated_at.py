@@ -0,0 +1,62 @@
+"""
+One-off migration: give documents written before change tracking an `updated_at`.
+
+Incremental exports select rows by `updated_at`, which documents created
+before it was introduced lack. This stamps them with their creation time
+(registration date for products, the time of the run when neither exists),
+so the first `since` watermark after a full export picks up later edits.
+It is idempotent: documents that already have `updated_at` are left alone.
+
+Usage (from the backend directory):
+    python scripts/backfill_updated_at.py [--dry-run]
+"""
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.config  # noqa: E402,F401  (loads .env before database)
+from core.database import db, shutdown_db  # noqa: E402
+from core.logging_config import get_logger  # noqa: E402
+
+logger = get_logger("backfill_updated_at")
+
+# collection -> field holding the creation time
+CREATED_FIELDS = {
+    "products": "registration_date",
+    "issues": "created_at",
+    "services": "created_at",
+    "scheduled_maintenance": "created_at",
+    "technician_unavailable": None,
+    "customers": "created_at",
+}
+
+
+async def backfill(dry_run: bool = False) -> dict:
+    now = datetime.now(timezone.utc)
+    stats = {}
+    for collection, created_field in CREATED_FIELDS.items():
+        # Customers keep BSON dates, everything else ISO strings
+        fallback = now if collection == "customers" else now.isoformat()
+        missing = {"updated_at": None}
+        if dry_run:
+            stats[collection] = await db[collection].count_documents(missing)
+            continue
+        value = {"$ifNull": [f"${created_field}", fallback]} if created_field else {"$literal": fallback}
+        result = await db[collection].update_many(missing, [{"$addFields": {"updated_at": value}}])
+        stats[collection] = result.modified_count
+
+    logger.info("updated_at backfill finished", extra={"details": {**stats, "dry_run": dry_run}})
+    return stats
+
+
+async def main() -> None:
+    stats = await backfill(dry_run="--dry-run" in sys.argv[1:])
+    print(stats)
+    await shutdown_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
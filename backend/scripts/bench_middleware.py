@@ -0,0 +1,155 @@
+"""
+Throughput benchmark for the HTTP middleware stack.
+
+Drives a trivial authenticated endpoint through the ASGI interface (no
+network, no database) and reports requests/second for:
+
+- none:  no middleware at all (handler + routing baseline)
+- base:  auth + request logging written as BaseHTTPMiddleware subclasses,
+         the shape core/auth.py and core/middleware.py had before
+- asgi:  the current pure ASGI AuthMiddleware + RequestLoggingMiddleware
+
+The token is primed in the in-process token cache so no lookup reaches
+MongoDB. Log records are formatted and written to /dev/null so their cost
+is included.
+
+Usage (from the backend directory):
+    python scripts/bench_middleware.py [--requests 20000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.config import AUTH_HEADER_NAME  # noqa: E402  (loads .env before database)
+from core.auth import AuthMiddleware, _token_key, get_request_token, get_token_role, token_cache  # noqa: E402
+from core.logging_config import JSONFormatter, clear_request_context, set_request_context  # noqa: E402
+from core.middleware import RequestLoggingMiddleware  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+BENCH_TOKEN = "bench-token"
+http_logger = logging.getLogger("http")
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        if request.method != "OPTIONS" and request.url.path.startswith("/api"):
+            role = await get_token_role(get_request_token(request))
+            if not role:
+                return JSONResponse(status_code=401, content={"detail": "Unauthorized. Please login."})
+        return await call_next(request)
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        set_request_context(request_id=request_id, path=request.url.path, method=request.method)
+        start_time = time.perf_counter()
+        http_logger.info("Request started", extra={"request_id": request_id, "path": request.url.path})
+        try:
+            response = await call_next(request)
+            http_logger.info("Request completed", extra={
+                "request_id": request_id,
+                "status_code": response.status_code,
+                "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+            })
+            response.headers["X-Request-ID"] = request_id
+            return response
+        finally:
+            clear_request_context()
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    if stack == "base":
+        app.add_middleware(LegacyRequestLoggingMiddleware)
+        app.add_middleware(LegacyAuthMiddleware)
+    elif stack == "asgi":
+        app.add_middleware(RequestLoggingMiddleware)
+        app.add_middleware(AuthMiddleware)
+    return app
+
+
+async def call(app: FastAPI) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/api/ping", "raw_path": b"/api/ping",
+        "root_path": "", "query_string": b"", "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+        "headers": [(AUTH_HEADER_NAME.lower().encode(), BENCH_TOKEN.encode())],
+    }
+    status = 0
+    body_sent = False
+
+    async def receive():
+        # Deliver the (empty) body once, then report the client as gone, like a
+        # real server; BaseHTTPMiddleware rejects a second http.request
+        nonlocal body_sent
+        if body_sent:
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def run(stack: str, total: int, concurrency: int) -> float:
+    app = build_app(stack)
+    # Warm up routing, model caches and the middleware stack build
+    assert await call(app) == 200, f"{stack}: benchmark request was rejected"
+
+    remaining = total
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await call(app)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    handler = logging.StreamHandler(open(os.devnull, "w"))
+    handler.setFormatter(JSONFormatter())
+    logging.getLogger().handlers = [handler]
+
+    token_cache.ttl_seconds = 3600
+    token_cache.put(_token_key(BENCH_TOKEN), "admin", datetime.now(timezone.utc) + timedelta(hours=1))
+
+    results = {}
+    for stack in ("none", "base", "asgi"):
+        results[stack] = await run(stack, args.requests, args.concurrency)
+        print(f"{stack:5} {results[stack]:10.0f} req/s")
+    print(f"asgi vs base: {results['asgi'] / results['base']:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
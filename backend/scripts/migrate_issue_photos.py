@@ -0,0 +1,63 @@
+"""
+One-off migration: move inline base64 issue photos into the photo blob store.
+
+Issues created before photos moved out of the document carry base64 data URLs
+in `photos`. This rewrites each such issue to hold blob IDs instead. It is
+idempotent: entries that are already blob IDs are left untouched.
+
+Usage (from the backend directory):
+    python scripts/migrate_issue_photos.py [--dry-run]
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.config import BLOB_STORE_BACKEND  # noqa: E402  (loads .env before database)
+from core.database import db, shutdown_db  # noqa: E402
+from core.photos import is_inline_photo, store_inline_photos, generate_photo_thumbnails  # noqa: E402
+from core.logging_config import get_logger  # noqa: E402
+
+logger = get_logger("migrate_issue_photos")
+
+
+async def migrate(dry_run: bool = False) -> dict:
+    stats = {"issues_scanned": 0, "issues_migrated": 0, "photos_moved": 0}
+    cursor = db.issues.find({"photos.0": {"$exists": True}}, {"_id": 0, "id": 1, "photos": 1}).batch_size(50)
+
+    async for issue in cursor:
+        stats["issues_scanned"] += 1
+        photos = issue.get("photos") or []
+        inline = [photo for photo in photos if is_inline_photo(photo)]
+        if not inline:
+            continue
+
+        stats["photos_moved"] += len(inline)
+        stats["issues_migrated"] += 1
+        if dry_run:
+            continue
+
+        photo_ids = await store_inline_photos(photos, ids_attached=True)
+        await db.issues.update_one(
+            {"id": issue["id"], "photos": photos},
+            {"$set": {"photos": photo_ids}}
+        )
+        for photo_id in photo_ids:
+            await generate_photo_thumbnails(photo_id)
+
+    logger.info(
+        "Issue photo migration finished",
+        extra={"details": {**stats, "dry_run": dry_run, "backend": BLOB_STORE_BACKEND}}
+    )
+    return stats
+
+
+async def main() -> None:
+    stats = await migrate(dry_run="--dry-run" in sys.argv[1:])
+    print(stats)
+    await shutdown_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
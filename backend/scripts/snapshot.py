@@ -0,0 +1,269 @@
+"""
+App-level database snapshots as compressed NDJSON.
+
+`dump` writes every collection of the application database to
+<directory>/<collection>.ndjson.gz, one task per collection reading in
+batches, plus a manifest.json with document counts and index definitions.
+`restore` loads a snapshot back, again one task per collection, with large
+unordered insert_many batches, and creates the indexes only once the data
+is in (then applies the index registry in core/indexes.py).
+
+Documents are written as MongoDB Extended JSON, so ObjectIds, dates and the
+binary chunks of GridFS photo blobs survive the round trip. A dump is not a
+point-in-time snapshot across collections: stop writers first when the
+copy has to be consistent.
+
+Usage (from the backend directory):
+    python scripts/snapshot.py dump ./snapshots/2026-10-16
+    python scripts/snapshot.py restore ./snapshots/2026-10-16 --drop [--yes]
+"""
+import asyncio
+import gzip
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import typer
+from bson import json_util
+from pymongo.errors import BulkWriteError, OperationFailure
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.config  # noqa: E402,F401  (loads .env before database)
+from core.database import db, shutdown_db  # noqa: E402
+from core.indexes import ensure_indexes  # noqa: E402
+from core.logging_config import get_logger  # noqa: E402
+
+logger = get_logger("snapshot")
+
+MANIFEST_NAME = "manifest.json"
+SNAPSHOT_SUFFIX = ".ndjson.gz"
+# Documents per cursor batch / insert_many call; restore batches are also
+# capped in bytes so GridFS chunks (256KB each) do not pile up in memory
+DEFAULT_BATCH_SIZE = 5000
+RESTORE_BATCH_BYTES = 32 * 1024 * 1024
+COMPRESS_LEVEL = 6
+DUPLICATE_KEY_ERROR = 11000
+
+# Index options that describe the index rather than configure it
+_INDEX_META = {"v", "key", "name", "ns"}
+
+app = typer.Typer(help="Dump and restore the application database as compressed NDJSON.")
+
+
+def _stats(collection: str, documents: int, started: float, **extra: Any) -> Dict[str, Any]:
+    seconds = time.monotonic() - started
+    return {
+        "collection": collection,
+        "documents": documents,
+        "seconds": round(seconds, 3),
+        "docs_per_sec": round(documents / seconds) if seconds > 0 else documents,
+        **extra,
+    }
+
+
+def _report(action: str, results: List[Dict[str, Any]], started: float) -> None:
+    for result in sorted(results, key=lambda r: r["collection"]):
+        line = f"{result['collection']:<32} {result['documents']:>10} docs {result['seconds']:>9.2f}s {result['docs_per_sec']:>10} docs/s"
+        if result.get("duplicates"):
+            line += f" ({result['duplicates']} duplicates skipped)"
+        typer.echo(line)
+    total = _stats("total", sum(r["documents"] for r in results), started)
+    typer.echo(f"{action}: {total['documents']} docs in {total['seconds']:.2f}s ({total['docs_per_sec']} docs/s)")
+    logger.info(f"Snapshot {action.lower()}", extra={"details": {**total, "collections": len(results)}})
+
+
+async def _collection_names(only: Optional[List[str]]) -> List[str]:
+    names = await db.list_collection_names(filter={"type": "collection"})
+    names = sorted(name for name in names if not name.startswith("system."))
+    if only:
+        missing = set(only) - set(names)
+        if missing:
+            raise typer.BadParameter(f"Unknown collections: {', '.join(sorted(missing))}", param_hint="--collection")
+        names = [name for name in names if name in only]
+    return names
+
+
+# ---------------------------------------------------------------------------
+# dump
+# ---------------------------------------------------------------------------
+
+def _write_batch(handle, docs: List[Dict[str, Any]]) -> None:
+    """Encode and compress one batch (runs in a worker thread)"""
+    handle.write("".join(
+        json_util.dumps(doc, json_options=json_util.RELAXED_JSON_OPTIONS) + "\n" for doc in docs
+    ).encode())
+
+
+async def dump_collection(name: str, directory: Path, batch_size: int) -> Dict[str, Any]:
+    started = time.monotonic()
+    collection = db[name]
+    indexes = [index async for index in collection.list_indexes()]
+    path = directory / f"{name}{SNAPSHOT_SUFFIX}"
+    part = path.with_name(path.name + ".part")
+    count = 0
+    try:
+        handle = await asyncio.to_thread(gzip.open, part, "wb", COMPRESS_LEVEL)
+        try:
+            cursor = collection.find({}).batch_size(batch_size)
+            while True:
+                docs = await cursor.to_list(batch_size)
+                if not docs:
+                    break
+                # Compression and disk writes run off the event loop
+                await asyncio.to_thread(_write_batch, handle, docs)
+                count += len(docs)
+        finally:
+            await asyncio.to_thread(handle.close)
+        part.replace(path)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    return _stats(name, count, started, indexes=[dict(index) for index in indexes])
+
+
+async def _dump(directory: Path, only: Optional[List[str]], batch_size: int) -> None:
+    started = time.monotonic()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        names = await _collection_names(only)
+        results = await asyncio.gather(*(dump_collection(name, directory, batch_size) for name in names))
+        manifest = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "collections": {
+                result["collection"]: {"documents": result["documents"], "indexes": result.pop("indexes")}
+                for result in results
+            },
+        }
+        (directory / MANIFEST_NAME).write_text(json_util.dumps(manifest, indent=2))
+        _report("Dumped", results, started)
+    finally:
+        await shutdown_db()
+
+
+@app.command()
+def dump(
+    directory: Path = typer.Argument(..., help="Directory to write the snapshot into"),
+    collection: Optional[List[str]] = typer.Option(None, "--collection", "-c", help="Only these collections"),
+    batch_size: int = typer.Option(DEFAULT_BATCH_SIZE, min=1, help="Documents fetched per cursor batch"),
+):
+    """Dump every collection to <collection>.ndjson.gz in parallel."""
+    asyncio.run(_dump(directory, collection, batch_size))
+
+
+# ---------------------------------------------------------------------------
+# restore
+# ---------------------------------------------------------------------------
+
+def _read_batch(handle, batch_size: int) -> List[Dict[str, Any]]:
+    """Read and decode up to batch_size documents (runs in a worker thread)"""
+    docs: List[Dict[str, Any]] = []
+    size = 0
+    while len(docs) < batch_size and size < RESTORE_BATCH_BYTES:
+        line = handle.readline()
+        if not line:
+            break
+        if line.strip():
+            docs.append(json_util.loads(line))
+            size += len(line)
+    return docs
+
+
+async def _insert(collection, docs: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """Insert a batch without stopping at duplicates; returns (inserted, duplicates)"""
+    try:
+        result = await collection.insert_many(docs, ordered=False, bypass_document_validation=True)
+        return len(result.inserted_ids), 0
+    except BulkWriteError as exc:
+        errors = exc.details.get("writeErrors", [])
+        if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+            raise
+        return exc.details.get("nInserted", 0), len(errors)
+
+
+async def _create_indexes(collection, indexes: List[Dict[str, Any]]) -> None:
+    for index in indexes:
+        if index["name"] == "_id_":
+            continue
+        options = {key: value for key, value in index.items() if key not in _INDEX_META}
+        try:
+            await collection.create_index(list(index["key"].items()), name=index["name"], **options)
+        except OperationFailure as exc:
+            logger.warning(
+                "Failed to restore index",
+                extra={"details": {"collection": collection.name, "index": index["name"], "error": str(exc)}}
+            )
+
+
+async def restore_collection(name: str, path: Path, indexes: List[Dict[str, Any]], drop: bool,
+                             batch_size: int) -> Dict[str, Any]:
+    started = time.monotonic()
+    collection = db[name]
+    if drop:
+        # Dropping also removes the indexes, so the load does not maintain them row by row
+        await collection.drop()
+    inserted = duplicates = 0
+    handle = await asyncio.to_thread(gzip.open, path, "rb")
+    reading = None
+    try:
+        reading = asyncio.ensure_future(asyncio.to_thread(_read_batch, handle, batch_size))
+        while True:
+            docs = await reading
+            if not docs:
+                break
+            # Decode the next batch while this one is being inserted
+            reading = asyncio.ensure_future(asyncio.to_thread(_read_batch, handle, batch_size))
+            batch_inserted, batch_duplicates = await _insert(collection, docs)
+            inserted += batch_inserted
+            duplicates += batch_duplicates
+    finally:
+        if reading is not None:
+            await asyncio.gather(reading, return_exceptions=True)
+        await asyncio.to_thread(handle.close)
+    await _create_indexes(collection, indexes)
+    return _stats(name, inserted, started, duplicates=duplicates)
+
+
+async def _restore(directory: Path, only: Optional[List[str]], drop: bool, batch_size: int) -> None:
+    started = time.monotonic()
+    try:
+        manifest_path = directory / MANIFEST_NAME
+        if not manifest_path.exists():
+            raise typer.BadParameter(f"No {MANIFEST_NAME} in {directory}", param_hint="directory")
+        collections = json_util.loads(manifest_path.read_text())["collections"]
+        names = sorted(only or collections)
+        missing = [name for name in names if name not in collections]
+        if missing:
+            raise typer.BadParameter(f"Not in snapshot: {', '.join(missing)}", param_hint="--collection")
+
+        results = await asyncio.gather(*(
+            restore_collection(
+                name, directory / f"{name}{SNAPSHOT_SUFFIX}", collections[name]["indexes"], drop, batch_size
+            )
+            for name in names
+        ))
+        report = await ensure_indexes()
+        _report("Restored", results, started)
+        if report["failed"] or report["drift"]:
+            typer.echo(f"Index registry: {len(report['failed'])} failed, {len(report['drift'])} drifted", err=True)
+    finally:
+        await shutdown_db()
+
+
+@app.command()
+def restore(
+    directory: Path = typer.Argument(..., exists=True, file_okay=False, help="Snapshot directory written by dump"),
+    collection: Optional[List[str]] = typer.Option(None, "--collection", "-c", help="Only these collections"),
+    drop: bool = typer.Option(False, "--drop", help="Drop each collection before loading it"),
+    batch_size: int = typer.Option(DEFAULT_BATCH_SIZE, min=1, help="Documents per insert_many call"),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Do not ask before dropping collections"),
+):
+    """Load a snapshot with unordered bulk inserts, then rebuild indexes."""
+    if drop and not yes and not typer.confirm(f"Drop and replace collections in database '{db.name}'?", default=False):
+        raise typer.Abort()
+    asyncio.run(_restore(directory, collection, drop, batch_size))
+
+
+if __name__ == "__main__":
+    app()
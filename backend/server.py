@@ -6,6 +6,7 @@ Refactored modular structure:
 - core/: Configuration, database, authentication, logging, error handling
 """
 from fastapi import FastAPI
+from fastapi.responses import Response
 from starlette.middleware.cors import CORSMiddleware
 import sys
 from pathlib import Path
@@ -15,10 +16,18 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from core.config import FRONTEND_URL
 from core.database import shutdown_db
+from core.indexes import ensure_indexes
+from core.imaging import shutdown_image_executor
+from core.reports import shutdown_report_executor
 from core.auth import AuthMiddleware
-from core.logging_config import get_logger, setup_logging
+from core.logging_config import get_logger, setup_logging, shutdown_logging
 from core.error_handlers import register_exception_handlers
 from core.middleware import RequestLoggingMiddleware
+from core.log_sampling import request_sampler
+from core.profiling import ProfilingMiddleware
+from core.loop_monitor import loop_monitor
+from core.export_jobs import export_jobs
+from core.metrics import PROMETHEUS_CONTENT_TYPE, registry as metrics_registry
 from routes import (
     auth_router,
     products_router,
@@ -29,7 +38,10 @@ from routes import (
     stats_router,
     technician_router,
     translations_router,
-    customers_router
+    customers_router,
+    dashboard_router,
+    debug_router,
+    reports_router
 )
 
 # Initialize logging (JSON format for production)
@@ -63,6 +75,12 @@ app.include_router(export_router, prefix="/api")
 app.include_router(technician_router, prefix="/api")
 app.include_router(translations_router, prefix="/api")
 app.include_router(customers_router, prefix="/api")
+app.include_router(dashboard_router, prefix="/api")
+app.include_router(debug_router, prefix="/api")
+app.include_router(reports_router, prefix="/api")
+
+# Add Profiling Middleware (innermost: needs the request ID and auth role set by the middleware below)
+app.add_middleware(ProfilingMiddleware)
 
 # Add Request Logging Middleware (must be added before other middleware)
 app.add_middleware(RequestLoggingMiddleware)
@@ -83,18 +101,34 @@ app.add_middleware(
     allow_origins=cors_origins,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Request-ID", "X-DB-Calls", "X-DB-Time", "X-Export-Watermark"],
 )
 
 @app.on_event("startup")
 async def startup_event():
     logger.info("Application starting up", extra={"environment": _env})
+    loop_monitor.start()
+    request_sampler.start()
+    await export_jobs.start()
+    await ensure_indexes()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
     logger.info("Application shutting down")
+    await request_sampler.stop()
+    await loop_monitor.stop()
+    await export_jobs.stop()
+    shutdown_image_executor()
+    shutdown_report_executor()
     await shutdown_db()
+    shutdown_logging()
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "dimeda-api"}
+
+# Prometheus scrape endpoint (outside /api, so no auth token is required)
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
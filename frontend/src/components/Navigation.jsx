@@ -2,6 +2,7 @@ import { useState, useEffect } from "react";
 import { NavLink, useLocation, useNavigate } from "react-router-dom";
 import axios from "axios";
 import { API, clearAuthToken } from "@/App";
+import { getAll } from "@/lib/api";
 import { toast } from "sonner";
 import { useTranslation } from "@/contexts/TranslationContext";
 import { Button } from "@/components/ui/button";
@@ -84,8 +85,8 @@ const Navigation = ({ onLogout }) => {
   const fetchNotifications = async () => {
     try {
       const [issuesRes, productsRes] = await Promise.all([
-        axios.get(`${API}/issues`),
-        axios.get(`${API}/products`)
+        getAll(`${API}/issues`),
+        getAll(`${API}/products`)
       ]);
       const unassignedCustomerIssues = issuesRes.data.filter(
         issue => issue.source === "customer" && !issue.technician_name && issue.status !== "resolved"
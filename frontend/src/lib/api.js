@@ -0,0 +1,22 @@
+import axios from "axios";
+
+// Largest page the list endpoints serve (MAX_PAGE_SIZE in backend/core/pagination.py)
+const PAGE_SIZE = 1000;
+
+/**
+ * GET every row of a paginated list endpoint by following next_cursor
+ * until it is exhausted. Resolves to { data: [...] } like axios.get, so it
+ * can replace it for list fetches.
+ */
+export async function getAll(url, config = {}) {
+  const items = [];
+  let cursor = null;
+  do {
+    const params = { ...config.params, limit: PAGE_SIZE };
+    if (cursor) params.cursor = cursor;
+    const response = await axios.get(url, { ...config, params });
+    items.push(...response.data.items);
+    cursor = response.data.next_cursor;
+  } while (cursor);
+  return { data: items };
+}
@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import axios from "axios";
 import { API } from "@/App";
+import { getAll } from "@/lib/api";
 import { useTranslation } from "@/contexts/TranslationContext";
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -63,9 +64,9 @@ const CustomerDashboard = () => {
   const fetchData = async () => {
     try {
       const [productsRes, issuesRes, maintenanceRes] = await Promise.all([
-        axios.get(`${API}/products`),
-        axios.get(`${API}/issues`),
-        axios.get(`${API}/scheduled-maintenance`),
+        getAll(`${API}/products`),
+        getAll(`${API}/issues`),
+        getAll(`${API}/scheduled-maintenance`),
       ]);
       setProducts(productsRes.data);
       setMyIssues(issuesRes.data.filter(i => i.source === "customer"));
@@ -12,7 +12,6 @@ const Dashboard = () => {
   const [stats, setStats] = useState(null);
   const [recentServices, setRecentServices] = useState([]);
   const [openIssues, setOpenIssues] = useState([]);
-  const [products, setProducts] = useState([]);
   const [loading, setLoading] = useState(true);
   const navigate = useNavigate();
 
@@ -22,32 +21,10 @@ const Dashboard = () => {
 
   const fetchData = async () => {
     try {
-      const [statsRes, servicesRes, issuesRes, productsRes] = await Promise.all([
-        axios.get(`${API}/stats`),
-        axios.get(`${API}/services`),
-        axios.get(`${API}/issues`),
-        axios.get(`${API}/products`),
-      ]);
-      setStats(statsRes.data);
-      setProducts(productsRes.data);
-      
-      // Add product info to services - show all records (up to 10)
-      const servicesWithProduct = servicesRes.data.map(service => {
-        const product = productsRes.data.find(p => p.id === service.product_id);
-        return {
-          ...service,
-          product_serial: product?.serial_number || t("common.noData"),
-          product_city: product?.city || t("common.noData")
-        };
-      });
-      setRecentServices(servicesWithProduct.slice(0, 10));
-      
-      // Add product serial to issues
-      const issuesWithSerial = issuesRes.data.map(issue => ({
-        ...issue,
-        product_serial: productsRes.data.find(p => p.id === issue.product_id)?.serial_number || t("common.noData")
-      }));
-      setOpenIssues(issuesWithSerial.slice(0, 8));
+      const response = await axios.get(`${API}/dashboard/summary`);
+      setStats(response.data.stats);
+      setRecentServices(response.data.recent_services);
+      setOpenIssues(response.data.open_issues);
     } catch (error) {
       console.error("Error fetching data:", error);
     } finally {
@@ -55,11 +32,6 @@ const Dashboard = () => {
     }
   };
 
-  const getProductSerial = (productId) => {
-    const product = products.find(p => p.id === productId);
-    return product?.serial_number || t("common.noData");
-  };
-
   const StatCard = ({ title, value, icon: Icon, color, testId, onClick }) => (
     <Card 
       className="card-hover cursor-pointer transition-transform hover:scale-[1.02]" 
@@ -222,7 +194,7 @@ const Dashboard = () => {
                         </span>
                       </div>
                       <p className="text-sm text-slate-500">
-                        S/N: {service.product_serial} • {service.product_city}
+                        S/N: {service.product_serial || t("common.noData")} • {service.product_city || t("common.noData")}
                         {service.technician_name && (
                           <span className="ml-2 text-[#0066CC]">• {service.technician_name}</span>
                         )}
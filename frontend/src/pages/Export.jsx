@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import axios from "axios";
 import { API, getAuthToken } from "@/App";
+import { getAll } from "@/lib/api";
 import { useTranslation } from "@/contexts/TranslationContext";
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -77,7 +78,7 @@ const Export = () => {
 
   const fetchProducts = async () => {
     try {
-      const response = await axios.get(`${API}/products`);
+      const response = await getAll(`${API}/products`);
       setProducts(response.data);
     } catch (error) {
       toast.error("Failed to fetch products");
@@ -142,14 +143,9 @@ const Export = () => {
   const fetchProductData = async (productId) => {
     setReportLoading(true);
     try {
-      const [productRes, issuesRes, servicesRes, maintenanceRes] = await Promise.all([
-        axios.get(`${API}/products/${productId}`),
-        axios.get(`${API}/issues?product_id=${productId}`),
-        axios.get(`${API}/services?product_id=${productId}`),
-        axios.get(`${API}/scheduled-maintenance?product_id=${productId}`),
-      ]);
+      const response = await axios.get(`${API}/products/${productId}/full`);
       
-      const issues = issuesRes.data;
+      const issues = response.data.issues;
       
       // Parse and apply inspection failures from "Other" type issues
       const { failedVisualItems, failedFunctionalityItems } = parseInspectionItemsFromIssues(issues);
@@ -170,10 +166,10 @@ const Export = () => {
       setFunctionalityChecks(newFunctionalityChecks);
       
       setProductData({
-        product: productRes.data,
+        product: response.data.product,
         issues: issues,
-        services: servicesRes.data,
-        maintenance: maintenanceRes.data,
+        services: response.data.services,
+        maintenance: response.data.maintenance,
       });
       
       // Show notification if any items were auto-unmarked
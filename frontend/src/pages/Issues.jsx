@@ -2,6 +2,7 @@ import { useState, useEffect, useRef } from "react";
 import { useSearchParams } from "react-router-dom";
 import axios from "axios";
 import { API } from "@/App";
+import { getAll } from "@/lib/api";
 import { useTranslation } from "@/contexts/TranslationContext";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -140,8 +141,8 @@ const Issues = () => {
   const fetchData = async () => {
     try {
       const [issuesRes, productsRes] = await Promise.all([
-        axios.get(`${API}/issues`),
-        axios.get(`${API}/products`),
+        getAll(`${API}/issues`),
+        getAll(`${API}/products`),
       ]);
       setIssues(issuesRes.data);
       setProducts(productsRes.data);
@@ -154,17 +155,17 @@ const Issues = () => {
 
   const handlePhotoUpload = (e) => {
     const files = Array.from(e.target.files);
-    files.forEach((file) => {
-      const reader = new FileReader();
-      reader.onloadend = () => {
-        setPhotos((prev) => [...prev, reader.result]);
-      };
-      reader.readAsDataURL(file);
-    });
+    setPhotos((prev) => [
+      ...prev,
+      ...files.map((file) => ({ file, preview: URL.createObjectURL(file) })),
+    ]);
   };
 
   const removePhoto = (index) => {
-    setPhotos((prev) => prev.filter((_, i) => i !== index));
+    setPhotos((prev) => {
+      URL.revokeObjectURL(prev[index].preview);
+      return prev.filter((_, i) => i !== index);
+    });
   };
 
   const resetForm = () => {
@@ -203,11 +204,16 @@ const Issues = () => {
         }
       }
 
-      await axios.post(`${API}/issues`, {
+      const response = await axios.post(`${API}/issues`, {
         ...formData,
         description: finalDescription,
-        photos: photos,
+        photos: [],
       });
+      if (photos.length > 0) {
+        const uploadData = new FormData();
+        photos.forEach((photo) => uploadData.append("files", photo.file));
+        await axios.post(`${API}/issues/${response.data.id}/photos`, uploadData);
+      }
       toast.success(t("messages.issueCreated"));
       setDialogOpen(false);
       resetForm();
@@ -694,7 +700,7 @@ const Issues = () => {
                     {photos.map((photo, index) => (
                       <div key={index} className="relative">
                         <img
-                          src={photo}
+                          src={photo.preview}
                           alt={`Upload ${index + 1}`}
                           className="w-20 h-20 object-cover rounded-lg"
                         />
@@ -924,13 +930,20 @@ const Issues = () => {
                     )}
                     {issue.photos && issue.photos.length > 0 && (
                       <div className="flex flex-wrap gap-2 mt-4">
-                        {issue.photos.map((photo, index) => (
-                          <img
-                            key={index}
-                            src={photo}
-                            alt={`Issue photo ${index + 1}`}
-                            className="w-24 h-24 object-cover rounded-lg border"
-                          />
+                        {issue.photos.map((photoId, index) => (
+                          <a
+                            key={photoId}
+                            href={`${API}/issues/${issue.id}/photos/${photoId}`}
+                            target="_blank"
+                            rel="noopener noreferrer"
+                          >
+                            <img
+                              src={`${API}/issues/${issue.id}/photos/${photoId}?size=sm`}
+                              alt={`Issue photo ${index + 1}`}
+                              loading="lazy"
+                              className="w-24 h-24 object-cover rounded-lg border"
+                            />
+                          </a>
                         ))}
                       </div>
                     )}
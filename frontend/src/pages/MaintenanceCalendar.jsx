@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import axios from "axios";
 import { API } from "@/App";
+import { getAll } from "@/lib/api";
 import { useTranslation } from "@/contexts/TranslationContext";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -92,11 +93,11 @@ const MaintenanceCalendar = () => {
       const month = currentMonth.getMonth() + 1;
       
       const [maintenanceRes, productsRes, countRes, issuesRes, servicesRes] = await Promise.all([
-        axios.get(`${API}/scheduled-maintenance?year=${year}&month=${month}`),
-        axios.get(`${API}/products`),
+        getAll(`${API}/scheduled-maintenance?year=${year}&month=${month}`),
+        getAll(`${API}/products`),
         axios.get(`${API}/scheduled-maintenance/upcoming/count`),
-        axios.get(`${API}/issues`),
-        axios.get(`${API}/services`),
+        getAll(`${API}/issues`),
+        getAll(`${API}/services`),
       ]);
       
       setMaintenanceItems(maintenanceRes.data);
@@ -123,7 +124,7 @@ const MaintenanceCalendar = () => {
       else if (type === "overdue") endpoint = "/scheduled-maintenance/overdue/list";
       else if (type === "this-month") endpoint = "/scheduled-maintenance/this-month/list";
       
-      const response = await axios.get(`${API}${endpoint}`);
+      const response = await getAll(`${API}${endpoint}`);
       setStatsPopupData(response.data);
     } catch (error) {
       toast.error("Failed to fetch data");
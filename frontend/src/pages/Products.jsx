@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import axios from "axios";
 import { API } from "@/App";
+import { getAll } from "@/lib/api";
 import { useTranslation } from "@/contexts/TranslationContext";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -123,7 +124,7 @@ const Products = () => {
 
   const fetchProducts = async () => {
     try {
-      const response = await axios.get(`${API}/products`);
+      const response = await getAll(`${API}/products`);
       setProducts(response.data);
     } catch (error) {
       toast.error("Failed to fetch products");
@@ -135,15 +136,11 @@ const Products = () => {
   const fetchProductDetails = async (product) => {
     setDetailsLoading(true);
     try {
-      const [issuesRes, servicesRes, maintenanceRes] = await Promise.all([
-        axios.get(`${API}/issues?product_id=${product.id}`),
-        axios.get(`${API}/services?product_id=${product.id}`),
-        axios.get(`${API}/scheduled-maintenance?product_id=${product.id}`),
-      ]);
+      const response = await axios.get(`${API}/products/${product.id}/full`);
       setProductDetails({
-        issues: issuesRes.data,
-        services: servicesRes.data,
-        maintenance: maintenanceRes.data,
+        issues: response.data.issues,
+        services: response.data.services,
+        maintenance: response.data.maintenance,
       });
     } catch (error) {
       toast.error("Failed to fetch product details");
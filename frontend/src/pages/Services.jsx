@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import axios from "axios";
 import { API } from "@/App";
+import { getAll } from "@/lib/api";
 import { useTranslation } from "@/contexts/TranslationContext";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -94,9 +95,9 @@ const Services = () => {
   const fetchData = async () => {
     try {
       const [servicesRes, productsRes, allIssuesRes] = await Promise.all([
-        axios.get(`${API}/services`),
-        axios.get(`${API}/products`),
-        axios.get(`${API}/issues`),
+        getAll(`${API}/services`),
+        getAll(`${API}/products`),
+        getAll(`${API}/issues`),
       ]);
       setServices(servicesRes.data);
       setProducts(productsRes.data);
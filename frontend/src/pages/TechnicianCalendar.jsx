@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import axios from "axios";
 import { API } from "@/App";
+import { getAll } from "@/lib/api";
 import { useTranslation } from "@/contexts/TranslationContext";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -80,9 +81,9 @@ const TechnicianCalendar = ({ selectedTechnician }) => {
   const fetchData = async () => {
     try {
       const [maintenanceRes, productsRes, issuesRes] = await Promise.all([
-        axios.get(`${API}/scheduled-maintenance`),
-        axios.get(`${API}/products`),
-        axios.get(`${API}/issues`),
+        getAll(`${API}/scheduled-maintenance`),
+        getAll(`${API}/products`),
+        getAll(`${API}/issues`),
       ]);
       
       // Filter by selected technician
@@ -107,7 +108,7 @@ const TechnicianCalendar = ({ selectedTechnician }) => {
 
   const fetchUnavailableDays = async () => {
     try {
-      const response = await axios.get(`${API}/technician-unavailable/${selectedTechnician}`);
+      const response = await getAll(`${API}/technician-unavailable/${selectedTechnician}`);
       setUnavailableDays(response.data.map(d => d.date));
     } catch (error) {
       console.error("Failed to fetch unavailable days");
@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import axios from "axios";
 import { API } from "@/App";
+import { getAll } from "@/lib/api";
 import { useTranslation } from "@/contexts/TranslationContext";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -45,10 +46,10 @@ const TechnicianDashboard = ({ selectedTechnician, onTechnicianChange }) => {
   const fetchStats = async () => {
     try {
       const [productsRes, issuesRes, maintenanceRes, servicesRes] = await Promise.all([
-        axios.get(`${API}/products`),
-        axios.get(`${API}/issues`),
-        axios.get(`${API}/scheduled-maintenance`),
-        axios.get(`${API}/services`),
+        getAll(`${API}/products`),
+        getAll(`${API}/issues`),
+        getAll(`${API}/scheduled-maintenance`),
+        getAll(`${API}/services`),
       ]);
 
       // Filter by selected technician if set
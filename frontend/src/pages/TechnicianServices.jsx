@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import axios from "axios";
 import { API } from "@/App";
+import { getAll } from "@/lib/api";
 import { useTranslation } from "@/contexts/TranslationContext";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -56,8 +57,8 @@ const TechnicianServices = ({ selectedTechnician }) => {
   const fetchData = async () => {
     try {
       const [issuesRes, productsRes] = await Promise.all([
-        axios.get(`${API}/issues`),
-        axios.get(`${API}/products`),
+        getAll(`${API}/issues`),
+        getAll(`${API}/products`),
       ]);
       
       // Filter by selected technician
@@ -0,0 +1,14 @@
+"""
+Shared test setup.
+
+Most tests drive a deployed backend over HTTP (REACT_APP_BACKEND_URL). Unit
+tests import modules from backend/ directly; the Motor client connects
+lazily, so placeholder connection settings are enough to import them.
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "dimeda_test")
@@ -0,0 +1,109 @@
+"""
+Test aggregated read endpoints
+- GET /api/products/{id}/full - product with issues, services and maintenance
+- GET /api/dashboard/summary - stats, recent services and unresolved issues with product info
+"""
+import pytest
+import requests
+import os
+import uuid
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+ADMIN_PASSWORD = "admin2025"
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get headers with admin auth token"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={"password": ADMIN_PASSWORD})
+    if response.status_code != 200:
+        pytest.fail(f"Failed to authenticate: {response.status_code} - {response.text}")
+    return {"X-Auth-Token": response.json().get("token")}
+
+
+@pytest.fixture(scope="module")
+def product_with_history(auth_headers):
+    """Create a product with one issue and one service record"""
+    product = requests.post(f"{BASE_URL}/api/products", headers=auth_headers, json={
+        "serial_number": f"TEST_FULL_{uuid.uuid4().hex[:8].upper()}",
+        "model_name": "Powered Stretchers",
+        "model_type": "powered",
+        "city": "Kaunas"
+    }).json()
+    issue = requests.post(f"{BASE_URL}/api/issues", headers=auth_headers, json={
+        "product_id": product["id"],
+        "issue_type": "mechanical",
+        "severity": "medium",
+        "title": "TEST aggregated issue",
+        "description": "Created by test_aggregated_endpoints"
+    }).json()
+    service = requests.post(f"{BASE_URL}/api/services", headers=auth_headers, json={
+        "product_id": product["id"],
+        "technician_name": "Technician 1",
+        "service_type": "inspection",
+        "description": "TEST aggregated service"
+    }).json()
+    yield {"product": product, "issue": issue, "service": service}
+    requests.delete(f"{BASE_URL}/api/issues/{issue['id']}", headers=auth_headers)
+    requests.delete(f"{BASE_URL}/api/services/{service['id']}", headers=auth_headers)
+    requests.delete(f"{BASE_URL}/api/products/{product['id']}", headers=auth_headers)
+
+
+class TestProductFull:
+    """Test GET /api/products/{id}/full"""
+
+    def test_returns_all_sections(self, auth_headers, product_with_history):
+        product_id = product_with_history["product"]["id"]
+        response = requests.get(f"{BASE_URL}/api/products/{product_id}/full", headers=auth_headers)
+        assert response.status_code == 200, response.text
+
+        data = response.json()
+        assert data["product"]["id"] == product_id
+        assert [i["id"] for i in data["issues"]] == [product_with_history["issue"]["id"]]
+        assert [s["id"] for s in data["services"]] == [product_with_history["service"]["id"]]
+        # 5 yearly maintenance entries plus the issue inspection/service tasks
+        assert len(data["maintenance"]) >= 5
+        assert all(m["product_id"] == product_id for m in data["maintenance"])
+        print(f"✓ Full product: {len(data['issues'])} issues, {len(data['maintenance'])} maintenance")
+
+    def test_section_limits(self, auth_headers, product_with_history):
+        product_id = product_with_history["product"]["id"]
+        response = requests.get(
+            f"{BASE_URL}/api/products/{product_id}/full?maintenance_limit=2",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert len(response.json()["maintenance"]) == 2
+
+    def test_unknown_product_returns_404(self, auth_headers):
+        response = requests.get(f"{BASE_URL}/api/products/{uuid.uuid4()}/full", headers=auth_headers)
+        assert response.status_code == 404
+
+
+class TestDashboardSummary:
+    """Test GET /api/dashboard/summary"""
+
+    def test_summary_structure(self, auth_headers, product_with_history):
+        response = requests.get(f"{BASE_URL}/api/dashboard/summary", headers=auth_headers)
+        assert response.status_code == 200, response.text
+
+        data = response.json()
+        for key in ["total_products", "total_services", "open_issues", "resolved_issues"]:
+            assert key in data["stats"], f"Missing stat {key}"
+        assert len(data["recent_services"]) <= 10
+        assert len(data["open_issues"]) <= 8
+        assert all(issue["status"] != "resolved" for issue in data["open_issues"])
+        assert all("photos" not in issue for issue in data["open_issues"])
+
+    def test_summary_includes_product_info(self, auth_headers, product_with_history):
+        response = requests.get(f"{BASE_URL}/api/dashboard/summary", headers=auth_headers)
+        data = response.json()
+        serial = product_with_history["product"]["serial_number"]
+
+        service = next(s for s in data["recent_services"] if s["id"] == product_with_history["service"]["id"])
+        assert service["product_serial"] == serial
+        assert service["product_city"] == "Kaunas"
+
+        issue = next(i for i in data["open_issues"] if i["id"] == product_with_history["issue"]["id"])
+        assert issue["product_serial"] == serial
+        print("✓ Dashboard summary carries product serial and city")
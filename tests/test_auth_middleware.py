@@ -0,0 +1,77 @@
+"""
+Test the pure ASGI AuthMiddleware
+- /api requests without a token, or with an unknown token, get 401
+- A valid token passes through and its role is stored on request.state
+- PUBLIC_PATHS, PUBLIC_PREFIXES, CORS preflight and non-/api paths need no token
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from core import auth
+from core.auth import AuthMiddleware, PUBLIC_PATHS, _token_key, token_cache
+from core.config import AUTH_HEADER_NAME
+
+VALID_TOKEN = "valid-test-token"
+
+
+class _NoTokens:
+    """Stands in for the auth_tokens collection: every lookup misses"""
+
+    async def find_one(self, *args, **kwargs):
+        return None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(auth, "db", type("FakeDB", (), {"auth_tokens": _NoTokens()})())
+    token_cache.clear()
+    token_cache.put(_token_key(VALID_TOKEN), auth.ROLE_TECHNICIAN, datetime.now(timezone.utc) + timedelta(hours=1))
+
+    app = FastAPI()
+
+    @app.api_route("/{path:path}", methods=["GET", "POST", "OPTIONS"])
+    async def echo(path: str, request: Request):
+        return {"path": path, "role": getattr(request.state, "auth_role", None)}
+
+    app.add_middleware(AuthMiddleware)
+    yield TestClient(app)
+    token_cache.clear()
+
+
+class TestAuthMiddleware:
+    """Test AuthMiddleware token checks"""
+
+    def test_missing_token_rejected(self, client):
+        response = client.get("/api/issues")
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Unauthorized. Please login."}
+
+    def test_invalid_token_rejected(self, client):
+        response = client.get("/api/issues", headers={AUTH_HEADER_NAME: "not-a-token"})
+        assert response.status_code == 401
+
+    def test_valid_token_passes_with_role(self, client):
+        response = client.get("/api/issues", headers={AUTH_HEADER_NAME: VALID_TOKEN})
+        assert response.status_code == 200
+        assert response.json()["role"] == auth.ROLE_TECHNICIAN
+
+    def test_valid_cookie_passes(self, client):
+        client.cookies.set(auth.AUTH_COOKIE_NAME, VALID_TOKEN)
+        response = client.get("/api/issues")
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize("path", sorted(PUBLIC_PATHS))
+    def test_public_paths_need_no_token(self, client, path):
+        response = client.post(path)
+        assert response.status_code == 200
+        assert response.json()["role"] is None
+
+    def test_public_prefix_and_non_api_paths_need_no_token(self, client):
+        assert client.get("/api/translations/en").status_code == 200
+        assert client.get("/metrics").status_code == 200
+
+    def test_preflight_needs_no_token(self, client):
+        assert client.options("/api/issues").status_code == 200
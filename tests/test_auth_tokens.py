@@ -0,0 +1,43 @@
+"""
+Test persistent auth tokens
+- Each login type issues a token carrying its role
+- /api/auth/check reports the role of a valid token
+- Logout revokes the token for subsequent requests
+"""
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+LOGINS = [
+    ("/api/auth/login", "admin2025", "admin"),
+    ("/api/auth/technician-login", "service2025", "technician"),
+    ("/api/auth/customer-login", "customer2025", "customer"),
+]
+
+
+class TestAuthTokens:
+    """Test token issue, check and revocation"""
+
+    @pytest.mark.parametrize("path,password,role", LOGINS)
+    def test_login_issues_role_token(self, path, password, role):
+        response = requests.post(f"{BASE_URL}{path}", json={"password": password})
+        assert response.status_code == 200, response.text
+        token = response.json()["token"]
+
+        check = requests.get(f"{BASE_URL}/api/auth/check", headers={"X-Auth-Token": token})
+        assert check.json() == {"authenticated": True, "type": role}
+
+    def test_logout_revokes_token(self):
+        token = requests.post(f"{BASE_URL}/api/auth/login", json={"password": "admin2025"}).json()["token"]
+        headers = {"X-Auth-Token": token}
+        assert requests.get(f"{BASE_URL}/api/products", headers=headers).status_code == 200
+
+        assert requests.post(f"{BASE_URL}/api/auth/logout", headers=headers).status_code == 200
+        check = requests.get(f"{BASE_URL}/api/auth/check", headers=headers)
+        assert check.json()["authenticated"] is False
+
+    def test_unknown_token_rejected(self):
+        response = requests.get(f"{BASE_URL}/api/products", headers={"X-Auth-Token": "not-a-token"})
+        assert response.status_code == 401
@@ -0,0 +1,94 @@
+"""
+Test background export jobs
+- POST /api/export/jobs queues an export and returns 202 with the job
+- GET /api/export/jobs/{id} reports progress until the job completes
+- The finished artifact downloads as gzip and matches the direct export
+- Invalid filters and unknown jobs are rejected
+- Concurrent submits beyond the queue size get 429, never a 500 or a stuck job
+"""
+import gzip
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import requests
+import os
+import uuid
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+ADMIN_PASSWORD = "admin2025"
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get headers with admin auth token"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={"password": ADMIN_PASSWORD})
+    if response.status_code != 200:
+        pytest.fail(f"Failed to authenticate: {response.status_code} - {response.text}")
+    return {"X-Auth-Token": response.json().get("token")}
+
+
+def _wait_for(job_id, headers, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = requests.get(f"{BASE_URL}/api/export/jobs/{job_id}", headers=headers).json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        assert 0 <= job["progress"] <= 1
+        time.sleep(0.5)
+    pytest.fail(f"Export job {job_id} did not finish in {timeout}s")
+
+
+class TestExportJobs:
+    """Test /api/export/jobs"""
+
+    def test_job_lifecycle(self, auth_headers):
+        response = requests.post(f"{BASE_URL}/api/export/jobs", headers=auth_headers, json={"data_type": "products"})
+        assert response.status_code == 202, response.text
+        job = response.json()
+        assert job["status"] == "queued"
+
+        job = _wait_for(job["id"], auth_headers)
+        assert job["status"] == "completed", job.get("error")
+        assert job["progress"] == 1.0
+        assert job["rows_written"] == job["total_rows"]
+
+        download = requests.get(f"{BASE_URL}{job['download_url']}", headers=auth_headers)
+        assert download.status_code == 200
+        assert download.headers["content-type"] == "application/gzip"
+        direct = requests.get(f"{BASE_URL}/api/export/products", headers=auth_headers)
+        if direct.status_code == 200:
+            assert gzip.decompress(download.content) == direct.content
+
+    def test_filtered_ndjson_job(self, auth_headers):
+        response = requests.post(f"{BASE_URL}/api/export/jobs", headers=auth_headers, json={
+            "data_type": "services", "format": "ndjson",
+            "date_from": "2020-01-01", "date_to": "2099-12-31"
+        })
+        assert response.status_code == 202, response.text
+        job = _wait_for(response.json()["id"], auth_headers)
+        assert job["status"] == "completed", job.get("error")
+        assert job["filters"] == {} and job["date_from"] == "2020-01-01"
+
+    def test_invalid_filter_rejected(self, auth_headers):
+        response = requests.post(f"{BASE_URL}/api/export/jobs", headers=auth_headers, json={
+            "data_type": "products", "filters": {"$where": "1"}
+        })
+        assert response.status_code == 400
+
+    def test_unknown_job(self, auth_headers):
+        response = requests.get(f"{BASE_URL}/api/export/jobs/{uuid.uuid4()}", headers=auth_headers)
+        assert response.status_code == 404
+
+    def test_concurrent_submits_never_overflow(self, auth_headers):
+        def submit(_):
+            return requests.post(f"{BASE_URL}/api/export/jobs", headers=auth_headers, json={"data_type": "products"})
+
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            responses = list(pool.map(submit, range(60)))
+
+        statuses = {response.status_code for response in responses}
+        assert statuses <= {202, 429}, [response.text for response in responses if response.status_code >= 500]
+        for response in responses:
+            if response.status_code == 202:
+                job = _wait_for(response.json()["id"], auth_headers, timeout=120)
+                assert job["status"] == "completed", job.get("error")
@@ -0,0 +1,101 @@
+"""
+Test incremental exports
+- Writes stamp updated_at
+- GET /api/export/{data_type}?since= returns only rows changed after the watermark
+- Deletes show up as deleted=true tombstone rows
+- X-Export-Watermark is the next since, and trails the current time by the
+  settle lag so writes still in flight are picked up by the next sync
+"""
+import json
+from datetime import datetime
+import pytest
+import requests
+import os
+import time
+import uuid
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+ADMIN_PASSWORD = "admin2025"
+# Must match the server's EXPORT_WATERMARK_LAG_SECONDS
+WATERMARK_LAG_SECONDS = float(os.environ.get("EXPORT_WATERMARK_LAG_SECONDS", "5"))
+
+
+def _settle():
+    """Wait until the latest writes fall inside the export window"""
+    time.sleep(WATERMARK_LAG_SECONDS + 0.5)
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get headers with admin auth token"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={"password": ADMIN_PASSWORD})
+    if response.status_code != 200:
+        pytest.fail(f"Failed to authenticate: {response.status_code} - {response.text}")
+    return {"X-Auth-Token": response.json().get("token")}
+
+
+def _changes(auth_headers, data_type, since):
+    response = requests.get(
+        f"{BASE_URL}/api/export/{data_type}", headers=auth_headers,
+        params={"format": "ndjson", "since": since}
+    )
+    assert response.status_code == 200, response.text
+    rows = [json.loads(line) for line in response.text.splitlines() if line]
+    return rows, response.headers["X-Export-Watermark"]
+
+
+class TestIncrementalExport:
+    """Test since/until watermarks and tombstones"""
+
+    def test_updates_and_deletes_are_exported(self, auth_headers):
+        product = requests.post(f"{BASE_URL}/api/products", headers=auth_headers, json={
+            "serial_number": f"TEST_SYNC_{uuid.uuid4().hex[:8].upper()}",
+            "model_name": "Powered Stretchers",
+            "model_type": "powered",
+            "city": "Vilnius"
+        }).json()
+        assert product["updated_at"]
+
+        _, watermark = _changes(auth_headers, "products", product["updated_at"])
+        assert watermark == datetime.fromisoformat(product["updated_at"]).isoformat()
+        time.sleep(0.01)
+        updated = requests.put(f"{BASE_URL}/api/products/{product['id']}", headers=auth_headers, json={
+            "serial_number": product["serial_number"],
+            "model_name": product["model_name"],
+            "model_type": "powered",
+            "city": "Kaunas"
+        }).json()
+        assert updated["updated_at"] > product["updated_at"]
+
+        # Not settled yet: the update is held back and the watermark stays before it
+        rows, early_watermark = _changes(auth_headers, "products", watermark)
+        assert all(r["id"] != product["id"] for r in rows)
+        assert early_watermark < updated["updated_at"]
+
+        _settle()
+        rows, next_watermark = _changes(auth_headers, "products", watermark)
+        row = next(r for r in rows if r["id"] == product["id"])
+        assert row["city"] == "Kaunas"
+        assert row["deleted"] is False
+        assert list(row)[0] == "id" and list(row)[-2:] == ["updated_at", "deleted"]
+
+        requests.delete(f"{BASE_URL}/api/products/{product['id']}", headers=auth_headers)
+        _settle()
+        rows, _ = _changes(auth_headers, "products", next_watermark)
+        tombstone = next(r for r in rows if r["id"] == product["id"])
+        assert tombstone["deleted"] is True
+        print(f"✓ Product {product['id']} exported as update then tombstone")
+
+    def test_future_since_is_empty(self, auth_headers):
+        response = requests.get(
+            f"{BASE_URL}/api/export/issues", headers=auth_headers,
+            params={"since": "2099-01-01T00:00:00+00:00", "until": "2099-01-02T00:00:00+00:00"}
+        )
+        assert response.status_code == 200
+        assert response.text.splitlines() == ["id,issue_type,date,resolved_date,serial_number,city,"
+                                              "technician_name,warranty_status,updated_at,deleted"]
+
+    def test_invalid_watermark_rejected(self, auth_headers):
+        response = requests.get(f"{BASE_URL}/api/export/services", headers=auth_headers, params={"since": "yesterday"})
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
@@ -0,0 +1,69 @@
+"""
+Test issue code generation
+- Issue codes follow YYYY_SN_MM_DD_ORDER
+- Concurrent issue creation yields distinct ORDER suffixes (atomic per-day counter)
+"""
+import pytest
+import requests
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+ADMIN_PASSWORD = "admin2025"
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get headers with admin auth token"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={"password": ADMIN_PASSWORD})
+    if response.status_code != 200:
+        pytest.fail(f"Failed to authenticate: {response.status_code} - {response.text}")
+    return {"X-Auth-Token": response.json().get("token")}
+
+
+@pytest.fixture(scope="module")
+def test_product(auth_headers):
+    """Create a throwaway product and delete it afterwards"""
+    response = requests.post(f"{BASE_URL}/api/products", headers=auth_headers, json={
+        "serial_number": f"TEST_CODE_{uuid.uuid4().hex[:8].upper()}",
+        "model_name": "Powered Stretchers",
+        "model_type": "powered",
+        "city": "Vilnius"
+    })
+    assert response.status_code == 200, response.text
+    product = response.json()
+    yield product
+    requests.delete(f"{BASE_URL}/api/products/{product['id']}", headers=auth_headers)
+
+
+class TestIssueCodes:
+    """Test atomic issue code generation"""
+
+    def test_concurrent_issue_codes_are_unique(self, auth_headers, test_product):
+        """Ten concurrent creates must get ten distinct issue codes"""
+        def create(index):
+            return requests.post(f"{BASE_URL}/api/issues", headers=auth_headers, json={
+                "product_id": test_product["id"],
+                "issue_type": "mechanical",
+                "severity": "low",
+                "title": f"TEST concurrent code {index}",
+                "description": "Created by test_issue_codes"
+            })
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            responses = list(pool.map(create, range(10)))
+
+        issues = []
+        for response in responses:
+            assert response.status_code == 200, response.text
+            issues.append(response.json())
+
+        codes = [issue["issue_code"] for issue in issues]
+        assert len(set(codes)) == len(codes), f"Duplicate issue codes: {codes}"
+        for code in codes:
+            assert test_product["serial_number"] in code
+
+        for issue in issues:
+            requests.delete(f"{BASE_URL}/api/issues/{issue['id']}", headers=auth_headers)
+        print(f"✓ Concurrent issue codes unique: {sorted(codes)}")
@@ -0,0 +1,116 @@
+"""
+Test issue photos
+- Photo IDs passed to POST /api/issues must name a stored original photo
+- Deduplicated photos survive deleting one issue while the same bytes are
+  uploaded to another
+"""
+import io
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import requests
+import os
+import uuid
+
+from PIL import Image
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+ADMIN_PASSWORD = "admin2025"
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get headers with admin auth token"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={"password": ADMIN_PASSWORD})
+    if response.status_code != 200:
+        pytest.fail(f"Failed to authenticate: {response.status_code} - {response.text}")
+    return {"X-Auth-Token": response.json().get("token")}
+
+
+@pytest.fixture(scope="module")
+def test_product(auth_headers):
+    """Create a throwaway product and delete it afterwards"""
+    response = requests.post(f"{BASE_URL}/api/products", headers=auth_headers, json={
+        "serial_number": f"TEST_PHOTO_{uuid.uuid4().hex[:8].upper()}",
+        "model_name": "Powered Stretchers",
+        "model_type": "powered",
+        "city": "Vilnius"
+    })
+    assert response.status_code == 200, response.text
+    product = response.json()
+    yield product
+    requests.delete(f"{BASE_URL}/api/products/{product['id']}", headers=auth_headers)
+
+
+def make_jpeg(seed=None):
+    """A small JPEG; a fresh seed gives content no other test has uploaded"""
+    seed = seed or uuid.uuid4().int
+    image = Image.new("RGB", (64, 48), ((seed >> 16) & 255, (seed >> 8) & 255, seed & 255))
+    output = io.BytesIO()
+    image.save(output, format="JPEG")
+    return output.getvalue()
+
+
+def create_issue(headers, product, photos=None):
+    return requests.post(f"{BASE_URL}/api/issues", headers=headers, json={
+        "product_id": product["id"],
+        "issue_type": "mechanical",
+        "severity": "low",
+        "title": "TEST issue photos",
+        "description": "Created by test_issue_photos",
+        "photos": photos or []
+    })
+
+
+def upload_photo(headers, issue_id, data):
+    return requests.post(
+        f"{BASE_URL}/api/issues/{issue_id}/photos", headers=headers,
+        files=[("files", ("photo.jpg", data, "image/jpeg"))]
+    )
+
+
+class TestPhotoIds:
+    """Test photo IDs passed through POST /api/issues"""
+
+    def test_unknown_photo_id_rejected(self, auth_headers, test_product):
+        response = create_issue(auth_headers, test_product, photos=["0" * 64])
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_existing_photo_id_accepted(self, auth_headers, test_product):
+        first = create_issue(auth_headers, test_product).json()
+        photo_id = upload_photo(auth_headers, first["id"], make_jpeg()).json()["photos"][0]
+
+        second = create_issue(auth_headers, test_product, photos=[photo_id])
+        assert second.status_code == 200, second.text
+        assert second.json()["photos"] == [photo_id]
+
+        for issue in (first, second.json()):
+            requests.delete(f"{BASE_URL}/api/issues/{issue['id']}", headers=auth_headers)
+
+
+class TestSharedPhotos:
+    """Test reference counting of deduplicated photos"""
+
+    def test_delete_during_duplicate_upload(self, auth_headers, test_product):
+        for attempt in range(5):
+            data = make_jpeg()
+            first = create_issue(auth_headers, test_product).json()
+            second = create_issue(auth_headers, test_product).json()
+            response = upload_photo(auth_headers, first["id"], data)
+            assert response.status_code == 200, response.text
+
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                deleted = pool.submit(
+                    requests.delete, f"{BASE_URL}/api/issues/{first['id']}", headers=auth_headers
+                )
+                uploaded = pool.submit(upload_photo, auth_headers, second["id"], data)
+                assert deleted.result().status_code == 200
+                upload = uploaded.result()
+            assert upload.status_code == 200, upload.text
+
+            photo_id = upload.json()["photos"][0]
+            photo = requests.get(f"{BASE_URL}/api/issues/{second['id']}/photos/{photo_id}", headers=auth_headers)
+            assert photo.status_code == 200, f"attempt {attempt}: shared photo was deleted"
+            assert photo.content[:2] == b"\xff\xd8"
+
+            requests.delete(f"{BASE_URL}/api/issues/{second['id']}", headers=auth_headers)
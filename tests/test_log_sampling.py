@@ -0,0 +1,108 @@
+"""
+Test adaptive request log sampling
+- Errors, slow requests and the first requests per interval are always kept
+- Past the minimum, the route's own rate applies, falling back to the global rate
+- Summaries count every request and are emitted by the background task without new traffic
+"""
+import asyncio
+
+import pytest
+
+from core import log_sampling
+from core.log_sampling import RequestSampler
+
+
+@pytest.fixture
+def summaries(monkeypatch):
+    """Capture the details of each "Request summary" line"""
+    lines = []
+
+    def capture(message, *args, extra=None, **kwargs):
+        if message == "Request summary":
+            lines.append(extra["details"])
+
+    monkeypatch.setattr(log_sampling.logger, "info", capture)
+    return lines
+
+
+def make_sampler(**overrides):
+    options = {"rate": 0.0, "min_per_interval": 0, "slow_ms": 1000, "interval_seconds": 3600, "route_rates": {}}
+    options.update(overrides)
+    return RequestSampler(**options)
+
+
+class TestSamplingDecision:
+    """Test RequestSampler.record keep/drop decisions"""
+
+    def test_success_dropped_at_zero_rate(self):
+        sampler = make_sampler()
+        assert not any(sampler.record("/api/issues", 200, 5) for _ in range(100))
+
+    def test_success_kept_at_full_rate(self):
+        sampler = make_sampler(rate=1.0)
+        assert all(sampler.record("/api/issues", 200, 5) for _ in range(100))
+
+    def test_errors_and_exceptions_always_kept(self):
+        sampler = make_sampler()
+        assert sampler.record("/api/issues", 404, 5)
+        assert sampler.record("/api/issues", 500, 5)
+        assert sampler.record("/api/issues", None, 5)
+
+    def test_slow_requests_always_kept(self):
+        sampler = make_sampler(slow_ms=100)
+        assert sampler.record("/api/issues", 200, 100)
+        assert not sampler.record("/api/issues", 200, 99)
+
+    def test_first_requests_per_route_kept(self):
+        sampler = make_sampler(min_per_interval=3)
+        kept = [sampler.record("/api/issues", 200, 5) for _ in range(10)]
+        assert kept == [True] * 3 + [False] * 7
+        # Each route gets its own minimum
+        assert sampler.record("/api/products", 200, 5)
+
+    def test_route_rate_overrides_global_rate(self):
+        sampler = make_sampler(rate=1.0, route_rates={"/api/auth/check": 0.0})
+        assert not any(sampler.record("/api/auth/check", 200, 5) for _ in range(100))
+        assert all(sampler.record("/api/issues", 200, 5) for _ in range(100))
+        assert sampler.rate_for("/api/auth/check") == 0.0
+        assert sampler.rate_for("/api/issues") == 1.0
+
+
+class TestSummaries:
+    """Test per-route summary lines"""
+
+    def test_summary_counts(self, summaries):
+        sampler = make_sampler(min_per_interval=2)
+        for duration_ms in (10, 20, 30):
+            sampler.record("/api/issues", 200, duration_ms)
+        sampler.record("/api/issues", 500, 40)
+        sampler.record("/api/products", 200, 7)
+        sampler.flush()
+
+        by_route = {line["route"]: line for line in summaries}
+        assert by_route["/api/issues"]["count"] == 4
+        assert by_route["/api/issues"]["errors"] == 1
+        assert by_route["/api/issues"]["logged"] == 3
+        assert by_route["/api/issues"]["avg_ms"] == 25
+        assert by_route["/api/issues"]["max_ms"] == 40
+        assert by_route["/api/products"]["count"] == 1
+
+        # The next interval starts empty
+        summaries.clear()
+        sampler.flush()
+        assert summaries == []
+
+    def test_background_task_flushes_quiet_routes(self, summaries):
+        async def scenario():
+            sampler = make_sampler(interval_seconds=0.05)
+            sampler.start()
+            sampler.record("/api/issues", 200, 5)
+            # No further traffic: the summary must still arrive
+            await asyncio.sleep(0.2)
+            flushed = list(summaries)
+            await sampler.stop()
+            return flushed
+
+        flushed = asyncio.run(scenario())
+        assert [line["route"] for line in flushed] == ["/api/issues"]
+        assert flushed[0]["count"] == 1
@@ -0,0 +1,89 @@
+"""
+Test the event-loop stall detector
+- A blocking call inside a request counts a stall and logs it with the request's id
+- Stalls in a StreamingResponse body (run in its own task) are attributed to the request too
+"""
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from core import loop_monitor as loop_monitor_module
+from core.loop_monitor import LoopMonitor, loop_stalls
+from core.middleware import REQUEST_ID_HEADER, RequestLoggingMiddleware
+
+BLOCK_SECONDS = 0.4
+
+
+@pytest.fixture
+def stall_logs(monkeypatch):
+    """Capture "Event loop stalled" records (written from the watchdog thread)"""
+    class StallLogs(list):
+        logged = threading.Event()
+
+    records = StallLogs()
+
+    def capture(message, *args, extra=None, **kwargs):
+        if message == "Event loop stalled":
+            records.append(extra)
+            records.logged.set()
+
+    monkeypatch.setattr(loop_monitor_module.logger, "warning", capture)
+    return records
+
+
+@pytest.fixture
+def client():
+    monitor = LoopMonitor(interval=0.02, threshold_ms=100)
+    app = FastAPI()
+
+    @app.on_event("startup")
+    async def start_monitor():
+        monitor.start()
+
+    @app.on_event("shutdown")
+    async def stop_monitor():
+        await monitor.stop()
+
+    @app.get("/api/block")
+    async def block():
+        time.sleep(BLOCK_SECONDS)
+        return {"ok": True}
+
+    @app.get("/api/block-stream")
+    async def block_stream():
+        async def rows():
+            yield b"header\n"
+            time.sleep(BLOCK_SECONDS)
+            yield b"row\n"
+        return StreamingResponse(rows(), media_type="text/csv")
+
+    app.add_middleware(RequestLoggingMiddleware)
+    with TestClient(app) as test_client:
+        # Let the heartbeat run once before blocking the loop
+        time.sleep(0.1)
+        yield test_client
+
+
+def _stalls() -> float:
+    return loop_stalls._values.get((), 0)
+
+
+class TestLoopMonitor:
+    """Test stall detection and request attribution"""
+
+    @pytest.mark.parametrize("path", ["/api/block", "/api/block-stream"])
+    def test_stall_counted_and_attributed(self, client, stall_logs, path):
+        before = _stalls()
+        response = client.get(path)
+        assert response.status_code == 200
+        assert stall_logs.logged.wait(1), "stall was not logged"
+
+        assert _stalls() > before
+        record = stall_logs[0]
+        assert record["request_id"] == response.headers[REQUEST_ID_HEADER]
+        assert record["duration_ms"] >= 100
+        assert "time.sleep(BLOCK_SECONDS)" in record["traceback"]
@@ -0,0 +1,63 @@
+"""
+Test Prometheus metrics endpoint
+- GET /metrics is public and returns Prometheus text format
+- Request latency is labelled by route template, not raw path
+- Error responses are counted by error code
+- Each response reports its MongoDB round trips in X-DB-Calls / X-DB-Time
+"""
+import pytest
+import requests
+import os
+import uuid
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+ADMIN_PASSWORD = "admin2025"
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get headers with admin auth token"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={"password": ADMIN_PASSWORD})
+    if response.status_code != 200:
+        pytest.fail(f"Failed to authenticate: {response.status_code} - {response.text}")
+    return {"X-Auth-Token": response.json().get("token")}
+
+
+class TestMetrics:
+    """Test GET /metrics"""
+
+    def test_metrics_text_format(self):
+        response = requests.get(f"{BASE_URL}/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert "# TYPE db_operation_duration_seconds histogram" in response.text
+
+    def test_routes_labelled_by_template(self, auth_headers):
+        product_id = str(uuid.uuid4())
+        requests.get(f"{BASE_URL}/api/products/{product_id}", headers=auth_headers)
+
+        text = requests.get(f"{BASE_URL}/metrics").text
+        assert 'route="/api/products/{product_id}"' in text
+        assert product_id not in text
+
+    def test_error_codes_counted(self, auth_headers):
+        requests.get(f"{BASE_URL}/api/issues", headers=auth_headers, params={"cursor": "not-a-cursor"})
+        text = requests.get(f"{BASE_URL}/metrics").text
+        assert 'app_errors_total{code="VALIDATION_ERROR"}' in text
+
+
+class TestRequestDBAccounting:
+    """Test X-DB-Calls / X-DB-Time response headers"""
+
+    def test_db_headers_present(self, auth_headers):
+        response = requests.get(f"{BASE_URL}/api/issues", headers=auth_headers, params={"limit": 1})
+        assert response.status_code == 200
+        assert int(response.headers["X-DB-Calls"]) >= 1
+        assert float(response.headers["X-DB-Time"]) >= 0
+        assert response.headers.get("X-Request-ID")
+
+    def test_db_calls_histogram_exported(self, auth_headers):
+        requests.get(f"{BASE_URL}/api/issues", headers=auth_headers, params={"limit": 1})
+        text = requests.get(f"{BASE_URL}/metrics").text
+        assert 'http_request_db_calls_count{route="/api/issues"}' in text
@@ -0,0 +1,100 @@
+"""
+Test keyset pagination on list endpoints
+- ?limit= returns {"items": [...], "next_cursor": ...}
+- Walking next_cursor visits every record exactly once
+- Requests without limit/cursor still return a plain array
+- Accept: application/x-ndjson streams one JSON document per line
+"""
+import base64
+import json
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+ADMIN_PASSWORD = "admin2025"
+
+LIST_ENDPOINTS = ["/api/products", "/api/issues", "/api/services", "/api/scheduled-maintenance"]
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get headers with admin auth token"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={"password": ADMIN_PASSWORD})
+    if response.status_code != 200:
+        pytest.fail(f"Failed to authenticate: {response.status_code} - {response.text}")
+    return {"X-Auth-Token": response.json().get("token")}
+
+
+class TestKeysetPagination:
+    """Test cursor-based pagination"""
+
+    @pytest.mark.parametrize("endpoint", LIST_ENDPOINTS)
+    def test_pages_cover_full_list(self, auth_headers, endpoint):
+        """Walking pages of 7 yields the same ids as the unpaginated list"""
+        full = requests.get(f"{BASE_URL}{endpoint}", headers=auth_headers)
+        assert full.status_code == 200
+        assert isinstance(full.json(), list), "Unpaginated response should stay a list"
+        expected_ids = [row["id"] for row in full.json()]
+
+        seen_ids = []
+        cursor = None
+        for _ in range(1000):
+            params = {"limit": 7}
+            if cursor:
+                params["cursor"] = cursor
+            response = requests.get(f"{BASE_URL}{endpoint}", headers=auth_headers, params=params)
+            assert response.status_code == 200, response.text
+            page = response.json()
+            assert len(page["items"]) <= 7
+            seen_ids.extend(row["id"] for row in page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert len(seen_ids) == len(set(seen_ids)), f"Duplicate rows across pages for {endpoint}"
+        if "X-Next-Cursor" not in full.headers:
+            assert seen_ids == expected_ids
+        print(f"✓ {endpoint}: {len(seen_ids)} rows paginated")
+
+    def test_invalid_cursor_rejected(self, auth_headers):
+        response = requests.get(
+            f"{BASE_URL}/api/issues", headers=auth_headers, params={"cursor": "not-a-cursor"}
+        )
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    @pytest.mark.parametrize("payload", [[{"$ne": None}, "x"], [["a"], "x"], ["2024-01-01", {"$gt": ""}]])
+    def test_operator_cursor_rejected(self, auth_headers, payload):
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+        response = requests.get(f"{BASE_URL}/api/issues", headers=auth_headers, params={"cursor": cursor})
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_limit_out_of_range_rejected(self, auth_headers):
+        response = requests.get(f"{BASE_URL}/api/products", headers=auth_headers, params={"limit": 0})
+        assert response.status_code == 422
+
+
+class TestNdjsonStreaming:
+    """Test Accept: application/x-ndjson on list endpoints"""
+
+    @pytest.mark.parametrize("endpoint", LIST_ENDPOINTS)
+    def test_stream_matches_list(self, auth_headers, endpoint):
+        full = requests.get(f"{BASE_URL}{endpoint}", headers=auth_headers)
+        if "X-Next-Cursor" in full.headers:
+            pytest.skip("Collection larger than one default page")
+
+        headers = {**auth_headers, "Accept": "application/x-ndjson"}
+        response = requests.get(f"{BASE_URL}{endpoint}", headers=headers, stream=True)
+        assert response.status_code == 200, response.text
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.iter_lines() if line]
+        assert [row["id"] for row in rows] == [row["id"] for row in full.json()]
+        assert all("_id" not in row for row in rows)
+
+    def test_stream_respects_limit(self, auth_headers):
+        headers = {**auth_headers, "Accept": "application/x-ndjson"}
+        response = requests.get(f"{BASE_URL}/api/issues", headers=headers, params={"limit": 3})
+        assert response.status_code == 200
+        assert len([line for line in response.text.splitlines() if line]) <= 3
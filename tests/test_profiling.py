@@ -0,0 +1,65 @@
+"""
+Test on-demand request profiling
+- Admin requests sent with X-Profile: 1 are stored under their X-Request-ID
+- GET /api/debug/profiles/{request_id} returns the pstats listing
+- Non-admin requests are never profiled and cannot read profiles
+"""
+import pytest
+import requests
+import os
+import uuid
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+def _login(path, password):
+    response = requests.post(f"{BASE_URL}{path}", json={"password": password})
+    if response.status_code != 200:
+        pytest.fail(f"Failed to authenticate: {response.status_code} - {response.text}")
+    return {"X-Auth-Token": response.json().get("token")}
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    return _login("/api/auth/login", "admin2025")
+
+
+@pytest.fixture(scope="module")
+def technician_headers():
+    return _login("/api/auth/technician-login", "service2025")
+
+
+class TestProfiling:
+    """Test X-Profile and /api/debug/profiles"""
+
+    def test_admin_request_profiled(self, auth_headers):
+        response = requests.get(f"{BASE_URL}/api/issues", headers={**auth_headers, "X-Profile": "1"})
+        assert response.status_code == 200
+        request_id = response.headers["X-Request-ID"]
+
+        profile = requests.get(f"{BASE_URL}/api/debug/profiles/{request_id}", headers=auth_headers)
+        assert profile.status_code == 200, profile.text
+        data = profile.json()
+        assert data["path"] == "/api/issues"
+        assert "cumulative" in data["stats"]
+
+        text = requests.get(
+            f"{BASE_URL}/api/debug/profiles/{request_id}", headers=auth_headers, params={"format": "text"}
+        )
+        assert text.headers["content-type"].startswith("text/plain")
+
+    def test_query_flag(self, auth_headers):
+        response = requests.get(f"{BASE_URL}/api/stats", headers=auth_headers, params={"_profile": "1"})
+        request_id = response.headers["X-Request-ID"]
+        ids = [p["request_id"] for p in requests.get(f"{BASE_URL}/api/debug/profiles", headers=auth_headers).json()]
+        assert request_id in ids
+
+    def test_technician_not_profiled(self, auth_headers, technician_headers):
+        response = requests.get(f"{BASE_URL}/api/issues", headers={**technician_headers, "X-Profile": "1"})
+        request_id = response.headers["X-Request-ID"]
+        profile = requests.get(f"{BASE_URL}/api/debug/profiles/{request_id}", headers=auth_headers)
+        assert profile.status_code == 404
+
+    def test_profiles_admin_only(self, technician_headers):
+        response = requests.get(f"{BASE_URL}/api/debug/profiles/{uuid.uuid4()}", headers=technician_headers)
+        assert response.status_code == 403
@@ -0,0 +1,94 @@
+"""
+Test batch service reports
+- POST /api/reports/service-batch returns a zip with one PDF per product
+- Products can be selected by id or by city
+- Requests need exactly one of product_ids / city and a reporter name
+"""
+import io
+import zipfile
+import pytest
+import requests
+import os
+import uuid
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+ADMIN_PASSWORD = "admin2025"
+REPORTER = {"reporter_name": "Test", "reporter_surname": "Reporter", "report_date": "2026-01-15"}
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get headers with admin auth token"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={"password": ADMIN_PASSWORD})
+    if response.status_code != 200:
+        pytest.fail(f"Failed to authenticate: {response.status_code} - {response.text}")
+    return {"X-Auth-Token": response.json().get("token")}
+
+
+@pytest.fixture(scope="module")
+def products(auth_headers):
+    """Create two products, one with an open high-severity issue"""
+    created = [
+        requests.post(f"{BASE_URL}/api/products", headers=auth_headers, json={
+            "serial_number": f"TEST_REPORT_{uuid.uuid4().hex[:8].upper()}",
+            "model_name": "Powered Stretchers",
+            "model_type": "powered",
+            "city": "Klaipėda"
+        }).json()
+        for _ in range(2)
+    ]
+    issue = requests.post(f"{BASE_URL}/api/issues", headers=auth_headers, json={
+        "product_id": created[0]["id"],
+        "issue_type": "mechanical",
+        "severity": "high",
+        "title": "TEST report issue",
+        "description": "Created by test_service_reports"
+    }).json()
+    yield created
+    requests.delete(f"{BASE_URL}/api/issues/{issue['id']}", headers=auth_headers)
+    for product in created:
+        requests.delete(f"{BASE_URL}/api/products/{product['id']}", headers=auth_headers)
+
+
+class TestServiceReportBatch:
+    """Test POST /api/reports/service-batch"""
+
+    def test_reports_by_product_ids(self, auth_headers, products):
+        response = requests.post(f"{BASE_URL}/api/reports/service-batch", headers=auth_headers, json={
+            "product_ids": [product["id"] for product in products], **REPORTER
+        })
+        assert response.status_code == 200, response.text
+        assert response.headers["content-type"] == "application/zip"
+        assert "attachment" in response.headers["content-disposition"]
+
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        assert archive.testzip() is None
+        names = archive.namelist()
+        assert sorted(names) == sorted(
+            f"Device_Report_{product['serial_number']}_20260115.pdf" for product in products
+        )
+        for name in names:
+            assert archive.read(name).startswith(b"%PDF-")
+        print(f"✓ {len(names)} reports in zip")
+
+    def test_reports_by_city(self, auth_headers, products):
+        response = requests.post(f"{BASE_URL}/api/reports/service-batch", headers=auth_headers, json={
+            "city": "Klaipėda", **REPORTER
+        })
+        assert response.status_code == 200, response.text
+        names = zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+        for product in products:
+            assert f"Device_Report_{product['serial_number']}_20260115.pdf" in names
+
+    def test_requires_products_or_city(self, auth_headers):
+        response = requests.post(f"{BASE_URL}/api/reports/service-batch", headers=auth_headers, json=REPORTER)
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_unknown_product_rejected(self, auth_headers):
+        missing = str(uuid.uuid4())
+        response = requests.post(f"{BASE_URL}/api/reports/service-batch", headers=auth_headers, json={
+            "product_ids": [missing], **REPORTER
+        })
+        assert response.status_code == 400
+        assert response.json()["error"]["details"]["missing"] == [missing]
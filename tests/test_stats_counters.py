@@ -0,0 +1,90 @@
+"""
+Test incrementally maintained /stats counters
+- Creating, resolving and deleting an issue keeps GET /api/stats equal to a fresh rebuild
+- POST /api/stats/rebuild is admin only
+"""
+import pytest
+import requests
+import os
+import uuid
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+def _login(path, password):
+    response = requests.post(f"{BASE_URL}{path}", json={"password": password})
+    if response.status_code != 200:
+        pytest.fail(f"Failed to authenticate: {response.status_code} - {response.text}")
+    return {"X-Auth-Token": response.json().get("token")}
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    return _login("/api/auth/login", "admin2025")
+
+
+@pytest.fixture(scope="module")
+def technician_headers():
+    return _login("/api/auth/technician-login", "service2025")
+
+
+@pytest.fixture(scope="module")
+def test_product(auth_headers):
+    """Create a throwaway product and delete it afterwards"""
+    response = requests.post(f"{BASE_URL}/api/products", headers=auth_headers, json={
+        "serial_number": f"TEST_STATS_{uuid.uuid4().hex[:8].upper()}",
+        "model_name": "Powered Stretchers",
+        "model_type": "powered",
+        "city": "Vilnius"
+    })
+    assert response.status_code == 200, response.text
+    product = response.json()
+    yield product
+    requests.delete(f"{BASE_URL}/api/products/{product['id']}", headers=auth_headers)
+
+
+def assert_stats_match_rebuild(headers):
+    """The maintained counters must equal a from-scratch recount"""
+    maintained = requests.get(f"{BASE_URL}/api/stats", headers=headers)
+    assert maintained.status_code == 200, maintained.text
+    rebuilt = requests.post(f"{BASE_URL}/api/stats/rebuild", headers=headers)
+    assert rebuilt.status_code == 200, rebuilt.text
+    assert maintained.json() == rebuilt.json()
+    return rebuilt.json()
+
+
+class TestStatsCounters:
+    """Test GET /api/stats against POST /api/stats/rebuild"""
+
+    def test_issue_lifecycle_keeps_counters_exact(self, auth_headers, test_product):
+        before = assert_stats_match_rebuild(auth_headers)
+
+        response = requests.post(f"{BASE_URL}/api/issues", headers=auth_headers, json={
+            "product_id": test_product["id"],
+            "issue_type": "mechanical",
+            "severity": "low",
+            "title": "TEST stats counters",
+            "description": "Created by test_stats_counters"
+        })
+        assert response.status_code == 200, response.text
+        issue = response.json()
+        created = assert_stats_match_rebuild(auth_headers)
+        assert created["open_issues"] == before["open_issues"] + 1
+
+        response = requests.put(f"{BASE_URL}/api/issues/{issue['id']}", headers=auth_headers, json={
+            "status": "resolved",
+            "resolution": "Resolved by test_stats_counters"
+        })
+        assert response.status_code == 200, response.text
+        resolved = assert_stats_match_rebuild(auth_headers)
+        assert resolved["open_issues"] == before["open_issues"]
+        assert resolved["resolved_issues"] == before["resolved_issues"] + 1
+
+        response = requests.delete(f"{BASE_URL}/api/issues/{issue['id']}", headers=auth_headers)
+        assert response.status_code == 200, response.text
+        deleted = assert_stats_match_rebuild(auth_headers)
+        assert deleted["resolved_issues"] == before["resolved_issues"]
+
+    def test_rebuild_requires_admin(self, technician_headers):
+        response = requests.post(f"{BASE_URL}/api/stats/rebuild", headers=technician_headers)
+        assert response.status_code == 403